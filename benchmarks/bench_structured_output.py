@@ -0,0 +1,86 @@
+"""Compare tool result encoding before and after returning structured results.
+
+The legacy path builds a dict, calls ``json.dumps`` and returns the string, which
+FastMCP then wraps into ``{"result": "<escaped json>"}`` and echoes again as text.
+The structured path returns ``tool_result(data)``, which encodes the payload once
+with pydantic-core and hands the object itself over as structured content.
+
+Both paths go through the real low-level ``tools/call`` handler and the measured
+bytes are the serialized JSON-RPC result as it would be written to the transport.
+
+Usage:
+    python benchmarks/bench_structured_output.py --items 5000 --rounds 20
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "inference" / "src"))
+from csghub_mcp_server_inference.results import tool_result  # noqa: E402
+
+
+def build_listing(items: int) -> list:
+    return [
+        {
+            "deploy_id": 10000 + i,
+            "deploy_name": f"deploy_{i:04d}",
+            "model_id": f"OpenCSG/csg-wukong-1B-chat-v0.{i % 7}",
+            "runtime_framework": "VLLM" if i % 2 else "TGI",
+            "status": "Running" if i % 3 else "Stopped",
+        }
+        for i in range(items)
+    ]
+
+
+def build_server(listing: list) -> FastMCP:
+    mcp = FastMCP("bench")
+
+    @mcp.tool(name="legacy_listing", structured_output=True)
+    def legacy_listing() -> str:
+        return json.dumps(listing)
+
+    @mcp.tool(name="structured_listing", structured_output=True)
+    def structured_listing() -> types.CallToolResult:
+        return tool_result(listing)
+
+    return mcp
+
+
+async def measure(mcp: FastMCP, name: str, rounds: int) -> tuple[float, int]:
+    handler = mcp._mcp_server.request_handlers[types.CallToolRequest]
+    request = types.CallToolRequest(method="tools/call", params=types.CallToolRequestParams(name=name, arguments={}))
+    await handler(request)  # warm up the tool definition cache
+
+    wire_bytes = 0
+    start = time.process_time()
+    for _ in range(rounds):
+        result = await handler(request)
+        wire_bytes = len(result.model_dump_json(by_alias=True, exclude_none=True).encode("utf-8"))
+    return (time.process_time() - start) / rounds, wire_bytes
+
+
+async def main(items: int, rounds: int):
+    mcp = build_server(build_listing(items))
+    await mcp.list_tools()
+    legacy_cpu, legacy_bytes = await measure(mcp, "legacy_listing", rounds)
+    structured_cpu, structured_bytes = await measure(mcp, "structured_listing", rounds)
+
+    print(f"items={items} rounds={rounds}")
+    print(f"{'path':<12}{'cpu ms/call':>14}{'wire bytes':>14}")
+    print(f"{'legacy':<12}{legacy_cpu * 1000:>14.2f}{legacy_bytes:>14}")
+    print(f"{'structured':<12}{structured_cpu * 1000:>14.2f}{structured_bytes:>14}")
+    print(f"cpu saved: {(1 - structured_cpu / legacy_cpu) * 100:.1f}%  bytes saved: {(1 - structured_bytes / legacy_bytes) * 100:.1f}%")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark structured tool output encoding")
+    parser.add_argument("--items", type=int, default=5000, help="number of records in the listing")
+    parser.add_argument("--rounds", type=int, default=20, help="tool calls per path")
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.rounds))
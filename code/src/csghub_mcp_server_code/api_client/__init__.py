@@ -3,4 +3,5 @@ from .code import api_list_codes
 from .code import api_get_code_details
 from .code import api_create_code
 from .code import api_delete_code
-from .namespace import api_get_namespaces_by_token
\ No newline at end of file
+from .namespace import api_get_namespaces_by_token
+from .files import api_read_repo_file
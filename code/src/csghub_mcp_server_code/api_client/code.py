@@ -1,10 +1,10 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, pick_fields, response_body
 
 logger = logging.getLogger(__name__)
 
-def api_list_codes(token: str, username: str, per: int = 10, page: int = 1) -> dict:
+def api_list_codes(token: str, username: str, per: int = 10, page: int = 1, fields: list = None) -> dict:
     config = get_csghub_config()
     headers = {"Authorization": f"Bearer {token}"}
     params = {
@@ -14,7 +14,7 @@ def api_list_codes(token: str, username: str, per: int = 10, page: int = 1) -> d
     url = f"{config.api_endpoint}/api/v1/user/{username}/codes"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to list user codes on {url}: {response.text}")
+        logger.error("failed to list user codes on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -26,18 +26,21 @@ def api_list_codes(token: str, username: str, per: int = 10, page: int = 1) -> d
         return res_data
 
     for res in res_list:
+        if fields:
+            res_data.append(pick_fields(res, fields))
+            continue
         res_data.append({
             "code_id": res["path"]
         })
     return res_data
 
-def api_get_code_details(token: str, code_id: str) -> dict:
+def api_get_code_details(token: str, code_id: str, fields: list = None) -> dict:
     config = get_csghub_config()
     headers = {"Authorization": f"Bearer {token}"}
     url = f"{config.api_endpoint}/api/v1/codes/{code_id}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get code details on {url}: {response.text}")
+        logger.error("failed to get code details on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -46,6 +49,8 @@ def api_get_code_details(token: str, code_id: str) -> dict:
 
     if json_data and "data" in json_data:
         res = json_data["data"]
+        if fields:
+            return pick_fields(res, fields)
         access_url = f"{config.web_endpoint}/codes/{res['path']}"
         res_data = {
             "code_id": res["path"],
@@ -80,7 +85,7 @@ def api_create_code(
     url = f"{config.api_endpoint}/api/v1/codes"
     response = requests.post(url, headers=headers, json=data)
     if response.status_code != 200:
-        logger.error(f"failed to create code repo: {data} on {url} :{response.text}")
+        logger.error("failed to create code repo: %s on %s :%s", data, url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -102,7 +107,7 @@ def api_delete_code(token: str, code_id: str) -> dict:
     url = f"{config.api_endpoint}/api/v1/codes/{code_id}"
     response = requests.delete(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to delete code on {url}: {response.text}")
+        logger.error("failed to delete code on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
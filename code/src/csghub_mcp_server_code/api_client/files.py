@@ -0,0 +1,314 @@
+import base64
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections import OrderedDict
+import requests
+from .constants import get_csghub_config, wrap_error_response
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 16384
+DEFAULT_MAX_BYTES = 65536
+MAX_READ_BYTES = 8 * 1024 * 1024
+# line slicing stops scanning for the start line after this many bytes
+MAX_SCAN_BYTES = 64 * 1024 * 1024
+SMALL_BLOB_BYTES = 256 * 1024
+BLOB_CACHE_BYTES = 32 * 1024 * 1024
+BRANCH_SHA_TTL = 30
+BRANCH_SHA_ENTRIES = 4096
+COMMIT_SHA_PATTERN = re.compile(r"[0-9a-f]{40}")
+CONTENT_RANGE_PATTERN = re.compile(r"bytes (?:\d+-\d+|\*)/(\d+)")
+
+
+class BlobCache:
+    """Least recently used cache of whole small files keyed by commit SHA and path.
+
+    A file at a commit never changes, so entries need no expiry, only the total
+    size is bounded. Callers must resolve the commit with api_resolve_commit_sha
+    first, which checks the caller's token against CSGHub.
+    """
+
+    def __init__(self, max_bytes: int = BLOB_CACHE_BYTES):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._blobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            blob = self._blobs.get(key)
+            if blob is not None:
+                self._blobs.move_to_end(key)
+            return blob
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._blobs), "bytes": self.size, "max_bytes": self.max_bytes}
+
+    def put(self, key, blob: bytes):
+        with self._lock:
+            if key in self._blobs:
+                return
+            self._blobs[key] = blob
+            self.size += len(blob)
+            while self.size > self.max_bytes:
+                _, dropped = self._blobs.popitem(last=False)
+                self.size -= len(dropped)
+
+
+blob_cache = BlobCache()
+_branch_shas = OrderedDict()
+_branch_shas_lock = threading.Lock()
+
+
+def api_resolve_commit_sha(token: str, repo_type: str, repo_id: str, branch: str) -> str:
+    """Return the head commit SHA of a branch, or None when it cannot be resolved.
+
+    The branch listing is fetched with the caller's token, so a SHA is only
+    returned to a token CSGHub lets read the repo, also when branch already is a
+    commit SHA. Results are kept per token for BRANCH_SHA_TTL seconds, for at
+    most BRANCH_SHA_ENTRIES branches.
+    """
+    key = (hashlib.sha256(token.encode()).hexdigest(), repo_type, repo_id, branch)
+    with _branch_shas_lock:
+        cached = _branch_shas.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1]
+
+    config = get_csghub_config()
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"{config.api_endpoint}/api/v1/{repo_type}s/{repo_id}/branches"
+    try:
+        response = requests.get(url, headers=headers, timeout=10)
+    except requests.RequestException as e:
+        logger.warning(f"failed to resolve branch {branch} on {url}: {e}")
+        return None
+    if response.status_code != 200:
+        logger.info(f"failed to resolve branch {branch} on {url}: {response.status_code}")
+        return None
+    json_data = response.json()
+    res_list = json_data["data"] if json_data and "data" in json_data else []
+    sha = None
+    if COMMIT_SHA_PATTERN.fullmatch(branch):
+        # the listing only checked that the token may read the repo
+        sha = branch
+    for res in res_list if isinstance(res_list, list) and sha is None else []:
+        if isinstance(res, dict) and res.get("name") == branch:
+            sha = (res.get("commit") or {}).get("id")
+            break
+    if sha:
+        with _branch_shas_lock:
+            _branch_shas[key] = (time.monotonic() + BRANCH_SHA_TTL, sha)
+            _branch_shas.move_to_end(key)
+            while len(_branch_shas) > BRANCH_SHA_ENTRIES:
+                _branch_shas.popitem(last=False)
+    return sha
+
+
+def content_fields(data: bytes) -> tuple:
+    """Return (fields, bytes used): UTF-8 text as content, anything else base64 encoded.
+
+    A multi-byte character cut at the end of a range still counts as text, its
+    partial bytes are left out of the bytes used so the next read starts with it.
+    """
+    if b"\0" not in data[:8192]:
+        for cut in range(4):
+            try:
+                text = data[:len(data) - cut].decode("utf-8")
+            except UnicodeDecodeError as e:
+                if e.start < len(data) - 4:
+                    break
+                continue
+            return {"encoding": "utf-8", "content": text}, len(data) - cut
+    return {"encoding": "base64", "content": base64.b64encode(data).decode()}, len(data)
+
+
+def slice_lines(chunks, start_line: int = 1, max_lines: int = 0, max_bytes: int = DEFAULT_MAX_BYTES,
+                max_scan: int = MAX_SCAN_BYTES) -> dict:
+    """Pick whole lines from a byte chunk stream without reading past them.
+
+    Lines are counted from 1 at the start of the stream. Lines before start_line
+    are scanned but not kept. consumed is the number of bytes up to the end of
+    the last returned line, so reading on from there continues with the next line.
+    """
+    skip = max(start_line, 1) - 1
+    selected = bytearray()
+    lines = 0
+    consumed = 0
+    pending = bytearray()
+    has_more = False
+    done = False
+
+    for chunk in chunks:
+        pending += chunk
+        while not done:
+            newline = pending.find(b"\n")
+            if newline < 0:
+                if skip:
+                    # inside a skipped line, its bytes are not needed
+                    consumed += len(pending)
+                    pending.clear()
+                    if consumed > max_scan:
+                        has_more = done = True
+                elif len(pending) > max_bytes and not selected:
+                    # a single line larger than the budget is returned cut
+                    selected += pending[:max_bytes]
+                    consumed += max_bytes
+                    lines = 1
+                    has_more = done = True
+                elif selected and len(selected) + len(pending) > max_bytes:
+                    has_more = done = True
+                break
+            line = pending[:newline + 1]
+            if skip:
+                skip -= 1
+                consumed += len(line)
+                del pending[:newline + 1]
+                continue
+            if (max_lines and lines >= max_lines) or (selected and len(selected) + len(line) > max_bytes):
+                has_more = done = True
+                break
+            if len(line) > max_bytes:
+                selected += line[:max_bytes]
+                consumed += max_bytes
+                lines += 1
+                has_more = done = True
+                break
+            selected += line
+            lines += 1
+            consumed += len(line)
+            del pending[:newline + 1]
+        if done:
+            break
+
+    if not done and pending and not skip:
+        if (max_lines and lines >= max_lines) or (selected and len(selected) + len(pending) > max_bytes):
+            has_more = True
+        else:
+            selected += pending[:max_bytes]
+            consumed += min(len(pending), max_bytes)
+            lines += 1
+            has_more = len(pending) > max_bytes
+
+    return {
+        "data": bytes(selected),
+        "lines": lines,
+        "consumed": consumed,
+        "has_more": has_more,
+    }
+
+
+def _skip_bytes(chunks, skip: int):
+    for chunk in chunks:
+        if skip:
+            dropped = min(skip, len(chunk))
+            chunk = chunk[dropped:]
+            skip -= dropped
+        if chunk:
+            yield chunk
+
+
+def _read_bytes(chunks, length: int) -> bytes:
+    body = bytearray()
+    for chunk in chunks:
+        body.extend(chunk)
+        if len(body) >= length:
+            break
+    return bytes(body[:length])
+
+
+def api_read_repo_file(
+    token: str,
+    repo_type: str,
+    repo_id: str,
+    file_path: str,
+    branch: str = "main",
+    offset: int = 0,
+    length: int = 0,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+    start_line: int = 0,
+    max_lines: int = 0,
+) -> dict:
+    """Read part of a repository file with an HTTP range request.
+
+    Without start_line and max_lines up to length bytes from offset are read,
+    length 0 reads up to max_bytes. With them whole lines are returned, counted
+    from offset. Whole files up to SMALL_BLOB_BYTES are cached by commit SHA.
+    """
+    config = get_csghub_config()
+    max_bytes = max(1, min(max_bytes, MAX_READ_BYTES))
+    length = min(length, max_bytes) if length > 0 else max_bytes
+    line_mode = start_line > 0 or max_lines > 0
+    file_path = file_path.lstrip("/")
+
+    commit = api_resolve_commit_sha(token, repo_type, repo_id, branch)
+    cache_key = (repo_type, repo_id, commit, file_path)
+    blob = blob_cache.get(cache_key) if commit else None
+    res_data = {
+        "repo_id": repo_id,
+        "path": file_path,
+        "branch": branch,
+        "commit_sha": commit,
+        "offset": offset,
+    }
+
+    if blob is not None:
+        res_data["cached"] = True
+        size = len(blob)
+        if line_mode:
+            sliced = slice_lines([blob[offset:]], start_line, max_lines, max_bytes)
+        else:
+            data = blob[offset:offset + length]
+    else:
+        headers = {
+            "Authorization": f"Bearer {token}",
+            "Range": f"bytes={offset}-" if line_mode else f"bytes={offset}-{offset + length - 1}",
+        }
+        params = {"ref": commit or branch}
+        url = f"{config.api_endpoint}/api/v1/{repo_type}s/{repo_id}/resolve/{file_path}"
+        with requests.get(url, headers=headers, params=params, stream=True, timeout=(10, 60)) as response:
+            if response.status_code == 416:
+                match = CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", ""))
+                res_data.update(size=int(match.group(1)) if match else None, length=0, has_more=False,
+                                next_offset=offset, encoding="utf-8", content="")
+                return res_data
+            if response.status_code not in (200, 206):
+                logger.error(f"failed to read repo file on {url}: {response.status_code}")
+                return wrap_error_response(response)
+
+            size = None
+            match = CONTENT_RANGE_PATTERN.match(response.headers.get("Content-Range", ""))
+            if match:
+                size = int(match.group(1))
+            elif response.status_code == 200 and response.headers.get("Content-Length", "").isdigit():
+                size = int(response.headers["Content-Length"])
+            # a server that ignores the range sends the file from its start
+            chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+            if response.status_code == 200 and offset:
+                chunks = _skip_bytes(chunks, offset)
+            if line_mode:
+                sliced = slice_lines(chunks, start_line, max_lines, max_bytes)
+            else:
+                data = _read_bytes(chunks, length)
+
+        if commit and offset == 0 and size is not None and size <= SMALL_BLOB_BYTES:
+            whole = sliced["data"] if line_mode else data
+            if len(whole) == size and (not line_mode or sliced["consumed"] == size):
+                blob_cache.put(cache_key, whole)
+
+    if line_mode:
+        data = sliced["data"]
+        fields, _ = content_fields(data)
+        res_data["lines"] = sliced["lines"]
+        next_offset = offset + sliced["consumed"]
+        has_more = sliced["has_more"]
+    else:
+        fields, used = content_fields(data)
+        next_offset = offset + used
+        has_more = next_offset < size if size is not None else len(data) == length
+    res_data.update(size=size, length=len(data), next_offset=next_offset, has_more=has_more)
+    res_data.update(fields)
+    return res_data
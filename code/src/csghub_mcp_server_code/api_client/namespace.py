@@ -1,6 +1,6 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, response_body
 from .user import api_get_username_from_token
 
 logger = logging.getLogger(__name__)
@@ -14,7 +14,7 @@ def api_get_namespaces_by_token(token: str) -> str:
     url = f"{config.api_endpoint}/api/v1/organizations"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get namespaces on {url}: {response.text}")
+        logger.error("failed to get namespaces on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
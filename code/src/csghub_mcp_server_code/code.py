@@ -1,6 +1,8 @@
+import asyncio
 import logging
 from mcp.server.fastmcp import FastMCP
-import json
+from mcp.types import CallToolResult
+from .results import tool_result
 from .api_client import (
     api_get_username_from_token,
     api_get_namespaces_by_token,
@@ -8,6 +10,7 @@ from .api_client import (
     api_get_code_details,
     api_create_code,
     api_delete_code,
+    api_read_repo_file,
 )
 
 logger = logging.getLogger(__name__)
@@ -18,43 +21,44 @@ def register_code_tools(mcp_instance: FastMCP):
     register_code_creation(mcp_instance=mcp_instance)
     register_code_delete(mcp_instance=mcp_instance)
     register_namespace_tools(mcp_instance=mcp_instance)
+    register_repo_file_read(mcp_instance=mcp_instance)
 
 def register_code_list(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="list_user_codes",
         title="List code repo for a user from CSGHub",
-        description="Retrieve a list of code repo for a specific user from CSGHub with user access token. You can control the pagination by specifying the number of items per page and the page number.",
+        description="Retrieve a list of code repo for a specific user from CSGHub with user access token. You can control the pagination by specifying the number of items per page and the page number. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes such as repository.http_clone_url.",
         structured_output=True,
     )
-    def list_user_codes(token: str, per: int = 10, page: int = 1) -> str:
+    def list_user_codes(token: str, per: int = 10, page: int = 1, fields: list[str] = None) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
         
         try:
             username = api_get_username_from_token(token)
         except Exception as e:
             logger.error(f"Error calling user token API: {e}")
-            return f"Error: Failed to get username. {e}"
+            return tool_result({"error_message": f"Failed to get username. {e}"})
 
         logger.info(f"Listing user codes for user: {username}")
         
         try:
-            codes = api_list_codes(token, username, per, page)
-            return json.dumps(codes)
+            codes = api_list_codes(token, username, per, page, fields=fields)
+            return tool_result(codes)
         except Exception as e:
             logger.error(f"Error calling codes API: {e}")
-            return f"Error: Failed to list codes. {e}"
+            return tool_result({"error_message": f"Failed to list codes. {e}"})
 
 def register_code_query(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="get_code_detail_by_path",
         title="Get code repo details by code path",
-        description="Retrieve the code repo details by a specific path from CSGHub with user access token. This is useful for checking the details of a code repo that has been submitted to the CSGHub service.",
+        description="Retrieve the code repo details by a specific path from CSGHub with user access token. This is useful for checking the details of a code repo that has been submitted to the CSGHub service. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes such as repository.http_clone_url.",
         structured_output=True,
     )
-    def get_code_detail_by_path(token: str, code_id: str) -> str:
-        json_data = api_get_code_details(token=token, code_id=code_id)
-        return json.dumps(json_data)
+    def get_code_detail_by_path(token: str, code_id: str, fields: list[str] = None) -> CallToolResult:
+        json_data = api_get_code_details(token=token, code_id=code_id, fields=fields)
+        return tool_result(json_data)
 
 def register_code_creation(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -70,13 +74,13 @@ def register_code_creation(mcp_instance: FastMCP):
         readme: str = "",
         description: str = "",
         namespace: str = None,
-    ) -> str:
+    ) -> CallToolResult:
         if namespace is None or len(namespace.strip()) < 1:
             try:
                 namespace = api_get_username_from_token(token)
             except Exception as e:
                 logger.error(f"Error calling user token API: {e}")
-                return f"Error: Failed to get username. {e}"
+                return tool_result({"error_message": f"Failed to get username. {e}"})
 
         json_data = api_create_code(
             token=token,
@@ -86,7 +90,7 @@ def register_code_creation(mcp_instance: FastMCP):
             readme=readme,
             description=description,
         )
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
 def register_code_delete(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -95,9 +99,9 @@ def register_code_delete(mcp_instance: FastMCP):
         description="Delete the code repo by a specific id from CSGHub with user access token.",
         structured_output=True,
     )
-    def delete_code_by_path(token: str, code_id: str) -> str:
+    def delete_code_by_path(token: str, code_id: str) -> CallToolResult:
         json_data = api_delete_code(token=token, code_id=code_id)
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
 def register_namespace_tools(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -106,6 +110,37 @@ def register_namespace_tools(mcp_instance: FastMCP):
         description="Retrieve a list of namespaces or organizations that a user has access to create code repos from CSGHub with user access token.",
         structured_output=True,
     )
-    def list_namespaces(token: str) -> str:
+    def list_namespaces(token: str) -> CallToolResult:
         namespaces = api_get_namespaces_by_token(token)
-        return json.dumps(namespaces)
+        return tool_result(namespaces)
+
+def register_repo_file_read(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="read_repo_file",
+        title="Read part of a file in a code repo on CSGHub",
+        description="Read a file of a code repo on CSGHub without cloning it, fetching only the requested bytes with an HTTP range request. repo_id is namespace/name, branch is a branch name or a commit SHA, default main. By default up to max_bytes (default 65536, at most 8 MiB) are read from offset, length limits the read further. With start_line and/or max_lines whole lines are returned instead, counted from 1 at offset. Text is returned as UTF-8 content, binary data base64 encoded. Pass next_offset back as offset to continue while has_more is true. Whole files up to 256 KB are cached by commit SHA.",
+        structured_output=True,
+    )
+    async def read_repo_file(
+        token: str,
+        repo_id: str,
+        file_path: str,
+        branch: str = "main",
+        offset: int = 0,
+        length: int = 0,
+        max_bytes: int = 65536,
+        start_line: int = 0,
+        max_lines: int = 0,
+    ) -> CallToolResult:
+        if offset < 0 or length < 0 or max_bytes < 1 or start_line < 0 or max_lines < 0:
+            return tool_result({"error_message": "offset, length, start_line and max_lines must not be negative, max_bytes must be at least 1."})
+        try:
+            json_data = await asyncio.to_thread(
+                api_read_repo_file, token, "code", repo_id, file_path,
+                branch=branch, offset=offset, length=length, max_bytes=max_bytes,
+                start_line=start_line, max_lines=max_lines,
+            )
+        except Exception as e:
+            logger.error(f"Error reading {file_path} of code {repo_id}: {e}")
+            return tool_result({"error_message": f"Failed to read repo file. {e}"})
+        return tool_result(json_data)
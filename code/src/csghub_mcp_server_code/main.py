@@ -3,35 +3,36 @@ import sys
 import signal
 import logging
 from datetime import datetime
-from mcp.server.fastmcp import FastMCP
+from .admin import register_admin_tools
+from .api_client.files import blob_cache
 from .arguments import setup_argparse
+from .health import register_health_routes, upstream_probe, watch_cache
+from .logs import setup_logging
+from .tracing import TracedFastMCP, setup_tracing
+from .usage import register_metrics_route, track_upstream_requests
 from .code import register_code_tools
 
 logger = logging.getLogger(__name__)
 
-mcp = FastMCP("CSGHub-Code-MCP-Server", host="0.0.0.0", port=8000, log_level="INFO")
+mcp = TracedFastMCP("CSGHub-Code-MCP-Server", host="0.0.0.0", port=8000, log_level="INFO")
 
 register_code_tools(mcp)
+register_admin_tools(mcp)
+register_metrics_route(mcp)
+track_upstream_requests()
+register_health_routes(mcp)
+watch_cache("blob_cache", blob_cache)
 
 def signal_handler(sig, frame):
     logger.info("cleaning resource")
     time.sleep(1)
     sys.exit(0)
 
-def pre_app(log_level: str = "INFO"):
+def pre_app(log_level: str = "INFO", log_format: str = None, trace_exporter: str = None):
     signal.signal(signal.SIGINT, signal_handler)
     signal.signal(signal.SIGTERM, signal_handler)
-    change_global_log_format(log_level=log_level)
-
-def change_global_log_format(log_level: str = "INFO"):
-    root_logger = logging.getLogger()
-    root_logger.setLevel(log_level)
-    new_formatter = logging.Formatter(
-        fmt='%(asctime)s - %(levelname)s - %(pathname)s:%(lineno)d - %(message)s',
-        datefmt='%Y-%m-%d %H:%M:%S'
-    )
-    for handler in root_logger.handlers:
-        handler.setFormatter(new_formatter)
+    setup_logging(log_level=log_level, log_format=log_format)
+    setup_tracing(mcp.name, exporter=trace_exporter)
 
 def app(host: str = "0.0.0.0", port: int = 8000, protocol: str = 'streamable-http'):
     global mcp
@@ -39,6 +40,8 @@ def app(host: str = "0.0.0.0", port: int = 8000, protocol: str = 'streamable-htt
         mcp.settings.host = host
         mcp.settings.port = port
         logger.info(f"Starting code MCP server on {host}:{port} with {protocol} protocol.")
+        if protocol != "stdio":
+            upstream_probe.start()
         mcp.run(transport=protocol)
     except KeyboardInterrupt:
         signal_handler(signal.SIGINT, None)
@@ -49,7 +52,7 @@ def app(host: str = "0.0.0.0", port: int = 8000, protocol: str = 'streamable-htt
 def main():
     parser = setup_argparse()
     args = parser.parse_args()
-    pre_app(log_level=args.log_level)
+    pre_app(log_level=args.log_level, log_format=args.log_format, trace_exporter=args.trace_exporter)
     app(host=args.host, port=args.port, protocol=args.protocol)
 
 if __name__ == "__main__":
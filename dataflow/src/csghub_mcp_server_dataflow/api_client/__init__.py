@@ -5,3 +5,6 @@ from .dataflow import api_create_job
 from .dataflow import api_delete_job
 from .dataflow import api_get_template_list
 from .dataset import api_get_dataset_detail
+from .dataset import api_list_dataset_tree
+from .dataset import api_read_dataset_file_range
+from .dataset import api_summarize_dataset_branch
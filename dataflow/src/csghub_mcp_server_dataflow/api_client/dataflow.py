@@ -1,11 +1,11 @@
 import requests
 import logging
 import random
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, pick_fields, response_body
 
 logger = logging.getLogger(__name__)
 
-def api_list_jobs(token: str, per: int = 10, page: int = 1) -> dict:
+def api_list_jobs(token: str, per: int = 10, page: int = 1, fields: list = None) -> dict:
     config = get_csghub_config()
     headers = {"Authorization": f"Bearer {token}"}
     params = {
@@ -16,7 +16,7 @@ def api_list_jobs(token: str, per: int = 10, page: int = 1) -> dict:
     url = f"{config.api_endpoint}/api/v1/dataflow/jobs"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to list dataflow jobs on {url}: {response.text}")
+        logger.error("failed to list dataflow jobs on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -28,6 +28,9 @@ def api_list_jobs(token: str, per: int = 10, page: int = 1) -> dict:
         return res_data
 
     for res in res_list:
+        if fields:
+            res_data.append(pick_fields(res, fields))
+            continue
         res_data.append({
             "job_id": res["job_id"],
             "job_name": res["job_name"],
@@ -36,13 +39,13 @@ def api_list_jobs(token: str, per: int = 10, page: int = 1) -> dict:
         })
     return res_data
 
-def api_get_job_details(token: str, job_id: int, job_type: str = "data_refine") -> dict:
+def api_get_job_details(token: str, job_id: int, job_type: str = "data_refine", fields: list = None) -> dict:
     config = get_csghub_config()
     headers = {"Authorization": f"Bearer {token}"}
     url = f"{config.api_endpoint}/api/v1/dataflow/jobs/{job_id}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get dataflow job details on {url}: {response.text}")
+        logger.error("failed to get dataflow job details on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -51,6 +54,8 @@ def api_get_job_details(token: str, job_id: int, job_type: str = "data_refine")
 
     if json_data and "job" in json_data:
         res = json_data["job"]
+        if fields:
+            return pick_fields(res, fields)
         access_url = f"{config.web_endpoint}/datapipelines/dataflowInfo?id={job_id}&type=pipeline&jobType={job_type}"
         res_data = {
             "job_id": res["job_id"],
@@ -58,6 +63,7 @@ def api_get_job_details(token: str, job_id: int, job_type: str = "data_refine")
             "status": res["status"],
             "finished_at": res["date_finish"],
             "output_branch_name": res["export_branch_name"],
+            "repo_id": res.get("repo_id"),
             "web_access_url": access_url,
         }
 
@@ -86,7 +92,7 @@ def read_templates(token: str, page: int, page_size: int) -> list:
     url = f"{config.api_endpoint}/api/v1/dataflow/algo_templates"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to get dataflow templates on {url} :{response.text}")
+        logger.error("failed to get dataflow templates on %s :%s", url, response_body(response))
         return wrap_error_response(response)
 
     json_data = response.json()
@@ -110,7 +116,7 @@ def get_template_by_id(token: str, template_id: int) -> dict | None:
     url = f"{config.api_endpoint}/api/v1/dataflow/algo_templates/{template_id}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get dataflow template on {url} :{response.text}")
+        logger.error("failed to get dataflow template on %s :%s", url, response_body(response))
         return wrap_error_response(response)
 
     template = None
@@ -164,7 +170,7 @@ def api_create_job(
     url = f"{config.api_endpoint}/api/v1/dataflow/jobs/pipeline"
     response = requests.post(url, headers=headers, json=data)
     if response.status_code != 200:
-        logger.error(f"failed to create dataflow job on {url} :{response.text}")
+        logger.error("failed to create dataflow job on %s :%s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -188,7 +194,7 @@ def api_delete_job(token: str, job_id: str) -> dict:
     url = f"{config.api_endpoint}/api/v1/dataflow/jobs/{job_id}"
     response = requests.delete(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to delete dataflow job on {url}: {response.text}")
+        logger.error("failed to delete dataflow job on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
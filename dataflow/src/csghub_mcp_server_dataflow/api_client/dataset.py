@@ -1,6 +1,6 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, response_body
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +11,7 @@ def api_get_dataset_detail(token: str, dataset_id: str) -> dict:
     url = f"{config.api_endpoint}/api/v1/datasets/{dataset_id}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get dataset detail on {url}: {response.text}")
+        logger.error("failed to get dataset detail on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     response.raise_for_status()
@@ -24,3 +24,120 @@ def api_get_dataset_detail(token: str, dataset_id: str) -> dict:
 
     return res_data
 
+
+def api_list_dataset_tree(token: str, dataset_id: str, branch: str = "main", path: str = "") -> list:
+    """List files and directories of a dataset path on a branch, as name/path/type/size dicts."""
+    config = get_csghub_config()
+
+    headers = {"Authorization": f"Bearer {token}"}
+    params = {"ref": branch, "path": path}
+    url = f"{config.api_endpoint}/api/v1/datasets/{dataset_id}/tree"
+    response = requests.get(url, headers=headers, params=params)
+    if response.status_code != 200:
+        logger.error("failed to list dataset tree on %s: %s", url, response_body(response))
+        return wrap_error_response(response)
+
+    response.raise_for_status()
+    json_data = response.json()
+
+    res_data = []
+    res_list = json_data["data"] if json_data and "data" in json_data else []
+    if isinstance(res_list, dict):
+        res_list = res_list.get("files") or []
+    if not isinstance(res_list, list):
+        return res_data
+
+    for res in res_list:
+        res_data.append({
+            "name": res.get("name"),
+            "path": res.get("path"),
+            "type": res.get("type"),
+            "size": res.get("size", 0),
+        })
+
+    return res_data
+
+def api_read_dataset_file_range(token: str, dataset_id: str, file_path: str,
+                                branch: str = "main", start: int = 0, length: int = 65536) -> bytes | dict:
+    """Read length bytes of a dataset file from offset start with an HTTP range request.
+
+    Servers that ignore the range answer 200 with the whole file, the body is then
+    read only up to length bytes and the connection closed.
+    """
+    config = get_csghub_config()
+
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Range": f"bytes={start}-{start + length - 1}",
+    }
+    params = {"ref": branch}
+    url = f"{config.api_endpoint}/api/v1/datasets/{dataset_id}/resolve/{file_path}"
+    with requests.get(url, headers=headers, params=params, stream=True) as response:
+        if response.status_code not in (200, 206):
+            logger.error(f"failed to read dataset file range on {url}: {response.status_code}")
+            return {
+                "error_code": response.status_code,
+                "error_message": f"failed to read {file_path}: {response.reason}",
+            }
+
+        body = bytearray()
+        skip = start if response.status_code == 200 else 0
+        for chunk in response.iter_content(chunk_size=65536):
+            if skip:
+                dropped = min(skip, len(chunk))
+                chunk = chunk[dropped:]
+                skip -= dropped
+            body.extend(chunk)
+            if len(body) >= length:
+                break
+        return bytes(body[:length])
+
+SAMPLE_TEXT_SUFFIXES = (".jsonl", ".json", ".csv", ".tsv", ".txt")
+
+def api_summarize_dataset_branch(token: str, dataset_id: str, branch: str,
+                                 max_files: int = 200, sample_files: int = 3,
+                                 sample_rows: int = 5, sample_bytes: int = 65536) -> dict:
+    """Summarize a dataset branch: file list with sizes and a few leading rows of text files.
+
+    Directories are walked breadth first until max_files files are seen. Rows are
+    taken from the first sample_bytes of each sampled file, the cut last line is dropped.
+    """
+    files = []
+    pending = [""]
+    truncated = False
+    while pending:
+        entries = api_list_dataset_tree(token, dataset_id, branch, pending.pop(0))
+        if not isinstance(entries, list):
+            if not files:
+                return entries
+            break
+        for entry in entries:
+            if entry["type"] == "dir":
+                pending.append(entry["path"])
+            elif len(files) < max_files:
+                files.append({"path": entry["path"], "size": entry["size"]})
+            else:
+                truncated = True
+        if truncated:
+            break
+
+    samples = []
+    for file in [f for f in files if f["path"].lower().endswith(SAMPLE_TEXT_SUFFIXES)][:sample_files]:
+        body = api_read_dataset_file_range(token, dataset_id, file["path"], branch, 0, sample_bytes)
+        if isinstance(body, dict):
+            samples.append({"path": file["path"], **body})
+            continue
+        lines = body.decode("utf-8", errors="replace").split("\n")
+        if len(body) >= sample_bytes and file["size"] and file["size"] > sample_bytes:
+            lines = lines[:-1]
+        samples.append({"path": file["path"], "rows": [line for line in lines if line.strip()][:sample_rows]})
+
+    return {
+        "dataset_id": dataset_id,
+        "branch": branch,
+        "files": files,
+        "file_count": len(files),
+        "total_size": sum(f["size"] or 0 for f in files),
+        "files_truncated": truncated,
+        "samples": samples,
+    }
@@ -1,6 +1,10 @@
+import asyncio
 import logging
-from mcp.server.fastmcp import FastMCP
-import json
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.types import CallToolResult
+from .results import tool_result
+from .polling import wait_for_status, DATAFLOW_JOB_READY_STATUSES, DATAFLOW_JOB_FAILED_STATUSES
+from .watcher import StatusWatcher, WatchKind, list_all_pages
 from .api_client import (
     api_get_username_from_token,
     api_list_jobs,
@@ -9,46 +13,102 @@ from .api_client import (
     api_delete_job,
     api_get_template_list,
     api_get_dataset_detail,
+    api_summarize_dataset_branch,
 )
 
 logger = logging.getLogger(__name__)
 
+DATAFLOW_JOB_DONE_STATUSES = DATAFLOW_JOB_READY_STATUSES | DATAFLOW_JOB_FAILED_STATUSES
+
 def register_dataflow_tools(mcp_instance: FastMCP):
     register_dataflow_list(mcp_instance=mcp_instance)
     register_dataflow_query(mcp_instance=mcp_instance)
+    register_dataflow_wait(mcp_instance=mcp_instance)
     register_dataflow_create(mcp_instance=mcp_instance)
     register_dataflow_delete(mcp_instance=mcp_instance)
     register_dataflow_template_list(mcp_instance=mcp_instance)
     register_check_dataset(mcp_instance=mcp_instance)
+    register_dataflow_watch_tools(mcp_instance=mcp_instance)
 
 def register_dataflow_list(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="list_user_dataflow_jobs",
         title="List dataflow jobs for a user from CSGHub with access token.",
-        description="Retrieve a list of dataflow jobs for a specific user from CSGHub with user access token. You can control the pagination by specifying the number of items per page and the page number.",
+        description="Retrieve a list of dataflow jobs for a specific user from CSGHub with user access token. You can control the pagination by specifying the number of items per page and the page number. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes.",
         structured_output=True,
     )
-    def list_user_dataflow_jobs(token: str, per: int = 50, page: int = 1) -> str:
+    def list_user_dataflow_jobs(token: str, per: int = 50, page: int = 1, fields: list[str] = None) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
         
         try:
-            jobs = api_list_jobs(token, per, page)
-            return json.dumps(jobs)
+            jobs = api_list_jobs(token, per, page, fields=fields)
+            return tool_result(jobs)
         except Exception as e:
             logger.error(f"Error calling dataflow API: {e}")
-            return f"Error: Failed to list codes. {e}"
+            return tool_result({"error_message": f"Failed to list codes. {e}"})
 
 def register_dataflow_query(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="get_dataflow_job_detail_by_job_id",
         title="Get dataflow job details by job_id and template type",
-        description="Retrieve the dataflow job details by a specific id and template type (default is 'data_refine') from CSGHub with user access token. This is useful for checking the details of a job that has been submitted to the CSGHub service.",
+        description="Retrieve the dataflow job details by a specific id and template type (default is 'data_refine') from CSGHub with user access token. This is useful for checking the details of a job that has been submitted to the CSGHub service. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes.",
+        structured_output=True,
+    )
+    def get_dataflow_job_detail_by_job_id(token: str, job_id: int, template_type: str = "data_refine", fields: list[str] = None) -> CallToolResult:
+        json_data = api_get_job_details(token=token, job_id=job_id, job_type=template_type, fields=fields)
+        return tool_result(json_data)
+
+def register_dataflow_wait(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="wait_for_dataflow_job",
+        title="Wait for a dataflow job to finish and summarize its output branch",
+        description="Wait server side until the dataflow job with a specific id on CSGHub reaches a terminal state, polling with backoff and sending status changes as progress. When it finished, return a bounded summary of the exported branch: up to max_files files with sizes, and the first sample_rows rows of up to sample_files text files read with range requests. dataset_id defaults to the dataset of the job. The default template type is 'data_refine'.",
         structured_output=True,
     )
-    def get_dataflow_job_detail_by_job_id(token: str, job_id: int, template_type: str = "data_refine") -> str:
-        json_data = api_get_job_details(token=token, job_id=job_id, job_type=template_type)
-        return json.dumps(json_data)
+    async def wait_for_dataflow_job(
+        token: str, job_id: int,
+        dataset_id: str = "", template_type: str = "data_refine",
+        timeout: int = 3600, max_files: int = 200,
+        sample_files: int = 3, sample_rows: int = 5,
+        ctx: Context = None,
+    ) -> CallToolResult:
+        changes = 0
+
+        async def on_change(status: str, data: dict, elapsed: float):
+            nonlocal changes
+            changes += 1
+            logger.info(f"dataflow job {job_id} is {status} after {elapsed:.0f}s")
+            if ctx:
+                await ctx.report_progress(progress=changes, message=f"dataflow job {job_id} is {status}")
+
+        waited = await wait_for_status(
+            lambda: api_get_job_details(token=token, job_id=job_id, job_type=template_type),
+            DATAFLOW_JOB_READY_STATUSES,
+            DATAFLOW_JOB_FAILED_STATUSES,
+            timeout=timeout,
+            on_change=on_change,
+        )
+        result = dict(waited.pop("data") or {})
+        result.update(waited)
+        if waited["outcome"] != "ready":
+            result["error_message"] = f"dataflow job {job_id} did not finish: {waited['outcome']}"
+            return tool_result(result)
+
+        dataset_id = dataset_id or result.get("repo_id")
+        branch = result.get("output_branch_name")
+        if not dataset_id or not branch:
+            result["error_message"] = "the job reports no output dataset or branch, pass dataset_id to summarize it."
+            return tool_result(result)
+
+        if ctx:
+            await ctx.report_progress(progress=changes + 1, message=f"summarizing {dataset_id}@{branch}")
+        result["output_summary"] = await asyncio.to_thread(
+            api_summarize_dataset_branch,
+            token, dataset_id, branch,
+            max_files=max_files, sample_files=sample_files, sample_rows=sample_rows,
+        )
+        return tool_result(result)
 
 def register_dataflow_create(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -63,12 +123,12 @@ def register_dataflow_create(mcp_instance: FastMCP):
         template_id: int,
         branch: str = "main",
         text_keys: str = "text",
-    ) -> str:
+    ) -> CallToolResult:
         try:
             username = api_get_username_from_token(token)
         except Exception as e:
             logger.error(f"Error calling user token API: {e}")
-            return f"Error: Failed to get username. {e}"
+            return tool_result({"error_message": f"Failed to get username. {e}"})
 
         json_data = api_create_job(
             token=token,
@@ -78,7 +138,7 @@ def register_dataflow_create(mcp_instance: FastMCP):
             username=username,
             text_keys=text_keys,
         )
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
 def register_dataflow_delete(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -87,9 +147,9 @@ def register_dataflow_delete(mcp_instance: FastMCP):
         description="Delete the dataflow job by a specific id from CSGHub with user access token.",
         structured_output=True,
     )
-    def delete_dataflow_job_by_id(token: str, job_id: int) -> str:
+    def delete_dataflow_job_by_id(token: str, job_id: int) -> CallToolResult:
         json_data = api_delete_job(token=token, job_id=job_id)
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
 def register_dataflow_template_list(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -98,9 +158,9 @@ def register_dataflow_template_list(mcp_instance: FastMCP):
         description="Retrieve a list of available dataflow templates from CSGHub with user access token. You can control the pagination by specifying the number of items per page and the page number.",
         structured_output=True,
     )
-    def query_dataflow_templates(token: str, page: int = 1, page_size: int = 50) -> str:
+    def query_dataflow_templates(token: str, page: int = 1, page_size: int = 50) -> CallToolResult:
         json_data = api_get_template_list(token=token, page=page, page_size=page_size)
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
 def register_check_dataset(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -109,7 +169,56 @@ def register_check_dataset(mcp_instance: FastMCP):
         description="Retrieve and find dataset detail and check if dataset exists in CSGHub by a specific ID from CSGHub.",
         structured_output=True,
     )
-    def check_dataset_by_dataset_id(token: str, dataset_id: str) -> str:
+    def check_dataset_by_dataset_id(token: str, dataset_id: str) -> CallToolResult:
         json_data = api_get_dataset_detail(token, dataset_id)
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
+def register_dataflow_watch_tools(mcp_instance: FastMCP):
+    watcher = StatusWatcher(mcp_instance)
+    watcher.register_kind(WatchKind(
+        name="dataflow",
+        fetch_one=lambda token, params: api_get_job_details(token, params["job_id"]),
+        done_statuses=DATAFLOW_JOB_DONE_STATUSES,
+        list_all=lambda token: list_all_pages(
+            lambda per, page: api_list_jobs(token, per, page)
+        ),
+        item_key=lambda item: item["job_id"],
+    ))
+
+    @mcp_instance.resource(
+        "csghub://dataflow/{job_id}",
+        name="dataflow_job_status",
+        description="Cached status of a watched dataflow job, updated by watch_dataflow_job_status.",
+        mime_type="application/json",
+    )
+    def dataflow_job_status(job_id: str) -> dict:
+        return watcher.read(watcher.uri_for("dataflow", job_id))
+
+    @mcp_instance.tool(
+        name="watch_dataflow_job_status",
+        title="Watch dataflow job status by job ID",
+        description="Watch a dataflow job by job ID on CSGHub with user access token. The server polls it once per interval for all sessions together and sends a resources/updated notification for the returned uri whenever it changes, read the uri to get the current status. The calling session is subscribed automatically. Only sessions that watched the uri with their own token can read or subscribe to it. Watching ends after ttl seconds or when unwatch_status is called.",
+        structured_output=True,
+    )
+    async def watch_dataflow_job_status(
+        token: str, job_id: int,
+        ttl: int = 3600, ctx: Context = None,
+    ) -> CallToolResult:
+        result = await watcher.watch(
+            "dataflow", job_id,
+            {"job_id": job_id},
+            token, session=ctx.session if ctx else None, ttl=ttl,
+        )
+        return tool_result(result)
+
+    @mcp_instance.tool(
+        name="unwatch_status",
+        title="Stop watching a status uri",
+        description="Stop watching the uri returned by watch_dataflow_job_status for the calling session. Polling stops when no session watches it anymore.",
+        structured_output=True,
+    )
+    def unwatch_status(uri: str, ctx: Context = None) -> CallToolResult:
+        found = watcher.unwatch(uri, ctx.session if ctx else None)
+        if not found:
+            return tool_result({"error_message": f"{uri} is not watched."})
+        return tool_result({"uri": uri, "watching": uri in watcher.entities})
@@ -0,0 +1,226 @@
+import contextvars
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+import pydantic_core
+import requests
+from mcp.server.fastmcp import FastMCP
+
+logger = logging.getLogger(__name__)
+
+USAGE_TOP_K = int(os.getenv("CSGHUB_MCP_USAGE_TOP_K", "256"))
+USAGE_SORT_KEYS = ["calls", "tool_calls", "upstream_calls", "errors", "bytes_in", "bytes_out",
+                   "upstream_bytes_sent", "upstream_bytes_received", "tool_seconds", "upstream_seconds"]
+TOKEN_KEY_CHARS = 16
+
+_caller = contextvars.ContextVar("csghub_mcp_usage_caller", default=None)
+_requests_tracked = False
+
+
+def token_key(token: str) -> str:
+    """Stable short id of a token, the raw token is never kept."""
+    return hashlib.sha256(token.encode()).hexdigest()[:TOKEN_KEY_CHARS]
+
+
+class UsageTable:
+    """Usage per caller for the heaviest capacity callers, with the Space-Saving algorithm.
+
+    Callers are ranked by calls, tool calls plus upstream calls. When the table
+    is full a new caller replaces the one with the fewest calls and inherits its
+    count as overcount, so a caller's calls are never under counted and any
+    caller with more than total/capacity calls is always kept. The other
+    figures of a replaced caller start from zero.
+    """
+
+    def __init__(self, capacity: int = USAGE_TOP_K):
+        self.capacity = capacity
+        self.total_calls = 0
+        self.evictions = 0
+        self.since = time.time()
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _entry(self, key: str) -> dict:
+        entry = self._entries.get(key)
+        if entry is None:
+            overcount = 0
+            if len(self._entries) >= self.capacity:
+                smallest = min(self._entries, key=lambda k: self._entries[k]["calls"])
+                overcount = self._entries.pop(smallest)["calls"]
+                self.evictions += 1
+            entry = self._entries[key] = {
+                "caller": key,
+                "calls": overcount,
+                "overcount": overcount,
+                "tool_calls": 0,
+                "upstream_calls": 0,
+                "errors": 0,
+                "bytes_in": 0,
+                "bytes_out": 0,
+                "upstream_bytes_sent": 0,
+                "upstream_bytes_received": 0,
+                "tool_seconds": 0.0,
+                "upstream_seconds": 0.0,
+                "tools": Counter(),
+            }
+        return entry
+
+    def record_tool(self, key: str, tool: str, seconds: float, bytes_in: int, bytes_out: int, error: bool):
+        with self._lock:
+            entry = self._entry(key)
+            entry["calls"] += 1
+            entry["tool_calls"] += 1
+            entry["tools"][tool] += 1
+            entry["errors"] += int(error)
+            entry["bytes_in"] += bytes_in
+            entry["bytes_out"] += bytes_out
+            entry["tool_seconds"] += seconds
+            self.total_calls += 1
+
+    def record_upstream(self, key: str, seconds: float, bytes_sent: int, bytes_received: int):
+        with self._lock:
+            entry = self._entry(key)
+            entry["calls"] += 1
+            entry["upstream_calls"] += 1
+            entry["upstream_bytes_sent"] += bytes_sent
+            entry["upstream_bytes_received"] += bytes_received
+            entry["upstream_seconds"] += seconds
+            self.total_calls += 1
+
+    def top(self, k: int = 20, sort_by: str = "calls") -> list:
+        with self._lock:
+            entries = sorted(self._entries.values(), key=lambda entry: entry[sort_by], reverse=True)[:k]
+            return [{**entry, "tools": dict(entry["tools"].most_common())} for entry in entries]
+
+    def summary(self) -> dict:
+        with self._lock:
+            return {
+                "since": self.since,
+                "capacity": self.capacity,
+                "tracked_callers": len(self._entries),
+                "total_calls": self.total_calls,
+                "evictions": self.evictions,
+            }
+
+    def reset(self):
+        with self._lock:
+            self._entries.clear()
+            self.total_calls = 0
+            self.evictions = 0
+            self.since = time.time()
+
+
+usage_table = UsageTable()
+
+
+@contextmanager
+def track_usage(tool: str, arguments: dict):
+    """Account one tool call to the hashed token among its arguments.
+
+    bytes_in is the size of the arguments, bytes_out the size of the result the
+    caller sets on the yielded dict, along with error. Upstream requests made
+    within, also from threads given a copy of this context, are accounted to
+    the same caller. Calls without a token are not accounted.
+    """
+    token = (arguments or {}).get("token")
+    if not isinstance(token, str) or not token:
+        yield {}
+        return
+    key = token_key(token)
+    call = {"bytes_out": 0, "error": False}
+    context_token = _caller.set(key)
+    started = time.perf_counter()
+    try:
+        yield call
+    except Exception:
+        call["error"] = True
+        raise
+    finally:
+        _caller.reset(context_token)
+        bytes_in = len(pydantic_core.to_json(arguments, fallback=str))
+        usage_table.record_tool(key, tool, time.perf_counter() - started, bytes_in, call["bytes_out"], call["error"])
+
+
+def _body_size(body) -> int:
+    try:
+        return len(body) if body is not None else 0
+    except TypeError:
+        return 0
+
+
+def track_upstream_requests():
+    """Account every requests call made inside a tracked tool call to its caller.
+
+    Wraps requests.Session.send once. Streamed responses count their
+    Content-Length, as their body is read by the caller later.
+    """
+    global _requests_tracked
+    if _requests_tracked:
+        return
+    _requests_tracked = True
+    send = requests.Session.send
+
+    def tracked_send(session, request, **kwargs):
+        key = _caller.get()
+        if key is None:
+            return send(session, request, **kwargs)
+        started = time.perf_counter()
+        response = send(session, request, **kwargs)
+        if kwargs.get("stream"):
+            received = int(response.headers.get("Content-Length", "0") or 0)
+        else:
+            received = len(response.content or b"")
+        usage_table.record_upstream(key, time.perf_counter() - started, _body_size(request.body), received)
+        return response
+
+    requests.Session.send = tracked_send
+
+
+def _metric_lines(name: str, kind: str, help_text: str, samples: list) -> list:
+    lines = [f"# HELP {name} {help_text}", f"# TYPE {name} {kind}"]
+    lines.extend(f"{name}{labels} {value}" for labels, value in samples)
+    return lines
+
+
+def render_metrics(k: int = USAGE_TOP_K) -> str:
+    """Usage of the tracked callers in the Prometheus text format."""
+    entries = usage_table.top(k)
+    summary = usage_table.summary()
+    lines = []
+    for field, kind, help_text in (
+        ("tool_calls", "counter", "Tool calls per hashed token."),
+        ("upstream_calls", "counter", "CSGHub requests per hashed token."),
+        ("errors", "counter", "Failed tool calls per hashed token."),
+        ("bytes_in", "counter", "Tool argument bytes per hashed token."),
+        ("bytes_out", "counter", "Tool result bytes per hashed token."),
+        ("upstream_bytes_sent", "counter", "CSGHub request body bytes per hashed token."),
+        ("upstream_bytes_received", "counter", "CSGHub response body bytes per hashed token."),
+        ("tool_seconds", "counter", "Cumulative tool call latency per hashed token."),
+        ("upstream_seconds", "counter", "Cumulative CSGHub request latency per hashed token."),
+    ):
+        name = f"csghub_mcp_caller_{field}_total"
+        lines.extend(_metric_lines(name, kind, help_text,
+                                   [(f'{{caller="{entry["caller"]}"}}', entry[field]) for entry in entries]))
+    lines.extend(_metric_lines("csghub_mcp_usage_calls_total", "counter", "Tool and CSGHub calls of all callers.",
+                               [("", summary["total_calls"])]))
+    lines.extend(_metric_lines("csghub_mcp_usage_tracked_callers", "gauge", "Callers held in the usage table.",
+                               [("", summary["tracked_callers"])]))
+    lines.extend(_metric_lines("csghub_mcp_usage_evictions_total", "counter", "Callers dropped from the usage table.",
+                               [("", summary["evictions"])]))
+    return "\n".join(lines) + "\n"
+
+
+def register_metrics_route(mcp_instance: FastMCP):
+    """Serve render_metrics on /metrics of the sse and streamable-http apps when CSGHUB_MCP_METRICS is set."""
+    if os.getenv("CSGHUB_MCP_METRICS", "").lower() not in ("1", "true", "yes"):
+        return
+    from starlette.requests import Request
+    from starlette.responses import PlainTextResponse
+
+    @mcp_instance.custom_route("/metrics", methods=["GET"], include_in_schema=False)
+    async def metrics(request: Request) -> PlainTextResponse:
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
@@ -0,0 +1,107 @@
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+from opentelemetry.trace import SpanKind
+
+from csghub_mcp_server_dataflow.api_client import api_get_username_from_token
+from csghub_mcp_server_dataflow.arguments import setup_argparse
+from csghub_mcp_server_dataflow.main import mcp
+from csghub_mcp_server_dataflow.tracing import setup_tracing, tool_span
+
+SECRET_TOKEN = "secret-token-value"
+TOOL_NAME = "list_user_dataflow_jobs"
+TOOL_ARGUMENTS = {"token": SECRET_TOKEN, "per": 5}
+
+
+class StubCSGHub(BaseHTTPRequestHandler):
+    """Answer the token lookup with a user and every other request with an empty list."""
+
+    def log_message(self, *args):
+        pass
+
+    def _answer(self):
+        if self.path.startswith("/api/v1/token/"):
+            body = {"data": {"user_name": "alice"}}
+        else:
+            body = {"data": [], "total": 0}
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    do_GET = do_POST = do_PUT = do_DELETE = _answer
+
+
+@pytest.fixture(scope="module")
+def csghub(monkeypatch_module):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubCSGHub)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch_module.setenv("CSGHUB_SERVER_ENDPOINT", f"http://127.0.0.1:{server.server_port}")
+    yield server
+    server.shutdown()
+
+
+@pytest.fixture(scope="module")
+def monkeypatch_module():
+    with pytest.MonkeyPatch.context() as patch:
+        yield patch
+
+
+@pytest.fixture(scope="module")
+def exporter():
+    span_exporter = setup_tracing("csghub-mcp-server-dataflow-test", exporter="memory")
+    assert isinstance(span_exporter, InMemorySpanExporter)
+    return span_exporter
+
+
+@pytest.fixture
+def spans(csghub, exporter):
+    exporter.clear()
+    yield exporter
+    exporter.clear()
+
+
+def _url(span) -> str:
+    return span.attributes.get("url.full") or span.attributes.get("http.url") or ""
+
+
+def test_tool_call_span_parents_request_spans(spans):
+    result = asyncio.run(mcp.call_tool(TOOL_NAME, TOOL_ARGUMENTS))
+    assert not getattr(result, "isError", False)
+
+    finished = spans.get_finished_spans()
+    servers = [span for span in finished if span.kind == SpanKind.SERVER]
+    assert [span.name for span in servers] == [f"tools/call {TOOL_NAME}"]
+    server = servers[0]
+    assert server.attributes["gen_ai.tool.name"] == TOOL_NAME
+    assert "mcp.tool.argument.token" not in server.attributes
+
+    clients = [span for span in finished if span.kind == SpanKind.CLIENT]
+    assert clients
+    for client in clients:
+        assert client.parent is not None
+        assert client.parent.span_id == server.context.span_id
+        assert client.context.trace_id == server.context.trace_id
+
+
+def test_token_path_is_redacted(spans):
+    with tool_span("token_lookup", {"token": SECRET_TOKEN}):
+        assert api_get_username_from_token(SECRET_TOKEN) == "alice"
+
+    clients = [span for span in spans.get_finished_spans() if span.kind == SpanKind.CLIENT]
+    assert len(clients) == 1
+    assert _url(clients[0]).endswith("/api/v1/token/REDACTED")
+    for span in spans.get_finished_spans():
+        assert SECRET_TOKEN not in span.name
+        assert all(SECRET_TOKEN not in str(value) for value in span.attributes.values())
+
+
+def test_memory_exporter_is_a_trace_exporter_choice():
+    args = setup_argparse().parse_args(["--trace-exporter", "memory"])
+    assert args.trace_exporter == "memory"
@@ -0,0 +1,274 @@
+import asyncio
+import base64
+import cProfile
+import hmac
+import io
+import logging
+import marshal
+import os
+import pstats
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from collections import Counter
+from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult
+from .results import tool_result
+from .usage import USAGE_SORT_KEYS, usage_table
+
+logger = logging.getLogger(__name__)
+
+PROFILE_MODES = ["wall", "cpu"]
+MAX_PROFILE_SECONDS = 120
+DEFAULT_SAMPLE_INTERVAL = 0.01
+MAX_COLLAPSED_STACKS = 2000
+TRACEMALLOC_FRAMES = 10
+
+_profile_lock = threading.Lock()
+_last_snapshot = None
+
+
+def admin_enabled() -> bool:
+    return os.getenv("CSGHUB_MCP_ADMIN_TOOLS", "").lower() in ("1", "true", "yes")
+
+
+def check_admin_token(admin_token: str) -> dict:
+    """Return an error dict unless admin_token matches CSGHUB_MCP_ADMIN_TOKEN."""
+    expected = os.getenv("CSGHUB_MCP_ADMIN_TOKEN", "")
+    if not expected or not hmac.compare_digest(admin_token.encode(), expected.encode()):
+        return {"error_message": "invalid admin token."}
+    return None
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})"
+
+
+def sample_stacks(seconds: float, interval: float = DEFAULT_SAMPLE_INTERVAL) -> dict:
+    """Sample the stack of every other thread until seconds have passed.
+
+    Returns the stacks in collapsed format, one "thread;outer;...;inner count"
+    line per distinct stack as flamegraph.pl and speedscope read it.
+    """
+    own_id = threading.get_ident()
+    counts = Counter()
+    samples = 0
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own_id:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            counts[";".join(reversed(stack))] += 1
+        samples += 1
+        time.sleep(interval)
+    stacks = counts.most_common(MAX_COLLAPSED_STACKS)
+    return {
+        "mode": "wall",
+        "format": "collapsed",
+        "seconds": seconds,
+        "interval": interval,
+        "samples": samples,
+        "distinct_stacks": len(counts),
+        "truncated": len(counts) > MAX_COLLAPSED_STACKS,
+        "collapsed": "\n".join(f"{stack} {count}" for stack, count in stacks),
+    }
+
+
+def profile_stats(profiler: cProfile.Profile, top: int) -> dict:
+    """Render a finished profile as pstats text and as a base64 .prof file."""
+    stats = pstats.Stats(profiler)
+    text = io.StringIO()
+    stats.stream = text
+    stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(top)
+    return {
+        "format": "pstats",
+        "summary": text.getvalue(),
+        "pstats_base64": base64.b64encode(marshal.dumps(stats.stats)).decode(),
+    }
+
+
+def tracemalloc_top(top: int, group_by: str = "lineno") -> dict:
+    """Top allocations of a tracemalloc snapshot, with the growth since the previous one."""
+    global _last_snapshot
+    snapshot = tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+    current, peak = tracemalloc.get_traced_memory()
+    res_data = {
+        "traced_bytes": current,
+        "peak_bytes": peak,
+        "top": [
+            {"location": str(stat.traceback), "size": stat.size, "count": stat.count}
+            for stat in snapshot.statistics(group_by)[:top]
+        ],
+    }
+    if _last_snapshot is not None:
+        res_data["growth"] = [
+            {"location": str(stat.traceback), "size_diff": stat.size_diff, "count_diff": stat.count_diff}
+            for stat in snapshot.compare_to(_last_snapshot, group_by)[:top]
+        ]
+    _last_snapshot = snapshot
+    return res_data
+
+
+def dump_stacks() -> dict:
+    """Stacks of all threads, and of all asyncio tasks when called on the event loop."""
+    names = {thread.ident: thread.name for thread in threading.enumerate()}
+    threads = [
+        {"thread": names.get(thread_id, f"thread-{thread_id}"), "stack": "".join(traceback.format_stack(frame))}
+        for thread_id, frame in sys._current_frames().items()
+    ]
+    tasks = []
+    try:
+        running = asyncio.all_tasks()
+    except RuntimeError:
+        running = set()
+    for task in running:
+        stack = io.StringIO()
+        task.print_stack(file=stack)
+        coro = task.get_coro()
+        tasks.append({
+            "task": task.get_name(),
+            "coro": getattr(coro, "__qualname__", repr(coro)),
+            "done": task.done(),
+            "stack": stack.getvalue(),
+        })
+    return {"threads": threads, "tasks": tasks}
+
+
+def register_admin_tools(mcp_instance: FastMCP):
+    """Register the profiling and usage tools when CSGHUB_MCP_ADMIN_TOOLS is set.
+
+    Every call must pass the CSGHUB_MCP_ADMIN_TOKEN value as admin_token.
+    """
+    if not admin_enabled():
+        return
+    if not os.getenv("CSGHUB_MCP_ADMIN_TOKEN"):
+        logger.error("admin tools are enabled but CSGHUB_MCP_ADMIN_TOKEN is not set, not registering them")
+        return
+    register_admin_profile(mcp_instance=mcp_instance)
+    register_admin_tracemalloc(mcp_instance=mcp_instance)
+    register_admin_stacks(mcp_instance=mcp_instance)
+    register_admin_usage(mcp_instance=mcp_instance)
+
+
+def register_admin_profile(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="admin_profile",
+        title="Profile the running server",
+        description="Admin only. Profile this server for seconds (at most 120) while it keeps serving. mode wall samples the stacks of all threads every interval seconds and returns them in collapsed format for flamegraph.pl or speedscope. mode cpu runs cProfile on the event loop thread and returns the top functions by cumulative time as pstats text, plus the raw profile as base64 of a .prof file. One profile runs at a time.",
+        structured_output=True,
+    )
+    async def admin_profile(
+        admin_token: str,
+        seconds: float = 10,
+        mode: str = "wall",
+        interval: float = DEFAULT_SAMPLE_INTERVAL,
+        top: int = 50,
+    ) -> CallToolResult:
+        error = check_admin_token(admin_token)
+        if error:
+            return tool_result(error)
+        if mode not in PROFILE_MODES:
+            return tool_result({"error_message": f"mode must be one of {', '.join(PROFILE_MODES)}."})
+        if seconds <= 0 or seconds > MAX_PROFILE_SECONDS or interval < 0.001:
+            return tool_result({"error_message": f"seconds must be in (0, {MAX_PROFILE_SECONDS}], interval at least 0.001."})
+        if not _profile_lock.acquire(blocking=False):
+            return tool_result({"error_message": "another profile is running."})
+        try:
+            if mode == "wall":
+                json_data = await asyncio.to_thread(sample_stacks, seconds, interval)
+            else:
+                profiler = cProfile.Profile()
+                profiler.enable()
+                try:
+                    await asyncio.sleep(seconds)
+                finally:
+                    profiler.disable()
+                json_data = {"mode": "cpu", "seconds": seconds, **profile_stats(profiler, top)}
+        finally:
+            _profile_lock.release()
+        return tool_result(json_data)
+
+
+def register_admin_tracemalloc(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="admin_tracemalloc",
+        title="Trace memory allocations of the running server",
+        description="Admin only. action start begins tracing allocations, snapshot returns the top allocations grouped by lineno, filename or traceback and their growth since the previous snapshot, stop ends tracing. Tracing slows allocations down, stop it when done.",
+        structured_output=True,
+    )
+    def admin_tracemalloc(
+        admin_token: str,
+        action: str = "snapshot",
+        top: int = 20,
+        group_by: str = "lineno",
+    ) -> CallToolResult:
+        global _last_snapshot
+        error = check_admin_token(admin_token)
+        if error:
+            return tool_result(error)
+        if group_by not in ("lineno", "filename", "traceback"):
+            return tool_result({"error_message": "group_by must be one of lineno, filename, traceback."})
+        if action == "start":
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(TRACEMALLOC_FRAMES)
+                _last_snapshot = None
+            return tool_result({"tracing": True})
+        if action == "stop":
+            tracemalloc.stop()
+            _last_snapshot = None
+            return tool_result({"tracing": False})
+        if action != "snapshot":
+            return tool_result({"error_message": "action must be one of start, snapshot, stop."})
+        if not tracemalloc.is_tracing():
+            return tool_result({"error_message": "tracemalloc is not tracing, call with action start first."})
+        return tool_result(tracemalloc_top(top, group_by))
+
+
+def register_admin_stacks(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="admin_dump_stacks",
+        title="Dump thread and asyncio task stacks",
+        description="Admin only. Return the current stack of every thread and of every asyncio task of this server.",
+        structured_output=True,
+    )
+    async def admin_dump_stacks(admin_token: str) -> CallToolResult:
+        error = check_admin_token(admin_token)
+        if error:
+            return tool_result(error)
+        return tool_result(dump_stacks())
+
+
+def register_admin_usage(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="admin_usage_report",
+        title="Report the callers driving the most load",
+        description="Admin only. Return the top callers, identified by a hash of their token, with their tool calls per tool, CSGHub requests, errors, bytes of arguments and results, bytes sent to and received from CSGHub and cumulative latency, sorted by sort_by (default calls, tool calls plus CSGHub requests). Only the heaviest callers are tracked, overcount bounds how much of a caller's calls may belong to callers it replaced. reset clears the table after reporting.",
+        structured_output=True,
+    )
+    def admin_usage_report(
+        admin_token: str,
+        top: int = 20,
+        sort_by: str = "calls",
+        reset: bool = False,
+    ) -> CallToolResult:
+        error = check_admin_token(admin_token)
+        if error:
+            return tool_result(error)
+        if sort_by not in USAGE_SORT_KEYS:
+            return tool_result({"error_message": f"sort_by must be one of {', '.join(USAGE_SORT_KEYS)}."})
+        json_data = {**usage_table.summary(), "callers": usage_table.top(top, sort_by)}
+        if reset:
+            usage_table.reset()
+        return tool_result(json_data)
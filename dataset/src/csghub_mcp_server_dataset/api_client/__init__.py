@@ -9,3 +9,16 @@ from .dataset import get_issue_data
 from .dataset import upload_issue_data
 from .dataset import api_create_dataset_new_branch
 from .dataset import api_list_dataset_branchs
+from .upload import iter_jsonl_shards
+from .upload import upload_raw_file
+from .upload import upload_shards
+from .sync import load_watermark
+from .sync import save_watermark
+from .sync import select_new_records
+from .sync import sync_file_name
+from .lfs import is_lfs_path
+from .lfs import upload_repo_files
+from .dataset import upload_issue_export
+from .export import OUTPUT_FORMATS, export_file_name
+from .files import api_read_repo_file
+from .preview import api_preview_dataset
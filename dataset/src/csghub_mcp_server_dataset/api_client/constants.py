@@ -1,26 +1,96 @@
 import os
+import random
 from dataclasses import dataclass
 
+# upstream bodies are cut to this many bytes in logs, and logged for this fraction of records
+LOG_BODY_BYTES = int(os.getenv("CSGHUB_MCP_LOG_BODY_BYTES", "2048"))
+LOG_BODY_SAMPLE_RATE = float(os.getenv("CSGHUB_MCP_LOG_BODY_SAMPLE_RATE", "1.0"))
+
 @dataclass
 class CSGHubConfig:    
     api_endpoint: str = None
     web_endpoint: str = None
     issue_endpoint: str = None
+    state_dir: str = None
+    upload_root: str = None
     
     def __post_init__(self):
         self.api_endpoint = self.api_endpoint or os.getenv("CSGHUB_SERVER_ENDPOINT", "https://hub.opencsg.com")
         self.web_endpoint = self.web_endpoint or os.getenv("CSGHUB_WEB_ENDPOINT", "https://opencsg.com")
         self.issue_endpoint = self.issue_endpoint or os.getenv("CSGHUB_ISSUE_ENDPOINT", "http://127.0.0.1")
+        self.state_dir = self.state_dir or os.getenv("CSGHUB_MCP_STATE_DIR", os.path.expanduser("~/.csghub_mcp"))
+        self.upload_root = self.upload_root or os.getenv("CSGHUB_MCP_UPLOAD_ROOT", "")
 
 def get_csghub_config() -> CSGHubConfig:
     return CSGHubConfig()
 
+def resolve_upload_path(local_path: str) -> str:
+    """Resolve a path on the MCP server host that may be uploaded.
+
+    Only files under CSGHUB_MCP_UPLOAD_ROOT can be uploaded, relative paths are
+    taken from it. Symlinks are resolved before the check. Raises ValueError
+    when no root is configured or the path leaves it.
+    """
+    root = get_csghub_config().upload_root
+    if not root:
+        raise ValueError("uploading local files is disabled, set CSGHUB_MCP_UPLOAD_ROOT on the MCP server to enable it")
+    root = os.path.realpath(root)
+    path = os.path.realpath(os.path.join(root, local_path))
+    if os.path.commonpath([root, path]) != root:
+        raise ValueError(f"{local_path} is outside the upload root")
+    return path
+
 def wrap_error_response(response) -> dict:
     return {
         "error_code": response.status_code,
         "error_message": response.text,
     }
 
+
+class ResponseBody:
+    """Upstream response body for a log message, rendered only when the record is.
+
+    The body is cut to LOG_BODY_BYTES and left out of all but
+    LOG_BODY_SAMPLE_RATE of the records, so a burst of upstream errors does not
+    turn into a burst of large log writes.
+    """
+
+    __slots__ = ("_response",)
+
+    def __init__(self, response):
+        self._response = response
+
+    def __str__(self):
+        content = getattr(self._response, "content", None) or b""
+        if LOG_BODY_SAMPLE_RATE < 1 and random.random() >= LOG_BODY_SAMPLE_RATE:
+            return f"<{len(content)} bytes body not sampled>"
+        if len(content) <= LOG_BODY_BYTES:
+            return content.decode("utf-8", errors="replace")
+        return f"{content[:LOG_BODY_BYTES].decode('utf-8', errors='ignore')}... <{len(content)} bytes>"
+
+
+def response_body(response) -> ResponseBody:
+    return ResponseBody(response)
+
+
+def pick_fields(data: dict, fields: list) -> dict:
+    """Extract only the requested attributes from an upstream item.
+
+    Nested attributes are addressed with dots, e.g. "repository.http_clone_url".
+    Missing attributes are returned as None.
+    """
+    res_data = {}
+    for field in fields:
+        value = data
+        for key in field.split("."):
+            if isinstance(value, dict) and key in value:
+                value = value[key]
+            else:
+                value = None
+                break
+        res_data[field] = value
+    return res_data
+
 GIT_ATTRIBUTES_CONTENT = """
 *.duckdb filter=lfs diff=lfs merge=lfs -text
 *.7z filter=lfs diff=lfs merge=lfs -text
@@ -78,4 +148,4 @@ saved_model/**/* filter=lfs diff=lfs merge=lfs -text
 *.jpg filter=lfs diff=lfs merge=lfs -text
 *.jpeg filter=lfs diff=lfs merge=lfs -text
 *.webp filter=lfs diff=lfs merge=lfs -text
-"""
\ No newline at end of file
+"""
@@ -1,15 +1,24 @@
 import requests
 import logging
 import base64
+import os
+import posixpath
+import tempfile
 from .constants import (
     get_csghub_config, 
     wrap_error_response, 
-    GIT_ATTRIBUTES_CONTENT
+    pick_fields,
+    GIT_ATTRIBUTES_CONTENT,
+    response_body,
 )
+from .upload import DEFAULT_SHARD_BYTES, iter_jsonl_shards, upload_shards
+from .export import write_export
+from .lfs import upload_repo_files
+from .user import api_get_username_from_token
 
 logger = logging.getLogger(__name__)
 
-def api_list_datasets(token: str, username: str, per: int = 10, page: int = 1) -> dict:
+def api_list_datasets(token: str, username: str, per: int = 10, page: int = 1, fields: list = None) -> dict:
     config = get_csghub_config()
     headers = {"Authorization": f"Bearer {token}"}
     params = {
@@ -19,7 +28,7 @@ def api_list_datasets(token: str, username: str, per: int = 10, page: int = 1) -
     url = f"{config.api_endpoint}/api/v1/user/{username}/datasets"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to list user datasets on {url}: {response.text}")
+        logger.error("failed to list user datasets on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -31,18 +40,21 @@ def api_list_datasets(token: str, username: str, per: int = 10, page: int = 1) -
         return res_data
 
     for res in res_list:
+        if fields:
+            res_data.append(pick_fields(res, fields))
+            continue
         res_data.append({
             "dataset_id": res["path"]
         })
     return res_data
 
-def api_get_dataset_details(token: str, dataset_id: str) -> dict:
+def api_get_dataset_details(token: str, dataset_id: str, fields: list = None) -> dict:
     config = get_csghub_config()
     headers = {"Authorization": f"Bearer {token}"}
     url = f"{config.api_endpoint}/api/v1/datasets/{dataset_id}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get dataset details on {url}: {response.text}")
+        logger.error("failed to get dataset details on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -51,6 +63,8 @@ def api_get_dataset_details(token: str, dataset_id: str) -> dict:
 
     if json_data and "data" in json_data:
         res = json_data["data"]
+        if fields:
+            return pick_fields(res, fields)
         access_url = f"{config.web_endpoint}/datasets/{res['path']}"
         res_data = {
             "dataset_id": res["path"],
@@ -85,7 +99,7 @@ def api_create_dataset(
     url = f"{config.api_endpoint}/api/v1/datasets"
     response = requests.post(url, headers=headers, json=data)
     if response.status_code != 200:
-        logger.error(f"failed to create dataset repo: {data} on {url} :{response.text}")
+        logger.error("failed to create dataset repo: %s on %s :%s", data, url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -107,13 +121,13 @@ def api_delete_dataset(token: str, dataset_id: str) -> dict:
     url = f"{config.api_endpoint}/api/v1/datasets/{dataset_id}"
     response = requests.delete(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to delete dataset on {url}: {response.text}")
+        logger.error("failed to delete dataset on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
     return response.json()
 
-def api_find_datasets_by_name(token: str, name: str, page: int = 1, page_size: int = 20) -> dict:
+def api_find_datasets_by_name(token: str, name: str, page: int = 1, page_size: int = 20, fields: list = None) -> dict:
     config = get_csghub_config()
 
     headers = {
@@ -129,7 +143,7 @@ def api_find_datasets_by_name(token: str, name: str, page: int = 1, page_size: i
     url = f"{config.api_endpoint}/api/v1/datasets"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to get searched datasets on {url}: {response.text}")
+        logger.error("failed to get searched datasets on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     response.raise_for_status()
@@ -142,6 +156,9 @@ def api_find_datasets_by_name(token: str, name: str, page: int = 1, page_size: i
 
     total = json_data["total"]
     for res in res_list:
+        if fields:
+            res_data.append(pick_fields(res, fields))
+            continue
         res_data.append({
             "dataset_id": res["path"],
         })
@@ -157,7 +174,7 @@ def api_list_dataset_branchs(token: str, dataset_id: str) -> dict:
     url = f"{config.api_endpoint}/api/v1/datasets/{dataset_id}/branches"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get dataset branchs on {url}: {response.text}")
+        logger.error("failed to get dataset branchs on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     json_data = response.json()
@@ -188,7 +205,7 @@ def api_create_dataset_new_branch(token: str, dataset_id: str, new_branch: str)
     }
     response = requests.post(url, json=data, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to create branch on {url} response: {response.text}")
+        logger.error("failed to create branch on %s response: %s", url, response_body(response))
         return wrap_error_response(response)
 
     json_data = response.json()
@@ -200,34 +217,74 @@ def upload_issue_data(
     branch: str,
     content: list,
     file_name: str,
+    shard_bytes: int = DEFAULT_SHARD_BYTES,
+    max_concurrency: int = 4,
 ) -> dict:
+    """Upload records as JSONL shards of about shard_bytes, returning the upload manifest."""
+    shards = iter_jsonl_shards(content, shard_bytes)
+    return upload_shards(token, dataset_id, branch, shards, file_name, max_concurrency=max_concurrency)
+
+def upload_issue_export(
+    token: str,
+    dataset_id: str,
+    branch: str,
+    content: list,
+    file_name: str,
+    output_format: str,
+    max_concurrency: int = 4,
+) -> dict:
+    """Write records to a local Parquet or zstd JSONL file and upload it through Git LFS.
+
+    The file is written batch by batch into a temporary directory, then streamed
+    from disk by the LFS upload. The manifest has the same shape as for JSONL shards.
+    """
     config = get_csghub_config()
-    url = f"{config.api_endpoint}/api/v1/datasets/{dataset_id}/raw/{file_name}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Content-Type": "application/json"
+    username = api_get_username_from_token(token)
+    if not isinstance(username, str):
+        return username
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        local_path = os.path.join(tmp_dir, posixpath.basename(file_name))
+        try:
+            exported = write_export(content, local_path, output_format)
+        except ImportError as e:
+            return {"error_message": f"{output_format} output needs the export extra, install csghub-mcp-server-dataset[export]: {e}"}
+        except ValueError as e:
+            logger.error(f"failed to export records as {output_format}: {e}")
+            return {"error_message": f"Failed to export records as {output_format}. {e}"}
+        if exported["records"] < 1:
+            return {"error_message": "No any records to upload."}
+        uploaded = upload_repo_files(token, username, dataset_id, [(local_path, file_name)],
+                                     branch=branch, max_concurrency=max_concurrency)
+
+    entry = uploaded["files"][0]
+    shard = {
+        "file_name": file_name,
+        "records": exported["records"],
+        "bytes": exported["bytes"],
+        "sha256": entry.get("oid"),
+        "lfs": entry.get("lfs", False),
+        "status": entry["status"],
     }
-    content_str = '\n'.join(content)
-    encoded_content = base64.b64encode(content_str.encode('utf-8')).decode('utf-8')
-    payload = {
-        "content": encoded_content,
-        "message": f"Upload {file_name}",
+    if "error_message" in entry:
+        shard["error_message"] = entry["error_message"]
+    manifest = {
+        "dataset_id": dataset_id,
         "branch": branch,
-        "new_branch": branch
+        "access_url": f"{config.web_endpoint}/datasets/{dataset_id}?tab=files&actionName=files&branch={branch}",
+        "output_format": output_format,
+        "shards": [shard],
+        "total_records": exported["records"],
+        "total_bytes": exported["bytes"],
+        "unchanged": uploaded.get("unchanged", 0),
     }
-    response = requests.post(url, headers=headers, json=payload)
-    if response.status_code != 201 and response.status_code != 200:
-        logger.error(f"failed to upload file to {url}: {response.text}")
-        return wrap_error_response(response)
-
-    json_data = response.json()
-
-    if "msg" in json_data or json_data["msg"].lower() == "ok":
-        access_url = f"{config.web_endpoint}/datasets/{dataset_id}?tab=files&actionName=files&branch={branch}"
-        json_data["access_url"] = access_url
-        json_data["file_name"] = file_name
-        
-    return json_data
+    if "columns" in exported:
+        manifest["columns"] = exported["columns"]
+    if "raw_bytes" in exported:
+        manifest["raw_bytes"] = exported["raw_bytes"]
+    if "error_message" in uploaded:
+        manifest["error_message"] = uploaded["error_message"]
+    return manifest
 
 def get_issue_data():
     config = get_csghub_config()
@@ -237,7 +294,7 @@ def get_issue_data():
     url = f"{config.issue_endpoint}/latest-qa"
     response = requests.get(url, headers=headers, verify=False)
     if response.status_code != 200:
-        logger.error(f"failed to get issue qa on {url}: {response.text}")
+        logger.error("failed to get issue qa on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     json_data = response.json()    
@@ -0,0 +1,166 @@
+import json
+import logging
+import os
+from .upload import serialize_record
+
+logger = logging.getLogger(__name__)
+
+OUTPUT_FORMATS = {
+    "jsonl": ".jsonl",
+    "parquet": ".parquet",
+    "jsonl.zst": ".jsonl.zst",
+}
+PARQUET_ROW_GROUP_ROWS = 10000
+ZSTD_LEVEL = 10
+
+
+def export_file_name(file_name: str, output_format: str) -> str:
+    """Give file_name the suffix of the output format, replacing a .jsonl suffix."""
+    suffix = OUTPUT_FORMATS[output_format]
+    if file_name.endswith(suffix):
+        return file_name
+    if file_name.endswith(".jsonl"):
+        file_name = file_name[:-len(".jsonl")]
+    return f"{file_name}{suffix}"
+
+
+def _as_row(record) -> dict:
+    if isinstance(record, (str, bytes, bytearray)):
+        try:
+            record = json.loads(record)
+        except ValueError:
+            return {"text": record if isinstance(record, str) else bytes(record).decode("utf-8", errors="replace")}
+    return record if isinstance(record, dict) else {"value": record}
+
+
+def _batches(records, size: int):
+    batch = []
+    for record in records:
+        batch.append(_as_row(record))
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def _stat_value(value):
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value if isinstance(value, (int, float, str, bool)) or value is None else str(value)
+
+
+def parquet_column_statistics(local_path: str) -> list:
+    """Fold the row group statistics of a Parquet footer into one entry per column."""
+    import pyarrow.parquet as pq
+
+    metadata = pq.read_metadata(local_path)
+    columns = {}
+    for group in range(metadata.num_row_groups):
+        row_group = metadata.row_group(group)
+        for index in range(row_group.num_columns):
+            chunk = row_group.column(index)
+            column = columns.setdefault(chunk.path_in_schema, {
+                "column": chunk.path_in_schema,
+                "type": chunk.physical_type,
+                "null_count": 0,
+                "min": None,
+                "max": None,
+                "compressed_bytes": 0,
+            })
+            column["compressed_bytes"] += chunk.total_compressed_size
+            stats = chunk.statistics
+            if stats is None:
+                continue
+            if stats.has_null_count:
+                column["null_count"] += stats.null_count
+            if stats.has_min_max:
+                low, high = _stat_value(stats.min), _stat_value(stats.max)
+                try:
+                    column["min"] = low if column["min"] is None else min(column["min"], low)
+                    column["max"] = high if column["max"] is None else max(column["max"], high)
+                except TypeError:
+                    pass
+    return list(columns.values())
+
+
+def parquet_schema(records, row_group_rows: int = PARQUET_ROW_GROUP_ROWS):
+    """Unify the schemas inferred for every row group of records.
+
+    Columns missing from some rows become nullable, null only columns take the
+    type found later and numbers widen, int to double. Raises ValueError when
+    the records hold incompatible types for a column.
+    """
+    import pyarrow as pa
+
+    try:
+        schemas = [pa.Table.from_pylist(batch).schema for batch in _batches(records, row_group_rows)]
+        return pa.unify_schemas(schemas, promote_options="permissive") if schemas else None
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        raise ValueError(f"records do not fit one Parquet schema, {e}") from e
+
+
+def write_parquet(records, local_path: str, row_group_rows: int = PARQUET_ROW_GROUP_ROWS) -> dict:
+    """Write records to a zstd compressed Parquet file one row group at a time.
+
+    The schema is unified over all records first, see parquet_schema, so every
+    row group is written with the same schema. Column statistics are written
+    into the footer and returned. Raises ValueError when the records do not
+    fit one schema.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    records = records if isinstance(records, list) else list(records)
+    schema = parquet_schema(records, row_group_rows)
+    if schema is None:
+        return {"records": 0}
+    count = 0
+    try:
+        with pq.ParquetWriter(local_path, schema, compression="zstd", write_statistics=True) as writer:
+            for batch in _batches(records, row_group_rows):
+                writer.write_table(pa.Table.from_pylist(batch, schema=schema), row_group_size=row_group_rows)
+                count += len(batch)
+    except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+        raise ValueError(f"failed to write records as Parquet, {e}") from e
+    return {
+        "records": count,
+        "bytes": os.path.getsize(local_path),
+        "columns": parquet_column_statistics(local_path),
+    }
+
+
+def write_jsonl_zst(records, local_path: str, level: int = ZSTD_LEVEL) -> dict:
+    """Write records as zstd compressed JSON lines through a streaming compressor."""
+    import zstandard
+
+    count = 0
+    raw_bytes = 0
+    with open(local_path, "wb") as f:
+        with zstandard.ZstdCompressor(level=level).stream_writer(f, closefd=False) as writer:
+            for record in records:
+                line = serialize_record(record)
+                if count:
+                    writer.write(b"\n")
+                    raw_bytes += 1
+                writer.write(line)
+                raw_bytes += len(line)
+                count += 1
+    return {
+        "records": count,
+        "bytes": os.path.getsize(local_path),
+        "raw_bytes": raw_bytes,
+    }
+
+
+def write_export(records, local_path: str, output_format: str) -> dict:
+    """Write records to local_path in output_format.
+
+    Raises ImportError without the codec and ValueError for records the format
+    cannot hold.
+    """
+    if output_format == "parquet":
+        return write_parquet(records, local_path)
+    if output_format == "jsonl.zst":
+        return write_jsonl_zst(records, local_path)
+    raise ValueError(f"output_format must be one of {', '.join(OUTPUT_FORMATS)}")
@@ -0,0 +1,283 @@
+import fnmatch
+import hashlib
+import logging
+import os
+import posixpath
+from concurrent.futures import ThreadPoolExecutor
+import requests
+from .constants import get_csghub_config, wrap_error_response, GIT_ATTRIBUTES_CONTENT, response_body
+from .upload import in_caller_context, upload_raw_file
+from .tree import git_blob_sha1, git_blob_sha1_file, remote_files
+
+logger = logging.getLogger(__name__)
+
+LFS_MEDIA_TYPE = "application/vnd.git-lfs+json"
+LFS_POINTER_VERSION = "https://git-lfs.github.com/spec/v1"
+READ_CHUNK_BYTES = 1024 * 1024
+# files up to this size that match no LFS pattern are committed through /raw
+MAX_RAW_FILE_BYTES = 10 * 1024 * 1024
+
+
+def lfs_patterns(attributes: str = GIT_ATTRIBUTES_CONTENT) -> list:
+    patterns = []
+    for line in attributes.splitlines():
+        parts = line.split()
+        if parts and not parts[0].startswith("#") and "filter=lfs" in parts[1:]:
+            patterns.append(parts[0])
+    return patterns
+
+
+def is_lfs_path(path: str, patterns: list = None) -> bool:
+    """Match a repository path against .gitattributes patterns.
+
+    Patterns without a slash match the file name in any directory, like git does.
+    """
+    patterns = lfs_patterns() if patterns is None else patterns
+    path = path.lstrip("/")
+    name = posixpath.basename(path)
+    for pattern in patterns:
+        if "/" in pattern:
+            if fnmatch.fnmatch(path, pattern.replace("**/", "*")):
+                return True
+        elif fnmatch.fnmatch(name, pattern):
+            return True
+    return False
+
+
+def file_sha256(local_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(local_path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def lfs_pointer(oid: str, size: int) -> bytes:
+    return f"version {LFS_POINTER_VERSION}\noid sha256:{oid}\nsize {size}\n".encode()
+
+
+class FileSlice:
+    """Read only a byte range of a file, so requests streams it from disk.
+
+    requests takes the body size from __len__ and reads the body in blocks.
+    """
+
+    def __init__(self, local_path: str, offset: int, length: int):
+        self._file = open(local_path, "rb")
+        self._file.seek(offset)
+        self._remaining = length
+        self._length = length
+
+    def __len__(self):
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        if self._remaining <= 0:
+            return b""
+        if size is None or size < 0 or size > self._remaining:
+            size = self._remaining
+        data = self._file.read(size)
+        self._remaining -= len(data)
+        return data
+
+    def close(self):
+        self._file.close()
+
+
+def repo_clone_url(token: str, repo_id: str, repo_type: str = "dataset") -> str:
+    """Return the HTTP clone URL of a repository, the LFS endpoint lives below it."""
+    config = get_csghub_config()
+    url = f"{config.api_endpoint}/api/v1/{repo_type}s/{repo_id}"
+    response = requests.get(url, headers={"Authorization": f"Bearer {token}"})
+    if response.status_code == 200:
+        repository = (response.json().get("data") or {}).get("repository") or {}
+        if repository.get("http_clone_url"):
+            return repository["http_clone_url"]
+    return f"{config.web_endpoint}/{repo_type}s/{repo_id}.git"
+
+
+def api_lfs_batch(token: str, username: str, repo_id: str, objects: list, branch: str = "main",
+                  repo_type: str = "dataset") -> dict:
+    """Ask the Git LFS batch endpoint where to upload objects.
+
+    objects is a list of {"oid", "size"}. Objects the server already has come back
+    without upload actions.
+    """
+    url = f"{repo_clone_url(token, repo_id, repo_type)}/info/lfs/objects/batch"
+    headers = {
+        "Accept": LFS_MEDIA_TYPE,
+        "Content-Type": LFS_MEDIA_TYPE,
+    }
+    data = {
+        "operation": "upload",
+        "transfers": ["multipart", "basic"],
+        "ref": {"name": f"refs/heads/{branch}"},
+        "objects": objects,
+        "hash_algo": "sha256",
+    }
+    response = requests.post(url, headers=headers, json=data, auth=(username, token))
+    if response.status_code != 200:
+        logger.error("failed to request lfs batch on %s: %s", url, response_body(response))
+        return wrap_error_response(response)
+    return response.json()
+
+
+def _raise_for_transfer(response, what: str):
+    if response.status_code not in (200, 201):
+        raise RuntimeError(f"{what} failed with {response.status_code}: {response.text[:200]}")
+
+
+def _upload_part(href: str, local_path: str, offset: int, length: int) -> str:
+    body = FileSlice(local_path, offset, length)
+    try:
+        response = requests.put(href, data=body)
+    finally:
+        body.close()
+    _raise_for_transfer(response, f"part upload at offset {offset}")
+    return response.headers.get("ETag", "").strip('"')
+
+
+def transfer_lfs_object(executor: ThreadPoolExecutor, local_path: str, obj: dict):
+    """Upload one object following its batch actions, raising on failure.
+
+    The multipart transfer announces chunk_size and one URL per part in the
+    upload action header. Parts are read straight from disk and put through the
+    executor, the completion request then lists their ETags. Otherwise the whole
+    file is streamed with a single PUT.
+    """
+    actions = obj.get("actions") or {}
+    upload = actions.get("upload")
+    if upload:
+        header = dict(upload.get("header") or {})
+        chunk_size = int(header.pop("chunk_size", 0) or 0)
+        part_urls = sorted((int(key), href) for key, href in header.items() if key.isdigit())
+        if chunk_size and part_urls:
+            futures = [
+                executor.submit(in_caller_context(_upload_part), href, local_path, (number - 1) * chunk_size,
+                                min(chunk_size, obj["size"] - (number - 1) * chunk_size))
+                for number, href in part_urls
+            ]
+            parts = [{"partNumber": number, "etag": future.result()}
+                     for (number, _), future in zip(part_urls, futures)]
+            response = requests.post(upload["href"], json={"oid": obj["oid"], "parts": parts})
+            _raise_for_transfer(response, "multipart completion")
+        else:
+            with open(local_path, "rb") as body:
+                response = requests.put(upload["href"], data=body, headers=header)
+            _raise_for_transfer(response, "upload")
+
+    verify = actions.get("verify")
+    if verify:
+        response = requests.post(verify["href"], headers=verify.get("header") or {},
+                                 json={"oid": obj["oid"], "size": obj["size"]})
+        _raise_for_transfer(response, "verify")
+
+
+def upload_repo_files(token: str, username: str, repo_id: str, files: list, branch: str = "main",
+                      repo_type: str = "dataset", max_concurrency: int = 4, skip_unchanged: bool = True) -> dict:
+    """Upload local files, LFS tracked paths through the Git LFS batch API.
+
+    files is a list of (local path, path in repo). Local paths are read as given,
+    paths from tool callers go through resolve_upload_path first. Files matching a filter=lfs
+    pattern of GIT_ATTRIBUTES_CONTENT are hashed from disk, transferred to LFS
+    storage and committed as pointer files, other small files are committed
+    through /raw. With skip_unchanged files whose blob or LFS object the branch
+    already holds are left alone. Returns per file status.
+    """
+    results = []
+    lfs_files = []
+    for local_path, repo_path in files:
+        entry = {"local_path": local_path, "path": repo_path}
+        results.append(entry)
+        if not os.path.isfile(local_path):
+            entry.update(status="failed", error_message="local file not found")
+            continue
+        try:
+            entry["size"] = os.path.getsize(local_path)
+            if is_lfs_path(repo_path):
+                entry["lfs"] = True
+                entry["oid"] = file_sha256(local_path)
+                entry["sha"] = git_blob_sha1(lfs_pointer(entry["oid"], entry["size"]))
+            elif entry["size"] > MAX_RAW_FILE_BYTES:
+                entry.update(status="failed", error_message=f"larger than {MAX_RAW_FILE_BYTES} bytes and not tracked by LFS, use an LFS file extension")
+                continue
+            else:
+                entry["lfs"] = False
+                entry["sha"] = git_blob_sha1_file(local_path)
+        except OSError as e:
+            logger.error(f"failed to read local file {local_path}: {e}")
+            entry.update(status="failed", error_message=f"failed to read local file. {e}")
+            continue
+        if skip_unchanged and remote_files.is_unchanged(token, repo_type, repo_id, branch, repo_path,
+                                                        entry["sha"], entry.get("oid")):
+            entry["status"] = "unchanged"
+        elif entry["lfs"]:
+            lfs_files.append(entry)
+
+    # objects and their parts get separate pools, an object waiting for its parts never starves them
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor, \
+            ThreadPoolExecutor(max_workers=max_concurrency) as part_executor:
+        if lfs_files:
+            objects = list({entry["oid"]: {"oid": entry["oid"], "size": entry["size"]} for entry in lfs_files}.values())
+            batch = api_lfs_batch(token, username, repo_id, objects, branch=branch, repo_type=repo_type)
+            if "error_message" in batch:
+                for entry in lfs_files:
+                    entry.update(status="failed", error_message=batch["error_message"])
+            else:
+                local_paths = {entry["oid"]: entry["local_path"] for entry in lfs_files}
+
+                def transfer(obj: dict) -> str:
+                    if obj.get("error"):
+                        return obj["error"].get("message", "lfs batch error")
+                    if not obj.get("actions"):
+                        return "exists"
+                    try:
+                        transfer_lfs_object(part_executor, local_paths[obj["oid"]], obj)
+                    except Exception as e:
+                        logger.error(f"failed to transfer lfs object {obj['oid']}: {e}")
+                        return str(e)
+                    return "uploaded"
+
+                objects = batch.get("objects", [])
+                transfers = dict(zip([obj["oid"] for obj in objects], executor.map(in_caller_context(transfer), objects)))
+                for entry in lfs_files:
+                    transfer = transfers.get(entry["oid"], "missing from lfs batch response")
+                    if transfer in ("uploaded", "exists"):
+                        entry["transfer"] = transfer
+                    else:
+                        entry.update(status="failed", error_message=transfer)
+
+        def commit(entry: dict) -> dict:
+            if entry["lfs"]:
+                content = lfs_pointer(entry["oid"], entry["size"])
+            else:
+                try:
+                    with open(entry["local_path"], "rb") as f:
+                        content = f.read()
+                except OSError as e:
+                    entry.update(status="failed", error_message=f"failed to read local file. {e}")
+                    return entry
+            result = upload_raw_file(token, repo_id, branch, entry["path"], content, repo_type=repo_type)
+            if "error_message" in result:
+                entry.update(status="failed", error_message=result["error_message"])
+            else:
+                entry["status"] = "uploaded"
+                remote_files.record(token, repo_type, repo_id, branch, entry["path"], entry["sha"], entry.get("oid"))
+            return entry
+
+        pending = [entry for entry in results if "status" not in entry]
+        list(executor.map(in_caller_context(commit), pending))
+
+    failed = [entry for entry in results if entry["status"] == "failed"]
+    res_data = {
+        "repo_id": repo_id,
+        "repo_type": repo_type,
+        "branch": branch,
+        "files": results,
+        "uploaded": sum(entry["status"] == "uploaded" for entry in results),
+        "unchanged": sum(entry["status"] == "unchanged" for entry in results),
+        "lfs_bytes": sum(entry["size"] for entry in results if entry.get("transfer") == "uploaded"),
+    }
+    if failed:
+        res_data["error_message"] = f"{len(failed)} of {len(results)} files failed to upload."
+    return res_data
@@ -0,0 +1,341 @@
+import csv
+import io
+import json
+import logging
+import threading
+from collections import OrderedDict
+from .files import api_fetch_repo_range, api_resolve_commit_sha
+from .tree import api_list_repo_tree
+
+logger = logging.getLogger(__name__)
+
+# in order of preference when no file is given
+PREVIEW_FORMATS = {
+    ".parquet": "parquet",
+    ".jsonl": "jsonl",
+    ".csv": "csv",
+    ".tsv": "tsv",
+    ".json": "json",
+}
+FOOTER_PROBE_BYTES = 64 * 1024
+MIN_FETCH_BYTES = 64 * 1024
+MAX_ROW_GROUP_BYTES = 16 * 1024 * 1024
+MAX_SCHEMA_LINES = 1000
+MAX_FIND_DIRS = 10
+PREVIEW_CACHE_ENTRIES = 256
+
+
+class RemoteFile(io.RawIOBase):
+    """Seekable read only file over HTTP range requests.
+
+    Only the ranges a reader asks for are fetched, at least MIN_FETCH_BYTES at a
+    time, and kept so a range is fetched once. pyarrow reads a Parquet footer and
+    single column chunks through it.
+    """
+
+    def __init__(self, fetch, size: int, segments: dict = None):
+        self._fetch = fetch
+        self._size = size
+        self._pos = 0
+        self._segments = dict(segments or {})
+        self.bytes_fetched = sum(len(data) for data in self._segments.values())
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def tell(self):
+        return self._pos
+
+    def seek(self, offset: int, whence: int = io.SEEK_SET):
+        if whence == io.SEEK_CUR:
+            offset += self._pos
+        elif whence == io.SEEK_END:
+            offset += self._size
+        self._pos = max(0, offset)
+        return self._pos
+
+    def readinto(self, buffer) -> int:
+        size = min(len(buffer), self._size - self._pos)
+        if size <= 0:
+            return 0
+        data = self._read(self._pos, size)
+        buffer[:len(data)] = data
+        self._pos += len(data)
+        return len(data)
+
+    def _read(self, start: int, size: int) -> bytes:
+        for seg_start, data in self._segments.items():
+            if seg_start <= start and start + size <= seg_start + len(data):
+                return data[start - seg_start:start - seg_start + size]
+        length = min(max(size, MIN_FETCH_BYTES), self._size - start)
+        data = self._fetch(start, length)
+        self._segments[start] = data
+        self.bytes_fetched += len(data)
+        return data[:size]
+
+
+class PreviewCache:
+    """Previews by dataset, commit SHA and path. A commit never changes, so only the entry count is bounded."""
+
+    def __init__(self, max_entries: int = PREVIEW_CACHE_ENTRIES):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {"entries": len(self._entries), "max_entries": self.max_entries}
+
+    def put(self, key, entry: dict):
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+preview_cache = PreviewCache()
+
+
+def _jsonable(value):
+    if isinstance(value, (bytes, bytearray)):
+        return bytes(value).decode("utf-8", errors="replace")
+    if isinstance(value, dict):
+        return {str(k): _jsonable(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_jsonable(v) for v in value]
+    return value
+
+
+def _value_type(value) -> str:
+    if value is None or value == "":
+        return "null"
+    if isinstance(value, bool):
+        return "bool"
+    if isinstance(value, int):
+        return "int"
+    if isinstance(value, float):
+        return "float"
+    if isinstance(value, (list, dict)):
+        return type(value).__name__
+    for cast, name in ((int, "int"), (float, "float")):
+        try:
+            cast(value)
+            return name
+        except (TypeError, ValueError):
+            pass
+    return "string"
+
+
+def infer_schema(records: list) -> list:
+    """Column names in first seen order with the value types seen in the sample."""
+    columns = OrderedDict()
+    for record in records:
+        if not isinstance(record, dict):
+            record = {"value": record}
+        for name, value in record.items():
+            columns.setdefault(name, set()).add(_value_type(value))
+    schema = []
+    for name, types in columns.items():
+        nullable = "null" in types
+        types.discard("null")
+        if types == {"int", "float"}:
+            types = {"float"}
+        schema.append({"name": name, "type": "|".join(sorted(types)) or "null", "nullable": nullable})
+    return schema
+
+
+def find_preview_file(token: str, dataset_id: str, branch: str) -> str:
+    """Pick the first data file breadth first, preferring Parquet within a directory."""
+    pending = [""]
+    for _ in range(MAX_FIND_DIRS):
+        if not pending:
+            break
+        items = api_list_repo_tree(token, dataset_id, branch, pending.pop(0))
+        if not isinstance(items, list):
+            return None
+        candidates = []
+        for item in items:
+            if item.get("type") == "dir":
+                pending.append(item["path"])
+                continue
+            for rank, suffix in enumerate(PREVIEW_FORMATS):
+                if item["path"].lower().endswith(suffix):
+                    candidates.append((rank, item["path"]))
+                    break
+        if candidates:
+            return min(candidates)[1]
+    return None
+
+
+def preview_parquet(fetch, probe: dict, rows: int) -> dict:
+    """Read the schema and row count from the footer and sample rows from the first row group.
+
+    A broken file or a failed range fetch is returned as an error dict.
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    size = probe["size"]
+    data = probe["data"]
+    if size is None or data[-4:] != b"PAR1":
+        return {"error_message": "not a Parquet file, its footer is missing."}
+    remote = RemoteFile(fetch, size, {size - len(data): data})
+    try:
+        parquet_file = pq.ParquetFile(remote)
+        metadata = parquet_file.metadata
+        res_data = {
+            "schema": [{"name": field.name, "type": str(field.type), "nullable": field.nullable}
+                       for field in parquet_file.schema_arrow],
+            "num_rows": metadata.num_rows,
+            "row_count_exact": True,
+            "num_row_groups": metadata.num_row_groups,
+            "sample_rows": [],
+        }
+        if metadata.num_row_groups and rows > 0:
+            row_group = metadata.row_group(0)
+            group_bytes = sum(row_group.column(i).total_compressed_size for i in range(row_group.num_columns))
+            if group_bytes <= MAX_ROW_GROUP_BYTES:
+                table = parquet_file.read_row_group(0).slice(0, rows)
+                res_data["sample_rows"] = _jsonable(table.to_pylist())
+            else:
+                res_data["sample_skipped"] = f"first row group holds {group_bytes} bytes, more than {MAX_ROW_GROUP_BYTES}"
+    except (pa.ArrowException, OSError) as e:
+        logger.error(f"failed to read parquet file: {e}")
+        return {"error_message": f"failed to read the Parquet file. {e}"}
+    res_data["bytes_read"] = remote.bytes_fetched
+    return res_data
+
+
+def preview_text(data: bytes, size: int, file_format: str, rows: int) -> dict:
+    """Parse the leading bytes of a JSON lines, CSV or JSON file.
+
+    A cut last line is dropped. The row count is estimated from the average size
+    of the sampled lines unless the whole file was read.
+    """
+    complete = size is not None and len(data) >= size
+    lines = data.split(b"\n")
+    if not complete:
+        lines = lines[:-1]
+    if lines and lines[-1] == b"":
+        lines = lines[:-1]
+    if not lines:
+        return {"error_message": "no complete line within sample_bytes, raise sample_bytes."}
+    sampled_bytes = sum(len(line) + 1 for line in lines)
+    text_lines = [line.decode("utf-8", errors="replace").rstrip("\r") for line in lines]
+
+    records = []
+    parse_errors = 0
+    header_lines = 0
+    if file_format in ("csv", "tsv"):
+        reader = csv.DictReader(io.StringIO("\n".join(text_lines)), delimiter="\t" if file_format == "tsv" else ",")
+        records = list(reader)
+        header_lines = 1
+    else:
+        for line in text_lines[:MAX_SCHEMA_LINES]:
+            if not line.strip():
+                continue
+            try:
+                records.append(json.loads(line))
+            except ValueError:
+                parse_errors += 1
+        if file_format == "json" and parse_errors and complete:
+            # a plain JSON document, not JSON lines
+            try:
+                document = json.loads(data)
+            except ValueError as e:
+                return {"error_message": f"neither a JSON document nor JSON lines. {e}"}
+            if isinstance(document, dict) and isinstance(document.get("data"), list):
+                document = document["data"]
+            records = document if isinstance(document, list) else [document]
+            parse_errors = 0
+        elif file_format == "json" and parse_errors and not records:
+            return {"error_message": "JSON document larger than sample_bytes, only JSON lines files can be previewed in part."}
+
+    if complete:
+        estimate = len(records)
+    elif size:
+        estimate = max(int(size / (sampled_bytes / len(lines))) - header_lines, len(records))
+    else:
+        estimate = None
+    res_data = {
+        "schema": infer_schema(records[:MAX_SCHEMA_LINES]),
+        "num_rows": estimate,
+        "row_count_exact": complete,
+        "sample_rows": records[:rows],
+        "bytes_read": len(data),
+    }
+    if parse_errors:
+        res_data["parse_errors"] = parse_errors
+    return res_data
+
+
+def api_preview_dataset(token: str, dataset_id: str, file_path: str = "", branch: str = "main",
+                        rows: int = 5, sample_bytes: int = 65536) -> dict:
+    """Preview a dataset file without downloading it.
+
+    Parquet files are read through range requests for the footer and the first
+    row group, text files from their first sample_bytes. Results are cached by
+    commit SHA, which api_resolve_commit_sha only gives to a token that may read
+    the dataset, so a cached preview is never served to a caller without access.
+    """
+    if not file_path:
+        file_path = find_preview_file(token, dataset_id, branch)
+        if not file_path:
+            return {"error_message": f"no {', '.join(PREVIEW_FORMATS)} file found in {dataset_id} on {branch}."}
+    file_path = file_path.lstrip("/")
+    file_format = next((name for suffix, name in PREVIEW_FORMATS.items() if file_path.lower().endswith(suffix)), None)
+    if file_format is None:
+        return {"error_message": f"cannot preview {file_path}, supported files are {', '.join(PREVIEW_FORMATS)}."}
+
+    commit = api_resolve_commit_sha(token, "dataset", dataset_id, branch)
+    ref = commit or branch
+    cache_key = (dataset_id, commit, file_path, rows, sample_bytes)
+    cached = preview_cache.get(cache_key) if commit else None
+    if cached is not None:
+        return {**cached, "cached": True}
+
+    def fetch(start: int, length: int) -> bytes:
+        got = api_fetch_repo_range(token, "dataset", dataset_id, file_path, ref, start, length)
+        if "error_message" in got:
+            raise IOError(got["error_message"])
+        return got["data"]
+
+    if file_format == "parquet":
+        probe = api_fetch_repo_range(token, "dataset", dataset_id, file_path, ref, -FOOTER_PROBE_BYTES, FOOTER_PROBE_BYTES)
+        if "error_message" in probe:
+            return probe
+        try:
+            preview = preview_parquet(fetch, probe, rows)
+        except ImportError as e:
+            return {"error_message": f"Parquet preview needs the export extra, install csghub-mcp-server-dataset[export]: {e}"}
+    else:
+        got = api_fetch_repo_range(token, "dataset", dataset_id, file_path, ref, 0, sample_bytes)
+        if "error_message" in got:
+            return got
+        preview = preview_text(got["data"], got["size"], file_format, rows)
+        preview["size"] = got["size"]
+    if "error_message" in preview:
+        return preview
+
+    res_data = {
+        "dataset_id": dataset_id,
+        "path": file_path,
+        "branch": branch,
+        "commit_sha": commit,
+        "format": file_format,
+        "size": probe["size"] if file_format == "parquet" else preview.pop("size"),
+        **preview,
+    }
+    if commit:
+        preview_cache.put(cache_key, res_data)
+    return res_data
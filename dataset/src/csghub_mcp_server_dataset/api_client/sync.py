@@ -0,0 +1,137 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from .constants import get_csghub_config
+from .upload import serialize_record
+
+logger = logging.getLogger(__name__)
+
+RECORD_ID_FIELDS = ("id", "qa_id", "issue_id")
+RECORD_TIME_FIELDS = ("updated_at", "created_at", "timestamp", "time")
+# hashes of records without a timestamp kept in the watermark, the oldest go first
+MAX_UNSTAMPED_HASHES = 50000
+
+
+def record_hash(record) -> str:
+    return hashlib.sha256(serialize_record(record)).hexdigest()[:16]
+
+
+def record_marks(record) -> tuple:
+    """Return (id, timestamp) of a record, None for what it does not carry.
+
+    Records are dicts or JSON lines, anything else has no marks.
+    """
+    if isinstance(record, (str, bytes, bytearray)):
+        try:
+            record = json.loads(record)
+        except ValueError:
+            return None, None
+    if not isinstance(record, dict):
+        return None, None
+    record_id = next((record[key] for key in RECORD_ID_FIELDS if record.get(key) is not None), None)
+    stamp = next((record[key] for key in RECORD_TIME_FIELDS if record.get(key) not in (None, "")), None)
+    if isinstance(stamp, bool) or not isinstance(stamp, (int, float, str)):
+        stamp = None
+    return record_id, stamp
+
+
+def _comparable(a, b) -> bool:
+    numbers = (int, float)
+    return (isinstance(a, numbers) and isinstance(b, numbers)) or (isinstance(a, str) and isinstance(b, str))
+
+
+def watermark_path(dataset_id: str, branch: str) -> str:
+    config = get_csghub_config()
+    name = re.sub(r"[^A-Za-z0-9_.-]", "_", f"{dataset_id}@{branch}")
+    return os.path.join(config.state_dir, "issue_qa_sync", f"{name}.json")
+
+
+def load_watermark(dataset_id: str, branch: str) -> dict:
+    path = watermark_path(dataset_id, branch)
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return {}
+    except (OSError, ValueError) as e:
+        logger.warning(f"ignoring unreadable sync watermark {path}: {e}")
+        return {}
+
+
+def save_watermark(dataset_id: str, branch: str, watermark: dict):
+    """Write the watermark atomically so an interrupted sync keeps the previous one."""
+    path = watermark_path(dataset_id, branch)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(watermark, f)
+    os.replace(tmp_path, path)
+
+
+def sync_file_name(file_name: str, sync: int) -> str:
+    """Name the file of one incremental sync, so every run adds a new shard."""
+    stem, dot, suffix = file_name.partition(".")
+    return f"{stem}-sync{sync:05d}{dot}{suffix}"
+
+
+def select_new_records(records: list, watermark: dict) -> tuple:
+    """Split off the records that were not synced yet.
+
+    Records newer than the watermark timestamp are new and older ones are not.
+    Records at the watermark timestamp, or without a timestamp, are new when
+    their content hash was not seen before. Returns (new records, next watermark).
+    Only the hashes at the newest timestamp are kept when records carry
+    timestamps, so the watermark stays small as the history grows. Hashes of
+    records without a timestamp are kept up to MAX_UNSTAMPED_HASHES, dropping
+    the oldest, so such a record older than that would be synced again.
+    """
+    last_stamp = watermark.get("last_timestamp")
+    seen = set(watermark.get("hashes", []))
+    new_records = []
+    new_hashes = set()
+    max_stamp = last_stamp
+    max_id = watermark.get("last_id")
+    boundary = set(seen) if last_stamp is not None else set()
+    # insertion ordered, so the oldest unstamped hashes are the ones dropped
+    unstamped = dict.fromkeys(watermark.get("hashes", []) if last_stamp is None
+                              else watermark.get("unstamped_hashes", []))
+
+    for record in records:
+        record_id, stamp = record_marks(record)
+        digest = record_hash(record)
+        if stamp is not None and last_stamp is not None and _comparable(stamp, last_stamp):
+            if stamp < last_stamp or (stamp == last_stamp and digest in seen):
+                continue
+        elif digest in seen or digest in unstamped:
+            continue
+        if digest in new_hashes:
+            continue
+        new_hashes.add(digest)
+        new_records.append(record)
+
+        if stamp is None:
+            unstamped[digest] = None
+            continue
+        if max_stamp is None or (_comparable(stamp, max_stamp) and stamp > max_stamp):
+            max_stamp = stamp
+            boundary = {digest}
+            max_id = record_id
+        elif stamp == max_stamp:
+            boundary.add(digest)
+            if record_id is not None:
+                max_id = record_id
+
+    kept_unstamped = list(unstamped)[-MAX_UNSTAMPED_HASHES:]
+    next_watermark = {
+        "last_id": max_id,
+        "last_timestamp": max_stamp,
+        "hashes": sorted(boundary) if max_stamp is not None else kept_unstamped,
+        "unstamped_hashes": kept_unstamped if max_stamp is not None else [],
+        "synced_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "total_records": watermark.get("total_records", 0) + len(new_records),
+        "syncs": watermark.get("syncs", 0) + 1,
+    }
+    return new_records, next_watermark
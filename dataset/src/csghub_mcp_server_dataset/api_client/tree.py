@@ -0,0 +1,136 @@
+import hashlib
+import logging
+import os
+import posixpath
+import re
+import threading
+import time
+import requests
+from .constants import get_csghub_config, wrap_error_response
+
+logger = logging.getLogger(__name__)
+
+# remote listings are reused for this long, uploads done here update them in place
+TREE_CACHE_TTL = 120
+READ_CHUNK_BYTES = 1024 * 1024
+SHA256_PATTERN = re.compile(r"[0-9a-f]{64}")
+
+
+def git_blob_sha1(content: bytes) -> str:
+    """Git object id of a file, as the tree listing reports it."""
+    digest = hashlib.sha1(f"blob {len(content)}\0".encode())
+    digest.update(content)
+    return digest.hexdigest()
+
+
+def git_blob_sha1_file(local_path: str) -> str:
+    digest = hashlib.sha1(f"blob {os.path.getsize(local_path)}\0".encode())
+    with open(local_path, "rb") as f:
+        for chunk in iter(lambda: f.read(READ_CHUNK_BYTES), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _lfs_oid(item: dict) -> str:
+    oid = item.get("lfs_sha256") or item.get("oid") or ""
+    if not oid and item.get("lfs_relative_path"):
+        oid = posixpath.basename(item["lfs_relative_path"])
+    return oid if SHA256_PATTERN.fullmatch(oid) else None
+
+
+def api_list_repo_tree(token: str, repo_id: str, branch: str = "main", path: str = "",
+                       repo_type: str = "dataset") -> list:
+    """List one directory of a repository branch as path/type/sha/lfs_oid dicts."""
+    config = get_csghub_config()
+    headers = {"Authorization": f"Bearer {token}"}
+    params = {"ref": branch, "path": path}
+    url = f"{config.api_endpoint}/api/v1/{repo_type}s/{repo_id}/tree"
+    response = requests.get(url, headers=headers, params=params)
+    if response.status_code != 200:
+        logger.info(f"failed to list repo tree on {url}: {response.status_code}")
+        return wrap_error_response(response)
+
+    json_data = response.json()
+    res_list = json_data["data"] if json_data and "data" in json_data else []
+    if isinstance(res_list, dict):
+        res_list = res_list.get("files") or []
+    if not isinstance(res_list, list):
+        return []
+
+    return [
+        {
+            "path": res.get("path"),
+            "type": res.get("type"),
+            "sha": res.get("sha"),
+            "lfs_oid": _lfs_oid(res) if res.get("lfs") else None,
+        }
+        for res in res_list
+    ]
+
+
+class RemoteFileIndex:
+    """Blob SHAs and LFS OIDs of remote files, cached per token and repository branch directory.
+
+    A directory is listed once per TTL however many of its files are checked.
+    Listings are kept per hashed token, so a caller is only told a file is
+    unchanged from a listing made with its own token.
+    A directory that cannot be listed, for example because it does not exist
+    yet, counts as empty so its files are uploaded.
+    """
+
+    def __init__(self, ttl: float = TREE_CACHE_TTL):
+        self.ttl = ttl
+        self._dirs = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(token: str, repo_type: str, repo_id: str, branch: str, directory: str) -> tuple:
+        return hashlib.sha256(token.encode()).hexdigest(), repo_type, repo_id, branch, directory
+
+    def _directory(self, token: str, repo_type: str, repo_id: str, branch: str, directory: str) -> dict:
+        key = self._key(token, repo_type, repo_id, branch, directory)
+        with self._lock:
+            cached = self._dirs.get(key)
+            if cached and cached[0] > time.monotonic():
+                return cached[1]
+        items = api_list_repo_tree(token, repo_id, branch, directory, repo_type=repo_type)
+        files = {}
+        if isinstance(items, list):
+            files = {item["path"]: item for item in items if item.get("type") != "dir" and item.get("path")}
+        now = time.monotonic()
+        with self._lock:
+            for expired in [k for k, (expires, _) in self._dirs.items() if expires <= now]:
+                del self._dirs[expired]
+            self._dirs[key] = (now + self.ttl, files)
+        return files
+
+    def stats(self) -> dict:
+        now = time.monotonic()
+        with self._lock:
+            fresh = [files for expires, files in self._dirs.values() if expires > now]
+        return {"entries": len(fresh), "files": sum(len(files) for files in fresh)}
+
+    def is_unchanged(self, token: str, repo_type: str, repo_id: str, branch: str, path: str,
+                     sha: str, lfs_oid: str = None) -> bool:
+        """Tell whether the remote file already holds this blob or LFS object."""
+        path = path.lstrip("/")
+        try:
+            remote = self._directory(token, repo_type, repo_id, branch, posixpath.dirname(path)).get(path)
+        except Exception as e:
+            logger.warning(f"failed to check remote {path}: {e}")
+            return False
+        if not remote:
+            return False
+        return remote.get("sha") == sha or (lfs_oid is not None and remote.get("lfs_oid") == lfs_oid)
+
+    def record(self, token: str, repo_type: str, repo_id: str, branch: str, path: str, sha: str,
+               lfs_oid: str = None):
+        """Remember a file uploaded from here with token, when its directory is cached for it."""
+        path = path.lstrip("/")
+        with self._lock:
+            cached = self._dirs.get(self._key(token, repo_type, repo_id, branch, posixpath.dirname(path)))
+            if cached:
+                cached[1][path] = {"path": path, "type": "file", "sha": sha, "lfs_oid": lfs_oid}
+
+
+remote_files = RemoteFileIndex()
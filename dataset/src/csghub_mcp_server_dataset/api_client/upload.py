@@ -0,0 +1,166 @@
+import base64
+import contextvars
+import hashlib
+import itertools
+import json
+import logging
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import requests
+from .constants import get_csghub_config, wrap_error_response, response_body
+from .tree import git_blob_sha1, remote_files
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SHARD_BYTES = 8 * 1024 * 1024
+# multiple of 3 so every chunk but the last encodes without base64 padding
+B64_CHUNK_BYTES = 3 * 64 * 1024
+UPLOAD_RETRIES = 3
+
+
+def in_caller_context(fn):
+    """Wrap fn to run in a copy of the calling thread's context.
+
+    Pool threads start with an empty context, so without it the request spans
+    of a traced tool call made there would lose their parent span.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return run
+
+
+def serialize_record(record) -> bytes:
+    if isinstance(record, (bytes, bytearray)):
+        return bytes(record)
+    if isinstance(record, str):
+        return record.encode("utf-8")
+    return json.dumps(record, ensure_ascii=False).encode("utf-8")
+
+
+def iter_jsonl_shards(records, shard_bytes: int = DEFAULT_SHARD_BYTES):
+    """Serialize records into JSONL shards of about shard_bytes each.
+
+    Yields (shard content, record count). Only the shard being filled is held in
+    memory, a single record larger than shard_bytes becomes a shard on its own.
+    """
+    shard = bytearray()
+    count = 0
+    for record in records:
+        line = serialize_record(record)
+        if count and len(shard) + len(line) + 1 > shard_bytes:
+            yield bytes(shard), count
+            shard = bytearray()
+            count = 0
+        if count:
+            shard += b"\n"
+        shard += line
+        count += 1
+    if count:
+        yield bytes(shard), count
+
+
+def iter_raw_upload_body(content: bytes, message: str, branch: str):
+    """Yield the JSON body of a /raw upload with the content base64 encoded piecewise.
+
+    The encoded copy of the content is never built as a whole, requests sends the
+    pieces with chunked transfer encoding.
+    """
+    head = json.dumps({"message": message, "branch": branch, "new_branch": branch})
+    yield f'{head[:-1]}, "content": "'.encode()
+    view = memoryview(content)
+    for start in range(0, len(view), B64_CHUNK_BYTES):
+        yield base64.b64encode(view[start:start + B64_CHUNK_BYTES])
+    yield b'"}'
+
+
+def upload_raw_file(token: str, dataset_id: str, branch: str, file_name: str, content: bytes,
+                    repo_type: str = "dataset") -> dict:
+    """Commit one file through the /raw endpoint, retrying transient failures."""
+    config = get_csghub_config()
+    url = f"{config.api_endpoint}/api/v1/{repo_type}s/{dataset_id}/raw/{file_name}"
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "application/json"
+    }
+    for attempt in range(1, UPLOAD_RETRIES + 1):
+        body = iter_raw_upload_body(content, f"Upload {file_name}", branch)
+        response = requests.post(url, headers=headers, data=body)
+        if response.status_code in (200, 201):
+            return response.json()
+        # concurrent commits to one branch can race, those and server errors are retried
+        if attempt < UPLOAD_RETRIES and (response.status_code == 409 or response.status_code >= 500):
+            logger.warning(f"retrying upload of {file_name} after {response.status_code}")
+            time.sleep(attempt)
+            continue
+        logger.error("failed to upload file to %s: %s", url, response_body(response))
+        return wrap_error_response(response)
+
+
+def shard_file_name(file_name: str, index: int) -> str:
+    stem, dot, suffix = file_name.partition(".")
+    return f"{stem}-{index:05d}{dot}{suffix}"
+
+
+def upload_shards(token: str, dataset_id: str, branch: str, shards, file_name: str,
+                  max_concurrency: int = 4, skip_unchanged: bool = True) -> dict:
+    """Upload (content, record count) shards concurrently and return a manifest.
+
+    At most max_concurrency shards are in flight or waiting, so memory stays at
+    about max_concurrency shards however many records there are. The shard index
+    is always added to the file name, also for a single shard, so re-uploads
+    with more or fewer shards overwrite the same files. With skip_unchanged a shard whose content the branch already holds is not sent.
+    """
+    config = get_csghub_config()
+    entries = []
+
+    def upload(index: int, content: bytes, count: int) -> dict:
+        entry = {
+            "file_name": shard_file_name(file_name, index),
+            "records": count,
+            "bytes": len(content),
+            "sha256": hashlib.sha256(content).hexdigest(),
+        }
+        sha = git_blob_sha1(content)
+        if skip_unchanged and remote_files.is_unchanged(token, "dataset", dataset_id, branch, entry["file_name"], sha):
+            entry["status"] = "unchanged"
+            return entry
+        result = upload_raw_file(token, dataset_id, branch, entry["file_name"], content)
+        if "error_message" in result:
+            entry["status"] = "failed"
+            entry["error_message"] = result["error_message"]
+        else:
+            entry["status"] = "uploaded"
+            remote_files.record(token, "dataset", dataset_id, branch, entry["file_name"], sha)
+        return entry
+
+    shard_iter = iter(shards)
+    first = next(shard_iter, None)
+    if first is None:
+        return {"error_message": "No any records to upload."}
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+        pending = set()
+        for index, (content, count) in enumerate(itertools.chain([first], shard_iter)):
+            if len(pending) >= max_concurrency:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                entries.extend(future.result() for future in done)
+            pending.add(executor.submit(in_caller_context(upload), index, content, count))
+        entries.extend(future.result() for future in wait(pending).done)
+    entries.sort(key=lambda entry: entry["file_name"])
+
+    failed = [entry for entry in entries if entry["status"] == "failed"]
+    manifest = {
+        "dataset_id": dataset_id,
+        "branch": branch,
+        "access_url": f"{config.web_endpoint}/datasets/{dataset_id}?tab=files&actionName=files&branch={branch}",
+        "shards": entries,
+        "total_records": sum(entry["records"] for entry in entries),
+        "total_bytes": sum(entry["bytes"] for entry in entries),
+        "unchanged": sum(entry["status"] == "unchanged" for entry in entries),
+    }
+    if failed:
+        manifest["error_message"] = f"{len(failed)} of {len(entries)} shards failed to upload."
+    return manifest
+
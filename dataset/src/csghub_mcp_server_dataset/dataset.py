@@ -1,7 +1,11 @@
+import asyncio
 import logging
+import os
+import posixpath
 from datetime import datetime
 from mcp.server.fastmcp import FastMCP
-import json
+from mcp.types import CallToolResult
+from .results import tool_result
 from .api_client import (
     api_get_username_from_token,
     api_get_namespaces_by_token,
@@ -14,7 +18,18 @@ from .api_client import (
     upload_issue_data,
     api_create_dataset_new_branch,
     api_list_dataset_branchs,
+    load_watermark,
+    save_watermark,
+    select_new_records,
+    sync_file_name,
+    upload_repo_files,
+    upload_issue_export,
+    OUTPUT_FORMATS,
+    export_file_name,
+    api_read_repo_file,
+    api_preview_dataset,
 )
+from .api_client.constants import resolve_upload_path
 
 logger = logging.getLogger(__name__)
 
@@ -26,52 +41,55 @@ def register_dataset_tools(mcp_instance: FastMCP):
     register_namespace_tools(mcp_instance=mcp_instance)
     register_dataset_query_tools(mcp_instance=mcp_instance)
     register_upload_issue_dataset(mcp_instance=mcp_instance)
+    register_repo_file_upload(mcp_instance=mcp_instance)
+    register_repo_file_read(mcp_instance=mcp_instance)
+    register_dataset_preview(mcp_instance=mcp_instance)
 
 def register_dataset_query_tools(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="query_datasets_by_name",
         title="Query datasets by name from CSGHub",
-        description="Query the datasets from CSGHub by specifying dataset name. The default 20 datasets will be returned if no page size is specified. You can control the pagination by specifying the number of items per page and the page number.",
+        description="Query the datasets from CSGHub by specifying dataset name. The default 20 datasets will be returned if no page size is specified. You can control the pagination by specifying the number of items per page and the page number. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes such as repository.http_clone_url.",
         structured_output=True,
     )
-    def query_datasets_by_name(token: str, name: str, page: int = 1, page_size: int = 20) -> str:
-       json_data = api_find_datasets_by_name(token=token, name=name, page=page, page_size=page_size)
-       return json.dumps(json_data)
+    def query_datasets_by_name(token: str, name: str, page: int = 1, page_size: int = 20, fields: list[str] = None) -> CallToolResult:
+       json_data = api_find_datasets_by_name(token=token, name=name, page=page, page_size=page_size, fields=fields)
+       return tool_result(json_data)
 
 def register_dataset_list(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="list_user_datasets",
         title="List dataset repo for a user from CSGHub",
-        description="Retrieve a list of dataset repo for a specific user from CSGHub with user access token. You can control the pagination by specifying the number of items per page and the page number.",
+        description="Retrieve a list of dataset repo for a specific user from CSGHub with user access token. You can control the pagination by specifying the number of items per page and the page number. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes such as repository.http_clone_url.",
         structured_output=True,
     )
-    def list_user_datasets(token: str, per: int = 10, page: int = 1) -> str:
+    def list_user_datasets(token: str, per: int = 10, page: int = 1, fields: list[str] = None) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
         
         try:
             username = api_get_username_from_token(token)
         except Exception as e:
             logger.error(f"Error calling user token API: {e}")
-            return f"Error: Failed to get username. {e}"
+            return tool_result({"error_message": f"Failed to get username. {e}"})
         
         try:
-            datasets = api_list_datasets(token, username, per, page)
-            return json.dumps(datasets)
+            datasets = api_list_datasets(token, username, per, page, fields=fields)
+            return tool_result(datasets)
         except Exception as e:
             logger.error(f"Error calling datasets API: {e}")
-            return f"Error: Failed to list datasets. {e}"
+            return tool_result({"error_message": f"Failed to list datasets. {e}"})
 
 def register_dataset_query(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="get_dataset_detail_by_id",
         title="Get dataset repo details by dataset path",
-        description="Retrieve the dataset repo details by a specific path from CSGHub with user access token. This is useful for checking the details of a dataset repo that has been submitted to the CSGHub service.",
+        description="Retrieve the dataset repo details by a specific path from CSGHub with user access token. This is useful for checking the details of a dataset repo that has been submitted to the CSGHub service. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes such as repository.http_clone_url.",
         structured_output=True,
     )
-    def get_dataset_detail_by_id(token: str, dataset_id: str) -> str:
-        json_data = api_get_dataset_details(token=token, dataset_id=dataset_id)
-        return json.dumps(json_data)
+    def get_dataset_detail_by_id(token: str, dataset_id: str, fields: list[str] = None) -> CallToolResult:
+        json_data = api_get_dataset_details(token=token, dataset_id=dataset_id, fields=fields)
+        return tool_result(json_data)
 
 def register_dataset_creation(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -87,13 +105,13 @@ def register_dataset_creation(mcp_instance: FastMCP):
         readme: str = "",
         description: str = "",
         namespace: str = None,
-    ) -> str:
+    ) -> CallToolResult:
         if namespace is None or len(namespace.strip()) < 1:
             try:
                 namespace = api_get_username_from_token(token)
             except Exception as e:
                 logger.error(f"Error calling user token API: {e}")
-                return f"Error: Failed to get username. {e}"
+                return tool_result({"error_message": f"Failed to get username. {e}"})
 
         json_data = api_create_dataset(
             token=token,
@@ -103,7 +121,7 @@ def register_dataset_creation(mcp_instance: FastMCP):
             readme=readme,
             description=description,
         )
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
 def register_dataset_delete(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -112,9 +130,9 @@ def register_dataset_delete(mcp_instance: FastMCP):
         description="Delete the dataset repo by a specific id from CSGHub with user access token.",
         structured_output=True,
     )
-    def delete_dataset_by_id(token: str, dataset_id: str) -> str:
+    def delete_dataset_by_id(token: str, dataset_id: str) -> CallToolResult:
         json_data = api_delete_dataset(token=token, dataset_id=dataset_id)
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
 def register_namespace_tools(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -123,41 +141,205 @@ def register_namespace_tools(mcp_instance: FastMCP):
         description="Retrieve a list of namespaces or organizations that a user has access to create dataset repos from CSGHub with user access token.",
         structured_output=True,
     )
-    def list_user_namespaces(token: str) -> str:
+    def list_user_namespaces(token: str) -> CallToolResult:
         namespaces = api_get_namespaces_by_token(token)
-        return json.dumps(namespaces)
+        return tool_result(namespaces)
 
 def register_upload_issue_dataset(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="upload_issue_latest_qa_to_dataset",
         title="Retrieve and upload csghub issue latest QA records to dataset.",
-        description="Retrieve and upload csghub issue latest QA records to a branch of dataset on CSGHub with access token. The default branch is main. The default file name is records_vYYYYMMDD-HHMMSS.jsonl to save.",
+        description="Retrieve and upload csghub issue latest QA records to a branch of dataset on CSGHub with access token. The default branch is main. The default file name is records_vYYYYMMDD-HHMMSS.jsonl to save. Records are uploaded as JSONL shards of about shard_size_mb MB, up to max_concurrency at a time, shards are always named like records_vYYYYMMDD-HHMMSS-00000.jsonl, also when there is only one. Returns a manifest with the file name, record count, size and sha256 of every shard. With incremental=true only records that were not synced to this dataset branch before are uploaded, as a new file next to the earlier ones, a given file_name gets a -syncNNNNN suffix numbering the sync, tracked by a local watermark of the last record timestamp and content hashes. output_format is jsonl (default), parquet or jsonl.zst. parquet writes one zstd compressed Parquet file with column statistics, which are returned in the manifest, jsonl.zst one zstd compressed JSON lines file. Both are written batch by batch and uploaded through Git LFS, shard_size_mb does not apply to them and the file name gets the matching suffix.",
         structured_output=True,
     )
-    def upload_issue_latest_qa_to_dataset(token: str, dataset_id: str, branch: str = "main", file_name: str = "") -> str:
-        branches = api_list_dataset_branchs(token, dataset_id)
-        if not isinstance(branches, list):
-            return json.dumps(branches)
-        
-        if not branch in set(branches):
-            new_branch = api_create_dataset_new_branch(token, dataset_id, branch)
-            if "msg" not in new_branch or new_branch["msg"].lower() != "ok":
-                return json.dumps(new_branch)
+    async def upload_issue_latest_qa_to_dataset(token: str, dataset_id: str, branch: str = "main", file_name: str = "",
+                                                shard_size_mb: int = 8, max_concurrency: int = 4,
+                                                incremental: bool = False, output_format: str = "jsonl") -> CallToolResult:
+        if shard_size_mb < 1 or max_concurrency < 1:
+            return tool_result({"error_message": "shard_size_mb and max_concurrency must be at least 1."})
+        if output_format not in OUTPUT_FORMATS:
+            return tool_result({"error_message": f"output_format must be one of {', '.join(OUTPUT_FORMATS)}."})
+
+        json_data = await asyncio.to_thread(
+            upload_issue_latest_qa, token, dataset_id, branch, file_name,
+            shard_size_mb, max_concurrency, incremental, output_format,
+        )
+        return tool_result(json_data)
+
+def upload_issue_latest_qa(token: str, dataset_id: str, branch: str, file_name: str,
+                           shard_size_mb: int, max_concurrency: int,
+                           incremental: bool, output_format: str) -> dict:
+    """Fetch the issue QA records and upload them to a dataset branch, blocking until committed."""
+    branches = api_list_dataset_branchs(token, dataset_id)
+    if not isinstance(branches, list):
+        return branches
+    
+    watermark = load_watermark(dataset_id, branch) if incremental else {}
+    if not branch in set(branches):
+        new_branch = api_create_dataset_new_branch(token, dataset_id, branch)
+        if "msg" not in new_branch or new_branch["msg"].lower() != "ok":
+            return new_branch
+        # a watermark of a branch that is gone no longer describes its content
+        watermark = {}
+    
+    records = []
+    try:
+        records = get_issue_data()
+        if not isinstance(records, list):
+            return records
+    except Exception as e:
+        return {"error_message": f"Failed to retrieve issue QA records - {e}"}
+
+    if len(records) < 1:
+        return {"error_message": f"No any issue records found."}
+    
+    fetched = len(records)
+    if incremental:
+        records, next_watermark = select_new_records(records, watermark)
+        if len(records) < 1:
+            return {
+                "dataset_id": dataset_id,
+                "branch": branch,
+                "fetched_records": fetched,
+                "new_records": 0,
+                "watermark": {k: v for k, v in watermark.items() if "hashes" not in k},
+                "message": "No new issue records since the last sync.",
+            }
+
+    if file_name is None or file_name == "":
+        file_name = f"records_v{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
+    elif incremental:
+        # a fixed name would replace the earlier syncs with only the new records
+        file_name = sync_file_name(file_name, next_watermark["syncs"])
         
-        records = []
+    if output_format == "jsonl":
+        upload_result = upload_issue_data(token, dataset_id, branch, records, file_name,
+                                          shard_bytes=shard_size_mb * 1024 * 1024,
+                                          max_concurrency=max_concurrency)
+    else:
         try:
-            records = get_issue_data()
-            if not isinstance(records, list):
-                return json.dumps(records)
+            upload_result = upload_issue_export(token, dataset_id, branch, records,
+                                                export_file_name(file_name, output_format), output_format,
+                                                max_concurrency=max_concurrency)
         except Exception as e:
-            return f"Error: Failed to retrieve issue QA records - {e}"
+            logger.error(f"Error exporting issue records as {output_format}: {e}")
+            return {"error_message": f"Failed to export issue records as {output_format}. {e}"}
 
-        if len(records) < 1:
-            return f"Error: No any issue records found."
-        
-        if file_name is None or file_name == "":
-            file_name = f"records_v{datetime.now().strftime('%Y%m%d-%H%M%S')}.jsonl"
-            
-        upload_result = upload_issue_data(token, dataset_id, branch, records, file_name)
+    if incremental:
+        upload_result["fetched_records"] = fetched
+        upload_result["new_records"] = len(records)
+        # the watermark only moves once every shard is committed, a failed sync is retried whole
+        if "error_message" not in upload_result:
+            save_watermark(dataset_id, branch, next_watermark)
+            upload_result["watermark"] = {k: v for k, v in next_watermark.items() if "hashes" not in k}
+
+    return upload_result
+
+def register_repo_file_upload(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="upload_local_files_to_repo",
+        title="Upload local files to a dataset or model repo through Git LFS",
+        description="Upload files from the local disk of the MCP server to a branch of a dataset or model repo on CSGHub with access token. Only files under the CSGHUB_MCP_UPLOAD_ROOT directory of the server can be uploaded, relative local_paths are taken from it, and the tool is disabled while it is not set. repo_type is dataset or model, the default branch is main. Files are placed under path_in_repo with their base names. Files matching the LFS patterns of the dataset .gitattributes, such as *.parquet, *.safetensors, *.bin or *.zip, are streamed from disk to LFS storage through the Git LFS batch API, large ones in concurrent parts, and committed as LFS pointer files. Objects the server already stores are not uploaded again. Other files up to 10 MB are committed directly. With skip_unchanged (default true) files whose content already matches the file on the branch, compared by git blob SHA or LFS OID, are skipped and reported as unchanged. Returns the status of every file.",
+        structured_output=True,
+    )
+    async def upload_local_files_to_repo(
+        token: str,
+        repo_id: str,
+        local_paths: list[str],
+        path_in_repo: str = "",
+        repo_type: str = "dataset",
+        branch: str = "main",
+        max_concurrency: int = 4,
+        skip_unchanged: bool = True,
+    ) -> CallToolResult:
+        if repo_type not in ("dataset", "model"):
+            return tool_result({"error_message": "repo_type must be dataset or model."})
+        if not local_paths:
+            return tool_result({"error_message": "local_paths must not be empty."})
+        if max_concurrency < 1:
+            return tool_result({"error_message": "max_concurrency must be at least 1."})
+        try:
+            resolved_paths = [resolve_upload_path(local_path) for local_path in local_paths]
+        except ValueError as e:
+            return tool_result({"error_message": f"{e}."})
+
+        try:
+            username = await asyncio.to_thread(api_get_username_from_token, token)
+        except Exception as e:
+            logger.error(f"Error calling user token API: {e}")
+            return tool_result({"error_message": f"Failed to get username. {e}"})
+        if not isinstance(username, str):
+            return tool_result(username)
+
+        prefix = path_in_repo.strip("/")
+        files = [(local_path, posixpath.join(prefix, os.path.basename(local_path))) for local_path in resolved_paths]
+        try:
+            json_data = await asyncio.to_thread(
+                upload_repo_files, token, username, repo_id, files,
+                branch=branch, repo_type=repo_type, max_concurrency=max_concurrency,
+                skip_unchanged=skip_unchanged,
+            )
+        except Exception as e:
+            logger.error(f"Error uploading files to {repo_id}: {e}")
+            return tool_result({"error_message": f"Failed to upload files. {e}"})
+        return tool_result(json_data)
+
+def register_repo_file_read(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="read_repo_file",
+        title="Read part of a file in a dataset repo on CSGHub",
+        description="Read a file of a dataset repo on CSGHub without cloning it, fetching only the requested bytes with an HTTP range request. repo_id is namespace/name, branch is a branch name or a commit SHA, default main. By default up to max_bytes (default 65536, at most 8 MiB) are read from offset, length limits the read further. With start_line and/or max_lines whole lines are returned instead, counted from 1 at offset. Text is returned as UTF-8 content, binary data base64 encoded. Pass next_offset back as offset to continue while has_more is true. Whole files up to 256 KB are cached by commit SHA.",
+        structured_output=True,
+    )
+    async def read_repo_file(
+        token: str,
+        repo_id: str,
+        file_path: str,
+        branch: str = "main",
+        offset: int = 0,
+        length: int = 0,
+        max_bytes: int = 65536,
+        start_line: int = 0,
+        max_lines: int = 0,
+    ) -> CallToolResult:
+        if offset < 0 or length < 0 or max_bytes < 1 or start_line < 0 or max_lines < 0:
+            return tool_result({"error_message": "offset, length, start_line and max_lines must not be negative, max_bytes must be at least 1."})
+        try:
+            json_data = await asyncio.to_thread(
+                api_read_repo_file, token, "dataset", repo_id, file_path,
+                branch=branch, offset=offset, length=length, max_bytes=max_bytes,
+                start_line=start_line, max_lines=max_lines,
+            )
+        except Exception as e:
+            logger.error(f"Error reading {file_path} of dataset {repo_id}: {e}")
+            return tool_result({"error_message": f"Failed to read repo file. {e}"})
+        return tool_result(json_data)
 
-        return json.dumps(upload_result)
+def register_dataset_preview(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="preview_dataset",
+        title="Preview the schema, row count and first rows of a dataset file",
+        description="Preview a dataset file on CSGHub without downloading it. file_path picks the file, by default the first Parquet, JSON lines, CSV, TSV or JSON file found. For Parquet only the footer and the first row group are read with range requests, returning the schema, the exact row count and up to rows sample rows. Text files are parsed from their first sample_bytes (default 65536), returning the inferred schema, an estimated row count and sample rows. Previews are cached by commit, so repeated previews of the same branch head are free.",
+        structured_output=True,
+    )
+    async def preview_dataset(
+        token: str,
+        dataset_id: str,
+        file_path: str = "",
+        branch: str = "main",
+        rows: int = 5,
+        sample_bytes: int = 65536,
+    ) -> CallToolResult:
+        if rows < 0 or rows > 100:
+            return tool_result({"error_message": "rows must be between 0 and 100."})
+        if sample_bytes < 1024 or sample_bytes > 8 * 1024 * 1024:
+            return tool_result({"error_message": "sample_bytes must be between 1024 and 8388608."})
+        try:
+            json_data = await asyncio.to_thread(
+                api_preview_dataset, token, dataset_id, file_path,
+                branch=branch, rows=rows, sample_bytes=sample_bytes,
+            )
+        except Exception as e:
+            logger.error(f"Error previewing dataset {dataset_id}: {e}")
+            return tool_result({"error_message": f"Failed to preview dataset. {e}"})
+        return tool_result(json_data)
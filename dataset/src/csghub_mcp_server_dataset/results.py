@@ -0,0 +1,20 @@
+from typing import Any
+
+import pydantic_core
+from mcp.types import CallToolResult, TextContent
+
+def tool_result(data: Any) -> CallToolResult:
+    """Build the tool response from the parsed API data.
+
+    The payload is encoded exactly once by pydantic-core into compact JSON text,
+    and the same object is handed to the client as structured content. Lists are
+    placed under "result" because structured content must be a JSON object.
+    """
+    text = pydantic_core.to_json(data, fallback=str).decode()
+    structured = data if isinstance(data, dict) else {"result": data}
+    is_error = isinstance(data, dict) and "error_message" in data
+    return CallToolResult(
+        content=[TextContent(type="text", text=text)],
+        structuredContent=structured,
+        isError=is_error,
+    )
@@ -0,0 +1,111 @@
+import pytest
+
+from csghub_mcp_server_dataset import dataset
+from csghub_mcp_server_dataset.api_client import sync
+from csghub_mcp_server_dataset.api_client.sync import record_hash, select_new_records, sync_file_name
+
+
+def _qa(qa_id, updated_at=None, answer="a"):
+    record = {"id": qa_id, "question": f"q{qa_id}", "answer": answer}
+    if updated_at is not None:
+        record["updated_at"] = updated_at
+    return record
+
+
+def test_first_sync_takes_every_record():
+    records = [_qa(1, "2024-01-01"), _qa(2, "2024-01-02"), _qa(3, "2024-01-02")]
+    new, watermark = select_new_records(records, {})
+    assert new == records
+    assert watermark["last_timestamp"] == "2024-01-02"
+    assert watermark["last_id"] == 3
+    assert sorted(watermark["hashes"]) == sorted(record_hash(r) for r in records[1:])
+    assert watermark["syncs"] == 1
+    assert watermark["total_records"] == 3
+
+
+def test_records_at_the_watermark_are_new_only_when_unseen():
+    old = [_qa(1, "2024-01-01"), _qa(2, "2024-01-02")]
+    _, watermark = select_new_records(old, {})
+    records = old + [_qa(3, "2024-01-02"), _qa(2, "2024-01-02", answer="edited"), _qa(4, "2023-12-31")]
+    new, next_watermark = select_new_records(records, watermark)
+    assert new == [_qa(3, "2024-01-02"), _qa(2, "2024-01-02", answer="edited")]
+    assert len(next_watermark["hashes"]) == 3
+    assert next_watermark["syncs"] == 2
+
+
+def test_newer_records_move_the_watermark():
+    _, watermark = select_new_records([_qa(1, "2024-01-01")], {})
+    new, next_watermark = select_new_records([_qa(1, "2024-01-01"), _qa(2, "2024-01-05")], watermark)
+    assert new == [_qa(2, "2024-01-05")]
+    assert next_watermark["last_timestamp"] == "2024-01-05"
+    assert next_watermark["hashes"] == [record_hash(_qa(2, "2024-01-05"))]
+
+
+def test_unstamped_records_are_deduplicated_by_hash():
+    records = [_qa(1), _qa(2), _qa(1)]
+    new, watermark = select_new_records(records, {})
+    assert new == [_qa(1), _qa(2)]
+    assert watermark["last_timestamp"] is None
+    new, watermark = select_new_records(records + [_qa(3)], watermark)
+    assert new == [_qa(3)]
+    assert len(watermark["hashes"]) == 3
+
+
+def test_unstamped_hashes_next_to_timestamps_are_kept():
+    new, watermark = select_new_records([_qa(1, "2024-01-01"), _qa(2)], {})
+    assert watermark["unstamped_hashes"] == [record_hash(_qa(2))]
+    new, _ = select_new_records([_qa(1, "2024-01-01"), _qa(2)], watermark)
+    assert new == []
+
+
+def test_unstamped_hashes_are_capped_dropping_the_oldest(monkeypatch):
+    monkeypatch.setattr(sync, "MAX_UNSTAMPED_HASHES", 3)
+    records = [_qa(i) for i in range(5)]
+    _, watermark = select_new_records(records, {})
+    assert watermark["hashes"] == [record_hash(r) for r in records[2:]]
+    new, _ = select_new_records(records, watermark)
+    assert new == records[:2]
+
+
+def test_sync_file_names_number_the_sync():
+    assert sync_file_name("qa.jsonl", 1) == "qa-sync00001.jsonl"
+    assert sync_file_name("qa.jsonl.zst", 12) == "qa-sync00012.jsonl.zst"
+
+
+@pytest.fixture
+def upstream(monkeypatch, tmp_path):
+    monkeypatch.setenv("CSGHUB_MCP_STATE_DIR", str(tmp_path))
+    records = [_qa(1, "2024-01-01"), _qa(2, "2024-01-02")]
+    uploads = []
+
+    def upload_issue_data(token, dataset_id, branch, new_records, file_name, **kwargs):
+        uploads.append((file_name, list(new_records)))
+        return {"shards": [{"file_name": file_name, "records": len(new_records)}]}
+
+    monkeypatch.setattr(dataset, "api_list_dataset_branchs", lambda token, dataset_id: ["main"])
+    monkeypatch.setattr(dataset, "get_issue_data", lambda: list(records))
+    monkeypatch.setattr(dataset, "upload_issue_data", upload_issue_data)
+    return records, uploads
+
+
+def _sync():
+    return dataset.upload_issue_latest_qa("token", "alice/qa", "main", "qa.jsonl", 1, 1, True, "jsonl")
+
+
+def test_rerun_without_new_records_uploads_nothing(upstream):
+    records, uploads = upstream
+    first = _sync()
+    assert first["new_records"] == 2
+    second = _sync()
+    assert second["new_records"] == 0
+    assert [file_name for file_name, _ in uploads] == ["qa-sync00001.jsonl"]
+
+
+def test_each_sync_adds_a_new_shard(upstream):
+    records, uploads = upstream
+    _sync()
+    records.append(_qa(3, "2024-01-03"))
+    second = _sync()
+    assert second["new_records"] == 1
+    assert uploads[1] == ("qa-sync00002.jsonl", [_qa(3, "2024-01-03")])
+    assert second["watermark"]["syncs"] == 2
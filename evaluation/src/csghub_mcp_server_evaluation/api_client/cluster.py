@@ -1,6 +1,6 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, response_body
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +20,7 @@ def get_clusters(token: str) -> dict:
     }
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"Failed to fetch clusters: {response.status_code} - {response.text}")
+        logger.error("Failed to fetch clusters: %s - %s", response.status_code, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -1,6 +1,6 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, response_body
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +18,7 @@ def get_opencompass_datasets(token: str) -> dict:
     url = f"{config.api_endpoint}/api/v1/datasets?tag_category=runtime_framework&tag_name=opencompass"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get opencompass datasets on {url}: {response.text}")
+        logger.error("failed to get opencompass datasets on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     response.raise_for_status()
@@ -1,11 +1,11 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, pick_fields, response_body
 from .user import api_get_username_from_token
 
 logger = logging.getLogger(__name__)
 
-def list_evaluations(token: str, per: int = 10, page: int = 1) -> dict:
+def list_evaluations(token: str, per: int = 10, page: int = 1, fields: list = None) -> dict:
     """List evaluation services for a user.
     
     Args:
@@ -13,6 +13,7 @@ def list_evaluations(token: str, per: int = 10, page: int = 1) -> dict:
         username: Username
         per: Items per page
         page: Page number
+        fields: Upstream attributes to extract instead of the default summary
         
     Returns:
         Evaluation services data
@@ -23,7 +24,7 @@ def list_evaluations(token: str, per: int = 10, page: int = 1) -> dict:
         username = api_get_username_from_token(token)
     except Exception as e:
         logger.error(f"Error calling user token API: {e}")
-        return f"Error: Failed to get username. {e}"
+        return {"error_message": f"Failed to get username. {e}"}
 
     headers = {"Authorization": f"Bearer {token}"}
     params = {
@@ -33,7 +34,7 @@ def list_evaluations(token: str, per: int = 10, page: int = 1) -> dict:
     url = f"{config.api_endpoint}/api/v1/user/{username}/evaluations"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to list user evaluations on {url}: {response.text}")
+        logger.error("failed to list user evaluations on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -45,6 +46,9 @@ def list_evaluations(token: str, per: int = 10, page: int = 1) -> dict:
         return res_data
 
     for res in res_list:
+        if fields:
+            res_data.append(pick_fields(res, fields))
+            continue
         res_data.append({
             "id": res["id"],
             "task_id": res["task_id"],
@@ -56,12 +60,13 @@ def list_evaluations(token: str, per: int = 10, page: int = 1) -> dict:
 
     return res_data
 
-def get_evaluation_details(token: str, id: int) -> dict:
+def get_evaluation_details(token: str, id: int, fields: list = None) -> dict:
     """Get evaluaton details.
     
     Args:
         token: User access token
         id: Evaluation ID
+        fields: Upstream attributes to extract instead of the default summary
         
     Returns:
         evaluation data
@@ -71,7 +76,7 @@ def get_evaluation_details(token: str, id: int) -> dict:
     url = f"{config.api_endpoint}/api/v1/evaluations/{id}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get eval details on {url}: {response.text}")
+        logger.error("failed to get eval details on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -82,7 +87,8 @@ def get_evaluation_details(token: str, id: int) -> dict:
     res_data = json_data["data"] if json_data and "data" in json_data else []
     if not isinstance(res_data, object):
         return res_data
-    print(res_data)
+    if fields:
+        return pick_fields(res_data, fields)
     eval_data = {
         "id": res_data["id"],
         "task_id": res_data["task_id"],
@@ -130,7 +136,7 @@ def create_evaluation(token: str,
         payload["resource_id"] = resource_id
     response = requests.post(url, headers=headers, json=payload)
     if response.status_code != 200:
-        logger.error(f"failed to create evaluation on {url}: {response.text}")
+        logger.error("failed to create evaluation on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     response.raise_for_status()
@@ -166,7 +172,7 @@ def delete_evaluation(token: str, evaluation_id: int) -> dict:
     url = f"{config.api_endpoint}/api/v1/evaluations/{evaluation_id}"
     response = requests.delete(url, headers=headers)
     if response.status_code not in [200, 204]:
-        logger.error(f"failed to delete evaluation on {url}: {response.text}")
+        logger.error("failed to delete evaluation on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -1,6 +1,6 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, response_body
 
 logger = logging.getLogger(__name__)
 
@@ -18,7 +18,7 @@ def get_opencompass_models(token: str) -> dict:
     url = f"{config.api_endpoint}/api/v1/models?tag_category=runtime_framework&tag_name=opencompass"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get opencompass models on {url}: {response.text}")
+        logger.error("failed to get opencompass models on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     response.raise_for_status()
@@ -52,7 +52,7 @@ def get_model_runtime_framework(token: str, model_id: str, deploy_type: int) ->
     url = f"{config.api_endpoint}/api/v1/models/{model_id}/runtime_framework_v2?deploy_type={deploy_type}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get model runtime framework on {url}: {response.text}")
+        logger.error("failed to get model runtime framework on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     json_data = response.json()
@@ -0,0 +1,194 @@
+import codecs
+import csv
+import json
+import logging
+import requests
+
+logger = logging.getLogger(__name__)
+
+# columns of an OpenCompass style summary that describe the row, all others are models
+ROW_COLUMNS = {"dataset", "version", "metric", "mode", "subset", "task"}
+CHUNK_SIZE = 65536
+# longer lines are skipped unread, so a line never holds more than this in memory
+MAX_LINE_CHARS = 1024 * 1024
+
+
+class ScoreTable:
+    """Compact model x dataset score table with a fixed size budget.
+
+    Rows are keyed by "dataset" or "dataset/metric". Once max_cells scores are
+    stored further scores are only counted, so memory does not grow with the
+    size of the result file. Lines that cannot be parsed are counted in
+    skipped_lines.
+    """
+
+    def __init__(self, max_cells: int = 5000):
+        self.max_cells = max_cells
+        self.models = []
+        self.scores = {}
+        self.cells = 0
+        self.dropped = 0
+        self.skipped_lines = 0
+
+    def skip_line(self):
+        self.skipped_lines += 1
+
+    def add(self, dataset: str, model: str, score, metric: str = ""):
+        if score in (None, "", "-"):
+            return
+        if self.cells >= self.max_cells:
+            self.dropped += 1
+            return
+        try:
+            score = float(score)
+        except (TypeError, ValueError):
+            pass
+        row = f"{dataset}/{metric}" if metric else str(dataset)
+        if model not in self.models:
+            self.models.append(model)
+        self.scores.setdefault(row, {})[model] = score
+        self.cells += 1
+
+    def add_record(self, record: dict):
+        """Add one row, either {dataset, model, score} or a summary row with model columns."""
+        if not isinstance(record, dict):
+            return
+        dataset = record.get("dataset") or record.get("task") or "unknown"
+        metric = record.get("metric") or ""
+        if "model" in record and "score" in record:
+            self.add(dataset, str(record["model"]), record["score"], metric)
+            return
+        for column, value in record.items():
+            if column not in ROW_COLUMNS and not isinstance(value, (dict, list)):
+                self.add(dataset, column, value, metric)
+
+    def to_dict(self) -> dict:
+        return {
+            "models": self.models,
+            "datasets": list(self.scores.keys()),
+            "scores": self.scores,
+            "cells": self.cells,
+            "truncated": self.dropped > 0,
+            "dropped_cells": self.dropped,
+            "skipped_lines": self.skipped_lines,
+        }
+
+
+def detect_result_format(url: str, content_type: str = "") -> str:
+    path = url.split("?", 1)[0].lower()
+    content_type = (content_type or "").lower()
+    if path.endswith(".csv") or "csv" in content_type:
+        return "csv"
+    if path.endswith(".jsonl") or "ndjson" in content_type or "jsonl" in content_type:
+        return "jsonl"
+    if path.endswith(".json") or "json" in content_type:
+        return "json"
+    return ""
+
+
+def iter_text_lines(chunks, max_line_chars: int = MAX_LINE_CHARS, on_skip=None):
+    """Decode a byte chunk stream into text lines, newline included, without joining the whole body.
+
+    A line longer than max_line_chars is dropped as soon as it grows past it
+    and on_skip is called once for it, so at most one chunk more than
+    max_line_chars is held.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    pending = ""
+    skipping = False
+    for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if skipping:
+                # the end of an overlong line
+                skipping = False
+            elif len(line) > max_line_chars:
+                if on_skip:
+                    on_skip()
+            else:
+                yield line + "\n"
+        if len(pending) > max_line_chars:
+            if not skipping and on_skip:
+                on_skip()
+            skipping = True
+            pending = ""
+    pending += decoder.decode(b"", final=True)
+    if pending and not skipping:
+        if len(pending) > max_line_chars:
+            if on_skip:
+                on_skip()
+        else:
+            yield pending
+
+
+def iter_csv_records(lines, on_skip=None):
+    """Read CSV rows as dicts, skipping rows the csv module rejects, such as a field over its size limit."""
+    reader = csv.DictReader(lines)
+    while True:
+        try:
+            yield next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            logger.warning(f"skipped a malformed evaluation result row: {e}")
+            if on_skip:
+                on_skip()
+
+
+def api_stream_evaluation_scores(download_url: str, max_cells: int = 5000, max_json_bytes: int = 8 * 1024 * 1024) -> dict:
+    """Download an evaluation result file in chunks and fold it into a score table.
+
+    CSV and JSON lines results are parsed row by row while downloading, lines
+    longer than MAX_LINE_CHARS or that do not parse are skipped and counted. A
+    plain JSON document has to be parsed whole, so it is only read up to
+    max_json_bytes.
+    """
+    with requests.get(download_url, stream=True, timeout=(10, 60)) as response:
+        if response.status_code != 200:
+            logger.error(f"failed to download evaluation result on {download_url}: {response.status_code}")
+            return {
+                "error_code": response.status_code,
+                "error_message": f"failed to download evaluation result: {response.reason}",
+            }
+
+        result_format = detect_result_format(download_url, response.headers.get("Content-Type", ""))
+        table = ScoreTable(max_cells=max_cells)
+        chunks = response.iter_content(chunk_size=CHUNK_SIZE)
+
+        if result_format == "csv":
+            for record in iter_csv_records(iter_text_lines(chunks, on_skip=table.skip_line), on_skip=table.skip_line):
+                table.add_record(record)
+        elif result_format == "jsonl":
+            for line in iter_text_lines(chunks, on_skip=table.skip_line):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    table.skip_line()
+                    continue
+                table.add_record(record)
+        elif result_format == "json":
+            body = bytearray()
+            for chunk in chunks:
+                body.extend(chunk)
+                if len(body) > max_json_bytes:
+                    return {"error_message": f"evaluation result is larger than {max_json_bytes} bytes, download it from {download_url}"}
+            try:
+                data = json.loads(body)
+            except ValueError as e:
+                return {"error_message": f"evaluation result is not valid JSON. {e}"}
+            if isinstance(data, dict) and "data" in data:
+                data = data["data"]
+            if isinstance(data, dict):
+                # {dataset: {model: score}}
+                data = [{"dataset": dataset, **scores} for dataset, scores in data.items() if isinstance(scores, dict)]
+            for record in data if isinstance(data, list) else []:
+                table.add_record(record)
+        else:
+            return {"error_message": f"unsupported evaluation result format, download it from {download_url}"}
+
+    res_data = table.to_dict()
+    res_data["format"] = result_format
+    return res_data
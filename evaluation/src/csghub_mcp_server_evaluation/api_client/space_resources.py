@@ -1,6 +1,6 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, response_body
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +20,7 @@ def get_space_resources(token: str, cluster_id: str, deploy_type: int) -> dict:
     url = f"{config.api_endpoint}/api/v1/space_resources?cluster_id={cluster_id}&deploy_type={deploy_type}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get space resources on {url}: {response.text}")
+        logger.error("failed to get space resources on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     json_data = response.json()
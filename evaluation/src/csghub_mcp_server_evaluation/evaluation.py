@@ -1,50 +1,108 @@
+import asyncio
 import logging
-from mcp.server.fastmcp import FastMCP
-import json
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.types import CallToolResult
+from .results import tool_result
+from .polling import wait_for_status, EVALUATION_READY_STATUSES, EVALUATION_FAILED_STATUSES
+from .watcher import StatusWatcher, WatchKind, list_all_pages
 from .api_client import (
     api_get_username_from_token,
 )
 from .api_client import evaluation, model, dataset, cluster, space_resources
+from .api_client.scores import api_stream_evaluation_scores
 
 logger = logging.getLogger(__name__)
 
+EVALUATION_DONE_STATUSES = EVALUATION_READY_STATUSES | EVALUATION_FAILED_STATUSES
+
 def register_evaluation_tools(mcp_instance: FastMCP):
     register_evaluation_list(mcp_instance=mcp_instance)
     register_evaluation_query(mcp_instance=mcp_instance)
+    register_evaluation_wait(mcp_instance=mcp_instance)
     register_evaluation_create(mcp_instance=mcp_instance)
     register_evaluation_delete(mcp_instance=mcp_instance)
+    register_evaluation_watch_tools(mcp_instance=mcp_instance)
 
 def register_evaluation_list(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="list_evaluation_services",
         title="List evaluation services for a user from CSGHub",
-        description="Retrieve a list of evaluation services for a specific user from CSGHub. Parameters: `token` (str, required): User's API token. `username` (str, required): The user's namespace. You can control the pagination by specifying the number of items per page and the page number.",
+        description="Retrieve a list of evaluation services for a specific user from CSGHub. Parameters: `token` (str, required): User's API token. `username` (str, required): The user's namespace. You can control the pagination by specifying the number of items per page and the page number. Optional `fields` (list of str) picks the upstream attributes to return instead of the default summary, use dots for nested attributes.",
         structured_output=True,
     )
-    def list_evaluation(token: str, username: str, per: int = 10, page: int = 1) -> str:
+    def list_evaluation(token: str, username: str, per: int = 10, page: int = 1, fields: list[str] = None) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
         if not username:
-            return "Error: The 'username' parameter is required."
+            return tool_result({"error_message": "The 'username' parameter is required."})
         
         try:
-            evaluations = evaluation.list_evaluations(token, per, page)
-            return json.dumps(evaluations)
+            evaluations = evaluation.list_evaluations(token, per, page, fields=fields)
+            return tool_result(evaluations)
         except Exception as e:
             logger.error(f"Error calling evaluation API: {e}")
-            return f"Error: Failed to list evaluation services. {e}"
+            return tool_result({"error_message": f"Failed to list evaluation services. {e}"})
 
 def register_evaluation_query(mcp_instance: FastMCP):
 
     @mcp_instance.tool(
         name="get_evaluation_by_id",
         title="Get evaluation details by numeric ID",
-        description="Retrieve the evaluation details by a specific numeric ID from CSGHub with user access token. This is useful for checking the details of a evaluation that has been submitted to the CSGHub service.",
+        description="Retrieve the evaluation details by a specific numeric ID from CSGHub with user access token. This is useful for checking the details of a evaluation that has been submitted to the CSGHub service. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes.",
+        structured_output=True,
+    )
+    def get_evaluation_by_id(token: str, id: int, fields: list[str] = None) -> CallToolResult:
+        json_data = evaluation.get_evaluation_details(token, id, fields=fields)
+        return tool_result(json_data)
+
+def register_evaluation_wait(mcp_instance: FastMCP):
+
+    @mcp_instance.tool(
+        name="wait_for_evaluation_results",
+        title="Wait for an evaluation to finish and collect its scores",
+        description="Wait server side until the evaluation with a specific numeric ID on CSGHub finishes, polling with backoff and sending status changes as progress, then download the result file in chunks and return a compact score table of models by datasets. Parameters: `token` (str, required): User's API token. `id` (int, required): Evaluation ID. `timeout` (int, optional, default: 3600): Seconds to wait. `max_cells` (int, optional, default: 5000): Maximum number of scores kept, further scores are counted as dropped. CSV and JSON lines results are parsed while downloading.",
         structured_output=True,
     )
-    def get_evaluation_by_id(token: str, id: int) -> str:
-        json_data = evaluation.get_evaluation_details(token, id)
-        return json.dumps(json_data)
+    async def wait_for_evaluation_results(
+        token: str, id: int,
+        timeout: int = 3600, max_cells: int = 5000,
+        ctx: Context = None,
+    ) -> CallToolResult:
+        changes = 0
+
+        async def on_change(status: str, data: dict, elapsed: float):
+            nonlocal changes
+            changes += 1
+            logger.info(f"evaluation {id} is {status} after {elapsed:.0f}s")
+            if ctx:
+                await ctx.report_progress(progress=changes, message=f"evaluation {id} is {status}")
+
+        waited = await wait_for_status(
+            lambda: evaluation.get_evaluation_details(token, id),
+            EVALUATION_READY_STATUSES,
+            EVALUATION_FAILED_STATUSES,
+            timeout=timeout,
+            on_change=on_change,
+        )
+        result = dict(waited.pop("data") or {})
+        result.update(waited)
+        if waited["outcome"] != "ready":
+            result["error_message"] = f"evaluation {id} did not succeed: {waited['outcome']}"
+            return tool_result(result)
+
+        download_url = result.get("download_url")
+        if not download_url:
+            result["error_message"] = f"evaluation {id} has no download_url."
+            return tool_result(result)
+
+        if ctx:
+            await ctx.report_progress(progress=changes + 1, message=f"collecting evaluation {id} scores")
+        try:
+            result["score_table"] = await asyncio.to_thread(api_stream_evaluation_scores, download_url, max_cells)
+        except Exception as e:
+            logger.error(f"Error reading evaluation result: {e}")
+            result["score_table"] = {"error_message": f"Failed to read evaluation result. {e}"}
+        return tool_result(result)
 
 def register_evaluation_create(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -69,12 +127,12 @@ def register_evaluation_create(mcp_instance: FastMCP):
                           datasets: list[str],
                           share_mode: bool = True,
                           resource_id: int = None,
-                          ) -> str:
+                          ) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
 
         if not share_mode and resource_id is None:
-            return "Error: `resource_id` is required when `share_mode` is `False`. Please provide a `resource_id` and try again."
+            return tool_result({"error_message": "`resource_id` is required when `share_mode` is `False`. Please provide a `resource_id` and try again."})
         
         try:
             resp = evaluation.create_evaluation(token,
@@ -84,10 +142,10 @@ def register_evaluation_create(mcp_instance: FastMCP):
                                                datasets,
                                                share_mode,
                                                resource_id)
-            return json.dumps(resp)
+            return tool_result(resp)
         except Exception as e:
             logger.error(f"Error calling create evaluation API: {e}")
-            return f"Error: Failed to create evaluation. {e}"
+            return tool_result({"error_message": f"Failed to create evaluation. {e}"})
     
     @mcp_instance.tool(
         name="get_model_runtime_framework",
@@ -100,9 +158,9 @@ def register_evaluation_create(mcp_instance: FastMCP):
         ),
         structured_output=True,
     )
-    def get_model_runtime_framework(token: str, model_id: str) -> str:
+    def get_model_runtime_framework(token: str, model_id: str) -> CallToolResult:
         json_data = model.get_model_runtime_framework(token, model_id, deploy_type=4)
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
     @mcp_instance.tool(
         name="get_opencompass_datasets",
@@ -110,16 +168,16 @@ def register_evaluation_create(mcp_instance: FastMCP):
         description="Retrieves a list of datasets compatible with the OpenCompass framework. Each dataset in the returned list is an object, and you should use the value of the `path` field from these objects for the `datasets` parameter in the `create_evaluation` tool.",
         structured_output=True,
     )
-    def get_opencompass_datasets(token: str) -> str:
+    def get_opencompass_datasets(token: str) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
            
         try:
             datasets = dataset.get_opencompass_datasets(token)
-            return json.dumps(datasets)
+            return tool_result(datasets)
         except Exception as e:
             logger.error(f"Error calling get opencompass datasets API: {e}")
-            return f"Error: Failed to get opencompass datasets. {e}"
+            return tool_result({"error_message": f"Failed to get opencompass datasets. {e}"})
 
     @mcp_instance.tool(
         name="get_opencompass_models",
@@ -127,16 +185,16 @@ def register_evaluation_create(mcp_instance: FastMCP):
         description="Retrieves a list of models that are compatible with the OpenCompass evaluation framework. The model IDs returned by this tool can be used in the `model_ids` parameter of the `create_evaluation` and `get_model_runtime_framework` tools.",
         structured_output=True,
     )
-    def get_opencompass_models(token: str) -> str:
+    def get_opencompass_models(token: str) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
         
         try:
             models = model.get_opencompass_models(token)
-            return json.dumps(models)
+            return tool_result(models)
         except Exception as e:
             logger.error(f"Error calling get opencompass models API: {e}")
-            return f"Error: Failed to get opencompass models. {e}"
+            return tool_result({"error_message": f"Failed to get opencompass models. {e}"})
 
     @mcp_instance.tool(
         name="get_clusters",
@@ -144,16 +202,16 @@ def register_evaluation_create(mcp_instance: FastMCP):
         description="Retrieve a list of available clusters. The `cluster_id` from the response can be used to get specific space resources.",
         structured_output=True,
     )
-    def get_clusters(token: str) -> str:
+    def get_clusters(token: str) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
         
         try:
             clusters = cluster.get_clusters(token)
-            return json.dumps(clusters)
+            return tool_result(clusters)
         except Exception as e:
             logger.error(f"Error calling get clusters API: {e}")
-            return f"Error: Failed to get clusters. {e}"
+            return tool_result({"error_message": f"Failed to get clusters. {e}"})
 
     @mcp_instance.tool(
         name="get_space_resources",
@@ -161,16 +219,16 @@ def register_evaluation_create(mcp_instance: FastMCP):
         description="Retrieve a list of available space resources for a given cluster. This is useful for finding the `resource_id` to use when creating an evaluation (`share_mode=False`). You need to provide a `cluster_id` from the `get_clusters` tool.",
         structured_output=True,
     )
-    def get_space_resources(token: str, cluster_id: str) -> str:
+    def get_space_resources(token: str, cluster_id: str) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
         
         try:
             resources = space_resources.get_space_resources(token, cluster_id, deploy_type=4)
-            return json.dumps(resources)
+            return tool_result(resources)
         except Exception as e:
             logger.error(f"Error calling get space resources API: {e}")
-            return f"Error: Failed to get space resources. {e}"
+            return tool_result({"error_message": f"Failed to get space resources. {e}"})
 
 def register_evaluation_delete(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -179,14 +237,64 @@ def register_evaluation_delete(mcp_instance: FastMCP):
         description="Delete the evaluation by a specific numeric ID from CSGHub with user access token.",
         structured_output=True,
     )
-    def delete_evaluation_by_id(token: str, id: int) -> str:
+    def delete_evaluation_by_id(token: str, id: int) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
         try:
             resp = evaluation.delete_evaluation(token, id)
             if not resp:
-                return json.dumps({"message": "Evaluation deleted successfully"})
-            return json.dumps(resp)
+                return tool_result({"message": "Evaluation deleted successfully"})
+            return tool_result(resp)
         except Exception as e:
             logger.error(f"Error calling delete evaluation API: {e}")
-            return f"Error: Failed to delete evaluation. {e}"
+            return tool_result({"error_message": f"Failed to delete evaluation. {e}"})
+
+def register_evaluation_watch_tools(mcp_instance: FastMCP):
+    watcher = StatusWatcher(mcp_instance)
+    watcher.register_kind(WatchKind(
+        name="evaluation",
+        fetch_one=lambda token, params: evaluation.get_evaluation_details(token, params["id"]),
+        done_statuses=EVALUATION_DONE_STATUSES,
+        list_all=lambda token: list_all_pages(
+            lambda per, page: evaluation.list_evaluations(token, per, page)
+        ),
+        item_key=lambda item: item["id"],
+    ))
+
+    @mcp_instance.resource(
+        "csghub://evaluation/{id}",
+        name="evaluation_status",
+        description="Cached status of a watched evaluation, updated by watch_evaluation_status.",
+        mime_type="application/json",
+    )
+    def evaluation_status(id: str) -> dict:
+        return watcher.read(watcher.uri_for("evaluation", id))
+
+    @mcp_instance.tool(
+        name="watch_evaluation_status",
+        title="Watch evaluation status by evaluation ID",
+        description="Watch an evaluation by evaluation ID on CSGHub with user access token. The server polls it once per interval for all sessions together and sends a resources/updated notification for the returned uri whenever it changes, read the uri to get the current status. The calling session is subscribed automatically. Only sessions that watched the uri with their own token can read or subscribe to it. Watching ends after ttl seconds or when unwatch_status is called.",
+        structured_output=True,
+    )
+    async def watch_evaluation_status(
+        token: str, id: int,
+        ttl: int = 3600, ctx: Context = None,
+    ) -> CallToolResult:
+        result = await watcher.watch(
+            "evaluation", id,
+            {"id": id},
+            token, session=ctx.session if ctx else None, ttl=ttl,
+        )
+        return tool_result(result)
+
+    @mcp_instance.tool(
+        name="unwatch_status",
+        title="Stop watching a status uri",
+        description="Stop watching the uri returned by watch_evaluation_status for the calling session. Polling stops when no session watches it anymore.",
+        structured_output=True,
+    )
+    def unwatch_status(uri: str, ctx: Context = None) -> CallToolResult:
+        found = watcher.unwatch(uri, ctx.session if ctx else None)
+        if not found:
+            return tool_result({"error_message": f"{uri} is not watched."})
+        return tool_result({"uri": uri, "watching": uri in watcher.entities})
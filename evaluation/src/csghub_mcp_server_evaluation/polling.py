@@ -0,0 +1,106 @@
+import asyncio
+import logging
+import random
+import time
+from typing import Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+EVALUATION_READY_STATUSES = {"succeeded"}
+EVALUATION_FAILED_STATUSES = {"failed", "stopped", "deleted"}
+
+
+def backoff_delays(initial: float = 2.0, maximum: float = 30.0, factor: float = 2.0):
+    """Yield poll delays growing exponentially up to maximum, with equal jitter.
+
+    Half of each delay is fixed and half is random, so many waiters started at
+    the same moment spread their upstream calls instead of polling in lockstep.
+    """
+    delay = initial
+    while True:
+        yield delay / 2 + random.uniform(0, delay / 2)
+        delay = min(maximum, delay * factor)
+
+
+async def wait_for_status(
+    fetch: Callable[[], dict],
+    ready_statuses: set,
+    failed_statuses: set,
+    timeout: float = 900,
+    initial_interval: float = 2.0,
+    max_interval: float = 30.0,
+    max_errors: int = 5,
+    on_change: Callable[[str, dict, float], Awaitable[None]] = None,
+) -> dict:
+    """Poll fetch() server side until its status is ready, failed or the deadline passes.
+
+    fetch is a blocking API call returning a dict with a "status" key, it runs in a
+    worker thread. The backoff restarts from initial_interval whenever the status
+    changes, so quick phases are still observed promptly. on_change is awaited
+    with (status, data, elapsed seconds) for the first status and every change.
+
+    Returns:
+        outcome (ready, failed, timeout or error), the last status and data, the
+        number of polls, elapsed seconds and the seconds spent in each status
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    delays = backoff_delays(initial_interval, max_interval)
+    status = None
+    data = {}
+    polls = 0
+    errors = 0
+    phases = []
+    phase_started = started
+    outcome = "timeout"
+
+    while True:
+        polls += 1
+        try:
+            current = await asyncio.to_thread(fetch)
+        except Exception as e:
+            logger.warning(f"status poll failed: {e}")
+            current = {"error_message": str(e)}
+
+        now = time.monotonic()
+        if not isinstance(current, dict) or "error_message" in current or "status" not in current:
+            errors += 1
+            data = current
+            if errors >= max_errors:
+                outcome = "error"
+                break
+        else:
+            errors = 0
+            data = current
+            if current["status"] != status:
+                if status is not None:
+                    phases.append({"status": status, "seconds": round(now - phase_started, 1)})
+                status = current["status"]
+                phase_started = now
+                delays = backoff_delays(initial_interval, max_interval)
+                if on_change:
+                    await on_change(status, data, now - started)
+            if str(status).lower() in ready_statuses:
+                outcome = "ready"
+                break
+            if str(status).lower() in failed_statuses:
+                outcome = "failed"
+                break
+
+        remaining = deadline - now
+        if remaining <= 0:
+            break
+        await asyncio.sleep(min(next(delays), remaining))
+
+    now = time.monotonic()
+    if status is not None:
+        phases.append({"status": status, "seconds": round(now - phase_started, 1)})
+
+    return {
+        "outcome": outcome,
+        "status": status,
+        "data": data,
+        "polls": polls,
+        "elapsed_seconds": round(now - started, 1),
+        "phases": phases,
+    }
@@ -0,0 +1,70 @@
+import json
+
+from csghub_mcp_server_evaluation.api_client import scores
+from csghub_mcp_server_evaluation.api_client.scores import (
+    api_stream_evaluation_scores,
+    iter_csv_records,
+    iter_text_lines,
+)
+
+
+class FakeResponse:
+    status_code = 200
+    reason = "OK"
+
+    def __init__(self, body: bytes, content_type: str = ""):
+        self.body = body
+        self.headers = {"Content-Type": content_type}
+
+    def iter_content(self, chunk_size):
+        for start in range(0, len(self.body), 7):
+            yield self.body[start:start + 7]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+def _stream(monkeypatch, body: bytes, url: str) -> dict:
+    monkeypatch.setattr(scores.requests, "get", lambda *args, **kwargs: FakeResponse(body))
+    return api_stream_evaluation_scores(url)
+
+
+def test_lines_split_across_chunks_and_multibyte_characters():
+    body = "a,b\n分数,2\nlast".encode()
+    chunks = [body[i:i + 3] for i in range(0, len(body), 3)]
+    assert list(iter_text_lines(chunks)) == ["a,b\n", "分数,2\n", "last"]
+
+
+def test_overlong_lines_are_skipped_once():
+    skipped = []
+    chunks = [b"ok\n", b"x" * 6, b"x" * 6, b"xx\nnext\n", b"y" * 20]
+    lines = list(iter_text_lines(chunks, max_line_chars=8, on_skip=lambda: skipped.append(1)))
+    assert lines == ["ok\n", "next\n"]
+    assert len(skipped) == 2
+
+
+def test_csv_rows_over_the_field_limit_are_skipped():
+    skipped = []
+    rows = ["dataset,model_a\n", "gsm8k," + "9" * 200000 + "\n", "mmlu,70\n"]
+    records = list(iter_csv_records(iter(rows), on_skip=lambda: skipped.append(1)))
+    assert records == [{"dataset": "mmlu", "model_a": "70"}]
+    assert len(skipped) == 1
+
+
+def test_malformed_jsonl_lines_are_counted(monkeypatch):
+    body = "\n".join([
+        json.dumps({"dataset": "gsm8k", "model": "a", "score": 80}),
+        "{not json",
+        json.dumps({"dataset": "mmlu", "model": "a", "score": 70}),
+    ]).encode()
+    table = _stream(monkeypatch, body, "https://example.com/result.jsonl")
+    assert table["scores"] == {"gsm8k": {"a": 80.0}, "mmlu": {"a": 70.0}}
+    assert table["skipped_lines"] == 1
+
+
+def test_invalid_json_document_returns_an_error(monkeypatch):
+    table = _stream(monkeypatch, b"{\"gsm8k\": ", "https://example.com/result.json")
+    assert "error_message" in table
@@ -14,4 +14,7 @@ from .finetune_job import api_get_finetune_job
 from .finetune_job import api_delete_finetune_job
 from .finetune_job import api_create_finetune_job
 from .finetune_job import api_query_finetune_job_logs
+from .finetune_job import api_stream_finetune_job_logs
 from .dataset import api_get_dataset_detail
+from .inference import api_inference_create
+from .inference import api_get_inference_status
@@ -1,7 +1,7 @@
 import requests
 import logging
 import random
-from .constants import get_csghub_config
+from .constants import get_csghub_config, response_body
 
 logger = logging.getLogger(__name__)
 
@@ -16,7 +16,7 @@ def api_list_finetunes(token: str, username: str, per: int = 10, page: int = 1)
     url = f"{config.api_endpoint}/api/v1/user/{username}/finetune/instances"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to list user finetunes on {url}: {response.text}")
+        logger.error("failed to list user finetunes on %s: %s", url, response_body(response))
 
     response.raise_for_status()
     return response.json()
@@ -28,7 +28,7 @@ def api_get_finetune_status(token: str, model_id: str, deploy_id: int) -> dict:
     url = f"{config.api_endpoint}/api/v1/models/{model_id}/run/{deploy_id}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get inferences status on {url}: {response.text}")
+        logger.error("failed to get inferences status on %s: %s", url, response_body(response))
 
     response.raise_for_status()
     return response.json()
@@ -55,7 +55,7 @@ def api_finetune_create(
     }
     response = requests.post(url, headers=headers, json=json_data)
     if response.status_code != 200:
-        logger.error(f"failed to create finetune on {url}: {response.text}")
+        logger.error("failed to create finetune on %s: %s", url, response_body(response))
 
     response.raise_for_status()
     return response.json()
@@ -66,7 +66,7 @@ def api_finetune_stop(token: str, model_id: str, deploy_id: int):
     url = f"{config.api_endpoint}/api/v1/models/{model_id}/finetune/{deploy_id}/stop"
     response = requests.put(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to stop model finetune on {url}: {response.text}")
+        logger.error("failed to stop model finetune on %s: %s", url, response_body(response))
 
     response.raise_for_status()
     return response.json()
@@ -77,7 +77,7 @@ def api_finetune_start(token: str, model_id: str, deploy_id: int):
     url = f"{config.api_endpoint}/api/v1/models/{model_id}/finetune/{deploy_id}/start"
     response = requests.put(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to start model finetune on {url}: {response.text}")
+        logger.error("failed to start model finetune on %s: %s", url, response_body(response))
 
     response.raise_for_status()
     return response.json()
@@ -88,7 +88,7 @@ def api_finetune_delete(token: str, model_id: str, deploy_id: int):
     url = f"{config.api_endpoint}/api/v1/models/{model_id}/finetune/{deploy_id}"
     response = requests.delete(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to delete model finetune on {url}: {response.text}")
+        logger.error("failed to delete model finetune on %s: %s", url, response_body(response))
 
     response.raise_for_status()
     return response.json()
@@ -1,11 +1,13 @@
 import requests
 import logging
 import random
-from .constants import get_csghub_config, wrap_error_response
+import re
+from .constants import get_csghub_config, wrap_error_response, pick_fields, response_body
+from .logs import CHUNK_SIZE, build_line_filter, iter_json_string_lines, read_log_window
 
 logger = logging.getLogger(__name__)
 
-def api_list_finetune_jobs(token: str, username: str, per: int = 10, page: int = 1) -> dict:
+def api_list_finetune_jobs(token: str, username: str, per: int = 10, page: int = 1, fields: list = None) -> dict:
     config = get_csghub_config()
 
     headers = {"Authorization": f"Bearer {token}"}
@@ -16,7 +18,7 @@ def api_list_finetune_jobs(token: str, username: str, per: int = 10, page: int =
     url = f"{config.api_endpoint}/api/v1/user/{username}/finetune/jobs"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to list user finetune jobs on {url}: {response.text}")
+        logger.error("failed to list user finetune jobs on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -28,6 +30,9 @@ def api_list_finetune_jobs(token: str, username: str, per: int = 10, page: int =
         return res_data
 
     for res in res_list:
+        if fields:
+            res_data.append(pick_fields(res, fields))
+            continue
         finetuned_model_name = res["result_url"]
         job = {
             "job_id": res["id"],
@@ -43,14 +48,14 @@ def api_list_finetune_jobs(token: str, username: str, per: int = 10, page: int =
 
     return res_data
 
-def api_get_finetune_job(token: str, job_id: int) -> dict:
+def api_get_finetune_job(token: str, job_id: int, fields: list = None) -> dict:
     config = get_csghub_config()
 
     headers = {"Authorization": f"Bearer {token}"}
     url = f"{config.api_endpoint}/api/v1/finetunes/{job_id}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get finetune job on {url}: {response.text}")
+        logger.error("failed to get finetune job on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -59,6 +64,8 @@ def api_get_finetune_job(token: str, job_id: int) -> dict:
     
     if json_data and "data" in json_data:
         job_data = json_data["data"]
+        if fields:
+            return pick_fields(job_data, fields)
         finetuned_model_name = job_data["result_url"]
         res_data = {
             "job_id": job_data["id"],
@@ -79,7 +86,7 @@ def api_delete_finetune_job(token: str, job_id: int) -> dict:
     url = f"{config.api_endpoint}/api/v1/finetunes/{job_id}"
     response = requests.delete(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to delete finetune job on {url}: {response.text}")
+        logger.error("failed to delete finetune job on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -109,7 +116,7 @@ def api_create_finetune_job(token: str,
     }
     response = requests.post(url, headers=headers, json=data)
     if response.status_code != 200:
-        logger.error(f"failed to create finetune job on {url}: {response.text}")
+        logger.error("failed to create finetune job on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     json_data = response.json()
@@ -125,25 +132,53 @@ def api_create_finetune_job(token: str,
 
     return res_data
 
-def api_query_finetune_job_logs(token: str, job_id: int, since: str) -> dict:
+def api_query_finetune_job_logs(token: str, job_id: int, since: str,
+                                tail_lines: int = 0, cursor: int = 0,
+                                max_lines: int = 200, max_bytes: int = 65536,
+                                grep: str = "", level: str = "") -> dict:
     config = get_csghub_config()
 
+    try:
+        accept = build_line_filter(grep=grep, level=level)
+    except (re.error, ValueError) as e:
+        return {"error_message": f"invalid log filter. {e}"}
+
     headers = {"Authorization": f"Bearer {token}"}
     url = f"{config.api_endpoint}/api/v1/finetunes/{job_id}/logs"
     params = {
         "since": since,
         "stream": "false",
     }
-    response = requests.get(url, headers=headers, params=params)
-    if response.status_code != 200:
-        logger.error(f"failed to get finetune job jobs on {url}: {response.text}")
-        return wrap_error_response(response)
-
-    response.raise_for_status()
-    json_data = response.json()
-    res_data = {"logs": json_data["data"]}
+    with requests.get(url, headers=headers, params=params, stream=True) as response:
+        if response.status_code != 200:
+            logger.error("failed to get finetune job jobs on %s: %s", url, response_body(response))
+            return wrap_error_response(response)
+
+        lines = iter_json_string_lines(response.iter_content(chunk_size=CHUNK_SIZE), field="data")
+        res_data = read_log_window(
+            lines, accept,
+            cursor=max(cursor, 0), tail_lines=max(tail_lines, 0),
+            max_lines=max(max_lines, 1), max_bytes=max(max_bytes, 1),
+        )
     return res_data
 
+def api_stream_finetune_job_logs(token: str, job_id: int, since: str = "10mins") -> requests.Response:
+    """Open the live log stream of a finetune job, the caller must close the response."""
+    config = get_csghub_config()
+
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"{config.api_endpoint}/api/v1/finetunes/{job_id}/logs"
+    params = {
+        "since": since,
+        "stream": "true",
+    }
+    response = requests.get(url, headers=headers, params=params, stream=True, timeout=(10, None))
+    # text/event-stream is always UTF-8, without a charset requests would decode it as ISO-8859-1
+    response.encoding = "utf-8"
+    if response.status_code != 200:
+        logger.error("failed to stream finetune job logs on %s: %s", url, response_body(response))
+    return response
+
 if __name__ == "__main__":
     token = ""
     model_id = "wanghh2003/Qwen3-0.6B"
@@ -0,0 +1,69 @@
+import requests
+import logging
+import random
+from .constants import get_csghub_config, wrap_error_response, response_body
+
+logger = logging.getLogger(__name__)
+
+def api_inference_create(
+    token: str,
+    model_id: str,
+    cluster_id: str,
+    runtime_framework_id: int,
+    resource_id: int,
+    agent: str = "",
+) -> dict:
+    config = get_csghub_config()
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"{config.api_endpoint}/api/v1/models/{model_id}/run"
+    random_num = f"{random.randint(0, 9999):04d}"
+    json_data = {
+        "cluster_id": cluster_id,
+        "runtime_framework_id": runtime_framework_id,
+        "resource_id": resource_id,
+        "cost_per_hour": 0,
+        "deploy_name": f"deploy_{random_num}",
+        "env": "",
+        "hardware": "",
+        "max_replica": 1,
+        "min_replica": 1,
+        "revision": "main",
+        "secure_level": 1,
+        "entrypoint": "",
+        "agent": agent,
+    }
+    response = requests.post(url, headers=headers, json=json_data)
+    if response.status_code != 200:
+        logger.error("failed to create model inference on %s: %s", url, response_body(response))
+        return wrap_error_response(response)
+
+    json_data = response.json()
+    res_data = {}
+    if json_data and "data" in json_data:
+        res_data = {"deploy_id": json_data["data"]["deploy_id"]}
+
+    return res_data
+
+def api_get_inference_status(token: str, model_id: str, deploy_id: int) -> dict:
+    config = get_csghub_config()
+    headers = {"Authorization": f"Bearer {token}"}
+    url = f"{config.api_endpoint}/api/v1/models/{model_id}/run/{deploy_id}"
+    response = requests.get(url, headers=headers)
+    if response.status_code != 200:
+        logger.error("failed to get inference status on %s: %s", url, response_body(response))
+        return wrap_error_response(response)
+
+    json_data = response.json()
+    res_data = {}
+    if json_data and "data" in json_data:
+        job_data = json_data["data"]
+        res_data = {
+            "deploy_id": job_data["deploy_id"],
+            "deploy_name": job_data["deploy_name"],
+            "status": job_data["status"],
+        }
+        if job_data["status"].lower() == "running":
+            res_data["web_access_url"] = f"{config.web_endpoint}/endpoints/{model_id}/{deploy_id}?tab=summary"
+            res_data["api_access_endpoint"] = f"https://{job_data['endpoint']}/v1/chat/completions"
+
+    return res_data
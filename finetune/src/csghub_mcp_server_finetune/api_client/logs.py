@@ -0,0 +1,260 @@
+import codecs
+import re
+from collections import deque
+
+LOG_LEVELS = ["debug", "info", "warning", "error", "critical"]
+LOG_LEVEL_PATTERN = re.compile(r"\b(DEBUG|INFO|WARN|WARNING|ERROR|CRITICAL|FATAL)\b", re.IGNORECASE)
+LOG_LEVEL_ALIASES = {"warn": "warning", "fatal": "critical"}
+
+# a single log line longer than this is cut, its full size still counts for cursors
+MAX_LINE_CHARS = 16384
+CHUNK_SIZE = 65536
+
+JSON_ESCAPES = {
+    '"': '"', "\\": "\\", "/": "/",
+    "b": "\b", "f": "\f", "n": "\n", "r": "\r", "t": "\t",
+}
+JSON_STRING_PART = re.compile(r'[^"\\]+')
+
+
+def iter_json_string_lines(chunks, field: str = "data"):
+    """Yield (line, nbytes) for the text of a top level JSON string field.
+
+    The upstream logs endpoint answers {"msg": ..., "data": "<whole log>"}. The
+    body is scanned chunk by chunk so only the current line is held in memory,
+    nbytes is the UTF-8 size of the line including its newline.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    buf = ""
+    pos = 0
+    in_value = False
+    done = False
+    depth = 0
+    last_key = None
+    expect_value = False
+    line_parts = []
+    line_chars = 0
+    line_bytes = 0
+
+    for chunk in chunks:
+        if done:
+            break
+        buf = buf[pos:] + decoder.decode(chunk)
+        pos = 0
+        while pos < len(buf) and not done:
+            if not in_value:
+                # walk the envelope until the value string of the field starts
+                ch = buf[pos]
+                if ch == '"':
+                    if expect_value and depth == 1 and last_key == field:
+                        in_value = True
+                        pos += 1
+                        continue
+                    end = _find_string_end(buf, pos + 1)
+                    if end < 0:
+                        break
+                    if not expect_value:
+                        last_key = buf[pos + 1:end]
+                    expect_value = False
+                    pos = end + 1
+                    continue
+                if ch in "{[":
+                    depth += 1
+                    expect_value = False
+                elif ch in "}]":
+                    depth -= 1
+                    expect_value = False
+                elif ch == ":":
+                    expect_value = True
+                elif ch == ",":
+                    expect_value = False
+                    last_key = None
+                elif not ch.isspace() and expect_value and depth == 1 and last_key == field:
+                    # null or any non string value, there are no logs
+                    done = True
+                pos += 1
+                continue
+
+            match = JSON_STRING_PART.match(buf, pos)
+            if match:
+                part = match.group()
+                pos = match.end()
+                while part:
+                    head, sep, part = part.partition("\n")
+                    line_bytes += len(head.encode("utf-8"))
+                    if line_chars < MAX_LINE_CHARS:
+                        line_parts.append(head[:MAX_LINE_CHARS - line_chars])
+                        line_chars += len(head)
+                    if sep:
+                        yield "".join(line_parts), line_bytes + 1
+                        line_parts, line_chars, line_bytes = [], 0, 0
+                continue
+
+            ch = buf[pos]
+            if ch == '"':
+                done = True
+                break
+            # backslash escape, wait for more data when it is cut off
+            if pos + 1 >= len(buf):
+                break
+            esc = buf[pos + 1]
+            if esc == "u":
+                if pos + 6 > len(buf):
+                    break
+                code = int(buf[pos + 2:pos + 6], 16)
+                size = 6
+                if 0xD800 <= code < 0xDC00:
+                    if pos + 12 > len(buf):
+                        break
+                    if buf[pos + 6:pos + 8] == "\\u":
+                        low = int(buf[pos + 8:pos + 12], 16)
+                        code = 0x10000 + ((code - 0xD800) << 10) + (low - 0xDC00)
+                        size = 12
+                text = chr(code) if code < 0xD800 or code > 0xDFFF else "�"
+            else:
+                text = JSON_ESCAPES.get(esc, esc)
+                size = 2
+            pos += size
+            if text == "\n":
+                yield "".join(line_parts), line_bytes + 1
+                line_parts, line_chars, line_bytes = [], 0, 0
+                continue
+            line_bytes += len(text.encode("utf-8"))
+            if line_chars < MAX_LINE_CHARS:
+                line_parts.append(text)
+                line_chars += 1
+
+    if line_parts or line_bytes:
+        yield "".join(line_parts), line_bytes
+
+
+def _find_string_end(buf: str, start: int) -> int:
+    pos = start
+    while True:
+        pos = buf.find('"', pos)
+        if pos < 0:
+            return -1
+        backslashes = 0
+        while buf[pos - 1 - backslashes] == "\\":
+            backslashes += 1
+        if backslashes % 2 == 0:
+            return pos
+        pos += 1
+
+
+def line_level_index(line: str) -> int:
+    match = LOG_LEVEL_PATTERN.search(line)
+    if not match:
+        return -1
+    name = match.group(1).lower()
+    return LOG_LEVELS.index(LOG_LEVEL_ALIASES.get(name, name))
+
+
+def build_line_filter(grep: str = "", level: str = ""):
+    """Return a predicate for log lines, or raise ValueError on bad input.
+
+    grep is a case insensitive regular expression, level keeps lines tagged with
+    that level or a more severe one.
+    """
+    pattern = re.compile(grep, re.IGNORECASE) if grep else None
+    min_level = -1
+    if level:
+        name = level.lower()
+        name = LOG_LEVEL_ALIASES.get(name, name)
+        if name not in LOG_LEVELS:
+            raise ValueError(f"level must be one of {', '.join(LOG_LEVELS)}")
+        min_level = LOG_LEVELS.index(name)
+
+    def accept(line: str) -> bool:
+        if pattern and not pattern.search(line):
+            return False
+        if min_level >= 0 and line_level_index(line) < min_level:
+            return False
+        return True
+
+    return accept
+
+
+def read_log_window(lines, accept, cursor: int = 0, tail_lines: int = 0,
+                    max_lines: int = 200, max_bytes: int = 65536) -> dict:
+    """Select a bounded window of log lines.
+
+    Cursors are byte offsets into the log text. With tail_lines the last matching
+    lines after cursor are returned, otherwise the first ones. next_cursor points
+    past the last line that was read, pass it back to continue.
+    """
+    offset = 0
+    selected = deque(maxlen=tail_lines) if tail_lines > 0 else []
+    limit = min(tail_lines, max_lines) if tail_lines > 0 else max_lines
+    size = 0
+    next_cursor = cursor
+    has_more = False
+
+    for line, nbytes in lines:
+        start = offset
+        offset += nbytes
+        if offset <= cursor:
+            continue
+        if not accept(line):
+            next_cursor = offset
+            continue
+        if tail_lines > 0:
+            selected.append((line, start))
+            next_cursor = offset
+            continue
+        line_size = len(line.encode("utf-8")) + 1
+        if len(selected) >= limit or (selected and size + line_size > max_bytes):
+            has_more = True
+            break
+        selected.append((line, start))
+        size += line_size
+        next_cursor = offset
+
+    if tail_lines > 0:
+        # keep the newest lines that fit the byte and line budget
+        kept = []
+        for line, start in reversed(selected):
+            line_size = len(line.encode("utf-8")) + 1
+            if len(kept) >= limit or (kept and size + line_size > max_bytes):
+                break
+            kept.append((line, start))
+            size += line_size
+        selected = list(reversed(kept))
+
+    logs = "\n".join(line for line, _ in selected)
+    if len(logs.encode("utf-8")) > max_bytes:
+        logs = logs.encode("utf-8")[:max_bytes].decode("utf-8", errors="ignore")
+
+    return {
+        "logs": logs,
+        "lines": len(selected),
+        "start_cursor": selected[0][1] if selected else next_cursor,
+        "next_cursor": next_cursor,
+        "has_more": has_more,
+    }
+
+
+def iter_sse_lines(raw_lines):
+    """Yield log lines from the upstream streaming endpoint.
+
+    The stream is framed as server sent events, only data fields carry log text.
+    Unframed lines are passed through as they are.
+    """
+    for raw in raw_lines:
+        if not raw:
+            continue
+        if raw.startswith("data:"):
+            data = raw[5:]
+            yield data[1:] if data.startswith(" ") else data
+        elif raw.startswith(("event:", "id:", "retry:", ":")):
+            continue
+        else:
+            yield raw
+
+
+def line_log_level(line: str) -> str:
+    """Map a log line onto the MCP notification level."""
+    index = line_level_index(line)
+    if index < 0:
+        return "info"
+    return ["debug", "info", "warning", "error", "error"][index]
@@ -1,6 +1,6 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, response_body
 
 logger = logging.getLogger(__name__)
 
@@ -22,7 +22,7 @@ def api_get_available_resources_by_cluster_id(cluster_id: str, deploy_type: str)
     url = f"{config.api_endpoint}/api/v1/space_resources?cluster_id={cluster_id}&deploy_type={deploy_type}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get avai resources on {url}: {response.text}")
+        logger.error("failed to get avai resources on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     response.raise_for_status()
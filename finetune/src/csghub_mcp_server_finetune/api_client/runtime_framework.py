@@ -1,6 +1,6 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, response_body
 
 logger = logging.getLogger(__name__)
 
@@ -11,7 +11,7 @@ def api_get_available_runtime_frameworks(model_id: str, deploy_type: str) -> dic
     url = f"{config.api_endpoint}/api/v1/models/{model_id}/runtime_framework_v2?deploy_type={deploy_type}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get avai resources on {url}: {response.text}")
+        logger.error("failed to get avai resources on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     json_data = response.json()
@@ -38,7 +38,7 @@ def api_get_available_runtime_frameworks_by_deploy_type(token: str, deploy_type:
     url = f"{config.api_endpoint}/api/v1/models/runtime_framework?deploy_type={deploy_type}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get avai resources on {url}: {response.text}")
+        logger.error("failed to get avai resources on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     response.raise_for_status()
@@ -1,7 +1,8 @@
 import logging
-import json
 from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult
 
+from .results import tool_result
 from .api_client import (
     api_get_username_from_token,
     api_list_finetunes,
@@ -35,24 +36,24 @@ def register_finetune_list(mcp_instance: FastMCP):
         description="Retrieve a list of finetune instance with UI for a specific user from CSGHub. You can control the pagination by specifying the number of items per page and the page number.",
         structured_output=True,
     )
-    def list_finetune_instance(token: str, per: int = 10, page: int = 1) -> str:
+    def list_finetune_instance(token: str, per: int = 10, page: int = 1) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
         
         try:
             username = api_get_username_from_token(token)
         except Exception as e:
             logger.error(f"Error calling user token API: {e}")
-            return f"Error: Failed to get username. {e}"
+            return tool_result({"error_message": f"Failed to get username. {e}"})
 
         logger.info(f"Listing finetune jobs for user: {username}")
         
         try:
             finetunes = api_list_finetunes(token, username, per, page)
-            return json.dumps(finetunes)
+            return tool_result(finetunes)
         except Exception as e:
             logger.error(f"Error calling finetune API: {e}")
-            return f"Error: Failed to list finetune services. {e}"
+            return tool_result({"error_message": f"Failed to list finetune services. {e}"})
 
 def register_finetune_query(mcp_instance: FastMCP):
 
@@ -62,7 +63,7 @@ def register_finetune_query(mcp_instance: FastMCP):
         description="Retrieve the finetune job details and status by using a specific ID from CSGHub with user access token. This is useful for checking the status of a deployed model's finetune job.",
         structured_output=True,
     )
-    def get_finetuen_status_by_id(token: str, model_id: str, deploy_id: int) -> str:
+    def get_finetuen_status_by_id(token: str, model_id: str, deploy_id: int) -> CallToolResult:
         response_data = api_get_finetune_status(token, model_id, deploy_id)
         json_data = response_data["data"]
         access_url = ""
@@ -70,7 +71,7 @@ def register_finetune_query(mcp_instance: FastMCP):
         deploy_name = json_data["deploy_name"]
         if status.lower() == "running":
             access_url = f"https://opencsg.com/finetune/{model_id}/{deploy_name}/{deploy_id}?tab=pages"
-        return json.dumps({"data": json_data, "access_url": access_url})
+        return tool_result({"data": json_data, "access_url": access_url})
 
 def register_query_finetune_conditions(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -79,13 +80,13 @@ def register_query_finetune_conditions(mcp_instance: FastMCP):
         description="Retrieve a list of available resources and runtime frameworks that can be used for deploying finetune service on CSGHub.",
         structured_output=True,
     )
-    def query_available_resources_and_runtime_frameworks_for_finetune(model_id: str) -> str:
+    def query_available_resources_and_runtime_frameworks_for_finetune(model_id: str) -> CallToolResult:
 
         deploy_type = "2"
         res_json_data = api_get_available_resources(cluster_id, deploy_type)
         run_json_data = api_get_available_runtime_frameworks(model_id, deploy_type)
 
-        return json.dumps({
+        return tool_result({
             "resources_data": res_json_data["data"],
             "runtime_frameworks_data": run_json_data["data"]
         })
@@ -102,7 +103,7 @@ def register_finetune_create(mcp_instance: FastMCP):
         model_id: str,
         resource_id: int,
         runtime_framework_id: int,
-    ) -> str:
+    ) -> CallToolResult:
 
         json_data = api_finetune_create(
             token=token,
@@ -111,7 +112,7 @@ def register_finetune_create(mcp_instance: FastMCP):
             runtime_framework_id=runtime_framework_id,
             resource_id=resource_id,
         )
-        return json.dumps({"data": json_data["data"]})
+        return tool_result({"data": json_data["data"]})
 
 def register_finetune_control_tools(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -120,9 +121,9 @@ def register_finetune_control_tools(mcp_instance: FastMCP):
         description="Stop an running finetune service by model id and deploy id on CSGHub with user access token. model id and deploy id are required to stop the finetune service.",
         structured_output=True,
     )
-    def stop_finetune_by_modelid_and_deployid(token: str, model_id: str, deploy_id: int) -> str:
+    def stop_finetune_by_modelid_and_deployid(token: str, model_id: str, deploy_id: int) -> CallToolResult:
         res_json_data = api_finetune_stop(token, model_id, deploy_id)
-        return json.dumps(res_json_data)
+        return tool_result(res_json_data)
 
     @mcp_instance.tool(
         name="start_finetune_by_modelid_and_deployid",
@@ -130,9 +131,9 @@ def register_finetune_control_tools(mcp_instance: FastMCP):
         description="Start an stopped finetune service by model id and deploy id on CSGHub with user access token. model id and deploy id are required to start the finetune service.",
         structured_output=True,
     )
-    def start_finetune_by_modelid_and_deployid(token: str, model_id: str, deploy_id: int) -> str:
+    def start_finetune_by_modelid_and_deployid(token: str, model_id: str, deploy_id: int) -> CallToolResult:
         res_json_data = api_finetune_start(token, model_id, deploy_id)
-        return json.dumps(res_json_data)
+        return tool_result(res_json_data)
     
     @mcp_instance.tool(
         name="delete_finetune_by_modelid_and_deployid",
@@ -140,9 +141,9 @@ def register_finetune_control_tools(mcp_instance: FastMCP):
         description="Delete an finetune service by model id and deploy id on CSGHub with user access token. model id and deploy id are required to delete the finetune service. It's good idea to stop finetune service before deleting it.",
         structured_output=True,
     )
-    def delete_finetune_by_modelid_and_deployid(token: str, model_id: str, deploy_id: int) -> str:
+    def delete_finetune_by_modelid_and_deployid(token: str, model_id: str, deploy_id: int) -> CallToolResult:
         res_json_data = api_finetune_delete(token, model_id, deploy_id)
-        return json.dumps(res_json_data)  
+        return tool_result(res_json_data)  
 
 def register_check_model(mcp_instance: FastMCP):
     
@@ -152,7 +153,7 @@ def register_check_model(mcp_instance: FastMCP):
         description="Retrieve and find model detail and check if model exists in CSGHub by a specific deploy ID from CSGHub.",
         structured_output=True,
     )
-    def check_model_by_model_id(model_id: str) -> str:
+    def check_model_by_model_id(model_id: str) -> CallToolResult:
         json_data = api_get_model_detail(model_id)
-        return json.dumps({"data": json_data["data"]})
+        return tool_result({"data": json_data["data"]})
 
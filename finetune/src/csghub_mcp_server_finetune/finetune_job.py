@@ -1,8 +1,23 @@
+import asyncio
+import concurrent.futures
 import logging
-import json
 import os
-from mcp.server.fastmcp import FastMCP
+import re
+import threading
+import time
+from collections import deque
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.types import CallToolResult
 
+from .results import tool_result
+from .polling import (
+    wait_for_status,
+    FINETUNE_JOB_READY_STATUSES,
+    FINETUNE_JOB_FAILED_STATUSES,
+    INFERENCE_READY_STATUSES,
+    INFERENCE_FAILED_STATUSES,
+)
+from .watcher import StatusWatcher, WatchKind, list_all_pages
 from .api_client import (
     api_get_username_from_token,
     api_get_available_resources,
@@ -14,15 +29,29 @@ from .api_client import (
     api_delete_finetune_job,
     api_create_finetune_job,
     api_query_finetune_job_logs,
+    api_stream_finetune_job_logs,
+    api_get_available_runtime_frameworks,
+    api_inference_create,
+    api_get_inference_status,
 )
+from .api_client.constants import get_csghub_config
+from .api_client.constants import wrap_error_response
+from .api_client.logs import build_line_filter, iter_sse_lines, line_log_level
+
+FINETUNE_JOB_DONE_STATUSES = FINETUNE_JOB_READY_STATUSES | FINETUNE_JOB_FAILED_STATUSES
+# log lines buffered between the upstream reader and a slow client
+LOG_STREAM_QUEUE_LINES = 1000
 
 logger = logging.getLogger(__name__)
 
 def register_finetune_job_tools(mcp_instance: FastMCP):
     register_finetune_job_list(mcp_instance=mcp_instance)
     register_finetune_job_control(mcp_instance=mcp_instance)
+    register_finetune_job_log_follow(mcp_instance=mcp_instance)
+    register_finetune_job_watch_tools(mcp_instance=mcp_instance)
     register_query_finetune_job_conditions(mcp_instance=mcp_instance)
     register_finetune_job_create(mcp_instance=mcp_instance)
+    register_finetune_to_inference(mcp_instance=mcp_instance)
     register_check_model_dataset(mcp_instance=mcp_instance)
 
 def register_finetune_job_list(mcp_instance: FastMCP):
@@ -30,38 +59,38 @@ def register_finetune_job_list(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="list_finetune_jobs",
         title="List finetune jobs for a user from CSGHub with user access token",
-        description="Retrieve a list of finetune jobs for a specific user from CSGHub. You can control the pagination by specifying the number of items per page and the page number.",
+        description="Retrieve a list of finetune jobs for a specific user from CSGHub. You can control the pagination by specifying the number of items per page and the page number. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes.",
         structured_output=True,
     )
-    def list_finetune_jobs(token: str, per: int = 50, page: int = 1) -> str:
+    def list_finetune_jobs(token: str, per: int = 50, page: int = 1, fields: list[str] = None) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
         
         try:
             username = api_get_username_from_token(token)
         except Exception as e:
             logger.error(f"Error calling user token API: {e}")
-            return f"Error: Failed to get username. {e}"
+            return tool_result({"error_message": f"Failed to get username. {e}"})
 
         logger.info(f"Listing finetune jobs for user: {username}")
         
         try:
-            finetunes = api_list_finetune_jobs(token, username, per, page)
-            return json.dumps(finetunes)
+            finetunes = api_list_finetune_jobs(token, username, per, page, fields=fields)
+            return tool_result(finetunes)
         except Exception as e:
             logger.error(f"Error calling finetune API: {e}")
-            return f"Error: Failed to list finetune services. {e}"
+            return tool_result({"error_message": f"Failed to list finetune services. {e}"})
 
 def register_finetune_job_control(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="get_finetune_job_by_id",
         title="Get Finetune job details and status by job ID",
-        description="Retrieve the finetune job details and status by using a specific ID from CSGHub with user access token. This is useful for checking the status of a deployed finetune job.",
+        description="Retrieve the finetune job details and status by using a specific ID from CSGHub with user access token. This is useful for checking the status of a deployed finetune job. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes.",
         structured_output=True,
     )
-    def get_finetune_job_by_id(token: str, job_id: int) -> str:
-        response_data = api_get_finetune_job(token, job_id)
-        return json.dumps(response_data)
+    def get_finetune_job_by_id(token: str, job_id: int, fields: list[str] = None) -> CallToolResult:
+        response_data = api_get_finetune_job(token, job_id, fields=fields)
+        return tool_result(response_data)
     
     @mcp_instance.tool(
         name="delete_finetune_job_by_id",
@@ -69,19 +98,233 @@ def register_finetune_job_control(mcp_instance: FastMCP):
         description="Delete the finetune jobby using a specific ID from CSGHub with user access token.",
         structured_output=True,
     )
-    def delete_finetune_job_by_id(token: str, job_id: int) -> str:
+    def delete_finetune_job_by_id(token: str, job_id: int) -> CallToolResult:
         response_data = api_delete_finetune_job(token, job_id)
-        return json.dumps(response_data)
+        return tool_result(response_data)
     
     @mcp_instance.tool(
         name="api_query_finetune_job_logs",
         title="Get Finetune job logs by job ID",
-        description="Retrieve the finetune job logs by using a specific ID from CSGHub with user access token. This is useful for checking failure reasion and process details of finetune job. Parameter since can be one of 10mins, 30mins, 1hour, 6hours, 1day, 2days, 1week, and default is all.",
+        description="Retrieve the finetune job logs by using a specific ID from CSGHub with user access token. This is useful for checking failure reasion and process details of finetune job. Parameter since can be one of 10mins, 30mins, 1hour, 6hours, 1day, 2days, 1week, and default is all. The response is bounded by max_lines and max_bytes: by default it returns the first lines after cursor, set tail_lines to get the last N lines instead. Pass next_cursor from a previous response as cursor to continue reading, has_more tells whether more lines are left. Optional grep keeps lines matching a case insensitive regular expression and level keeps lines at or above debug, info, warning, error or critical.",
+        structured_output=True,
+    )
+    def get_finetune_job_logs_by_id(
+        token: str, job_id: int, since = "all",
+        tail_lines: int = 0, cursor: int = 0,
+        max_lines: int = 200, max_bytes: int = 65536,
+        grep: str = "", level: str = "",
+    ) -> CallToolResult:
+        response_data = api_query_finetune_job_logs(
+            token=token, job_id=job_id, since=since,
+            tail_lines=tail_lines, cursor=cursor,
+            max_lines=max_lines, max_bytes=max_bytes,
+            grep=grep, level=level,
+        )
+        return tool_result(response_data)
+
+
+def register_finetune_job_log_follow(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="follow_finetune_job_logs",
+        title="Follow live finetune job logs by job ID",
+        description="Follow the live logs of a finetune job from CSGHub with user access token. New log lines are forwarded to the client as MCP log notifications, and as progress notifications when the client sends a progress token, as soon as they arrive. Following stops when the job finishes, after max_duration seconds, or when the request is cancelled. Parameter since sets how far back to start and can be one of 10mins, 30mins, 1hour, 6hours, 1day, 2days, 1week or all. Optional grep and level filter the forwarded lines like in api_query_finetune_job_logs. Returns the stop reason, the last job status and the last forwarded lines.",
+        structured_output=True,
+    )
+    async def follow_finetune_job_logs(
+        token: str, job_id: int, since: str = "10mins",
+        max_duration: int = 600, grep: str = "", level: str = "",
+        ctx: Context = None,
+    ) -> CallToolResult:
+        try:
+            accept = build_line_filter(grep=grep, level=level)
+        except (re.error, ValueError) as e:
+            return tool_result({"error_message": f"invalid log filter. {e}"})
+
+        job = await asyncio.to_thread(api_get_finetune_job, token, job_id)
+        if not job or "error_message" in job:
+            return tool_result(job or {"error_message": f"finetune job {job_id} not found."})
+
+        response = await asyncio.to_thread(api_stream_finetune_job_logs, token, job_id, since)
+        if response.status_code != 200:
+            response.close()
+            return tool_result(wrap_error_response(response))
+
+        summary = await forward_log_stream(
+            token, job_id, response, accept,
+            status=job["status"], max_duration=max_duration, ctx=ctx,
+        )
+        return tool_result(summary)
+
+
+async def forward_log_stream(token: str, job_id: int, response, accept, status: str,
+                             max_duration: int, ctx: Context = None,
+                             status_interval: float = 15, batch_lines: int = 100) -> dict:
+    """Forward lines from an open upstream log stream until the job is done.
+
+    The blocking reader runs in a daemon thread feeding a bounded asyncio queue.
+    When the queue is full the reader waits, so a slow client holds back the
+    upstream read instead of growing memory. The response is closed on every
+    exit path so the thread and connection go away.
+    """
+    loop = asyncio.get_running_loop()
+    queue = asyncio.Queue(maxsize=LOG_STREAM_QUEUE_LINES)
+    end_of_stream = object()
+    stopped = threading.Event()
+
+    def put(item) -> bool:
+        try:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        except RuntimeError:
+            return False
+        while True:
+            try:
+                future.result(timeout=0.5)
+                return True
+            except concurrent.futures.TimeoutError:
+                if stopped.is_set():
+                    future.cancel()
+                    return False
+            except concurrent.futures.CancelledError:
+                return False
+
+    def pump():
+        try:
+            for line in iter_sse_lines(response.iter_lines(decode_unicode=True)):
+                if not put(line):
+                    return
+        except Exception as e:
+            put(e)
+        finally:
+            put(end_of_stream)
+
+    reader = threading.Thread(target=pump, name=f"finetune-logs-{job_id}", daemon=True)
+    reader.start()
+
+    deadline = loop.time() + max_duration
+    next_status_check = loop.time() + status_interval
+    forwarded = 0
+    last_lines = deque(maxlen=20)
+    stop_reason = "max_duration"
+    error = None
+    try:
+        while True:
+            now = loop.time()
+            if now >= deadline:
+                break
+            if now >= next_status_check:
+                job = await asyncio.to_thread(api_get_finetune_job, token, job_id)
+                status = job.get("status", status) if isinstance(job, dict) else status
+                if str(status).lower() in FINETUNE_JOB_DONE_STATUSES:
+                    stop_reason = "job_finished"
+                    break
+                next_status_check = now + status_interval
+
+            try:
+                item = await asyncio.wait_for(queue.get(), min(deadline, next_status_check) - now)
+            except asyncio.TimeoutError:
+                continue
+
+            batch = []
+            while True:
+                if item is end_of_stream or isinstance(item, Exception):
+                    break
+                if accept(item):
+                    batch.append(item)
+                if len(batch) >= batch_lines or queue.empty():
+                    item = None
+                    break
+                item = queue.get_nowait()
+
+            if batch:
+                forwarded += len(batch)
+                last_lines.extend(batch)
+                if ctx:
+                    levels = [line_log_level(line) for line in batch]
+                    notify_level = max(levels, key=["debug", "info", "warning", "error"].index)
+                    await ctx.log(notify_level, "\n".join(batch), logger_name=f"finetune-job-{job_id}")
+                    await ctx.report_progress(progress=forwarded, message=batch[-1])
+
+            if isinstance(item, Exception):
+                stop_reason = "stream_error"
+                error = str(item)
+                break
+            if item is end_of_stream:
+                stop_reason = "stream_closed"
+                break
+    except asyncio.CancelledError:
+        stop_reason = "cancelled"
+        raise
+    finally:
+        stopped.set()
+        response.close()
+        logger.info(f"stopped following finetune job {job_id} logs: {stop_reason}, {forwarded} lines")
+
+    if stop_reason in ("stream_closed", "stream_error"):
+        job = await asyncio.to_thread(api_get_finetune_job, token, job_id)
+        status = job.get("status", status) if isinstance(job, dict) else status
+        if str(status).lower() in FINETUNE_JOB_DONE_STATUSES:
+            stop_reason = "job_finished"
+
+    summary = {
+        "job_id": job_id,
+        "status": status,
+        "stop_reason": stop_reason,
+        "forwarded_lines": forwarded,
+        "last_lines": "\n".join(last_lines),
+    }
+    if error:
+        summary["error_message"] = error
+    return summary
+
+def register_finetune_job_watch_tools(mcp_instance: FastMCP):
+    watcher = StatusWatcher(mcp_instance)
+    watcher.register_kind(WatchKind(
+        name="finetune",
+        fetch_one=lambda token, params: api_get_finetune_job(token, params["job_id"]),
+        done_statuses=FINETUNE_JOB_DONE_STATUSES,
+        list_all=lambda token: list_all_pages(
+            lambda per, page: api_list_finetune_jobs(token, api_get_username_from_token(token), per, page)
+        ),
+        item_key=lambda item: item["job_id"],
+    ))
+
+    @mcp_instance.resource(
+        "csghub://finetune/{job_id}",
+        name="finetune_job_status",
+        description="Cached status of a watched finetune job, updated by watch_finetune_job_status.",
+        mime_type="application/json",
+    )
+    def finetune_job_status(job_id: str) -> dict:
+        return watcher.read(watcher.uri_for("finetune", job_id))
+
+    @mcp_instance.tool(
+        name="watch_finetune_job_status",
+        title="Watch finetune job status by job ID",
+        description="Watch a finetune job by job ID on CSGHub with user access token. The server polls it once per interval for all sessions together and sends a resources/updated notification for the returned uri whenever it changes, read the uri to get the current status. The calling session is subscribed automatically. Only sessions that watched the uri with their own token can read or subscribe to it. Watching ends after ttl seconds or when unwatch_status is called.",
+        structured_output=True,
+    )
+    async def watch_finetune_job_status(
+        token: str, job_id: int,
+        ttl: int = 3600, ctx: Context = None,
+    ) -> CallToolResult:
+        result = await watcher.watch(
+            "finetune", job_id,
+            {"job_id": job_id},
+            token, session=ctx.session if ctx else None, ttl=ttl,
+        )
+        return tool_result(result)
+
+    @mcp_instance.tool(
+        name="unwatch_status",
+        title="Stop watching a status uri",
+        description="Stop watching the uri returned by watch_finetune_job_status for the calling session. Polling stops when no session watches it anymore.",
         structured_output=True,
     )
-    def get_finetune_job_logs_by_id(token: str, job_id: int, since = "all") -> str:
-        response_data = api_query_finetune_job_logs(token=token, job_id=job_id, since=since)
-        return json.dumps(response_data)
+    def unwatch_status(uri: str, ctx: Context = None) -> CallToolResult:
+        found = watcher.unwatch(uri, ctx.session if ctx else None)
+        if not found:
+            return tool_result({"error_message": f"{uri} is not watched."})
+        return tool_result({"uri": uri, "watching": uri in watcher.entities})
 
 
 def register_query_finetune_job_conditions(mcp_instance: FastMCP):
@@ -91,12 +334,12 @@ def register_query_finetune_job_conditions(mcp_instance: FastMCP):
         description="Retrieve a list of available resources and runtime frameworks that can be used for deploying finetune job on CSGHub. Only using GPU resources.",
         structured_output=True,
     )
-    def query_avai_res_and_frameworks_for_finetune_job(token: str) -> str:
+    def query_avai_res_and_frameworks_for_finetune_job(token: str) -> CallToolResult:
         deploy_type = "6"
         res_json_data = api_get_available_resources(deploy_type)
         run_json_data = api_get_available_runtime_frameworks_by_deploy_type(token, deploy_type)
 
-        return json.dumps({
+        return tool_result({
             "resources_data": res_json_data,
             "runtime_frameworks_data": run_json_data
         })
@@ -114,14 +357,14 @@ def register_finetune_job_create(mcp_instance: FastMCP):
         resource_id: int, runtime_framework_id: int,
         epochs: int = 1, learning_rate: float = 0.0001,
         agent: str = "",
-    ) -> str:
+    ) -> CallToolResult:
         json_data = api_get_model_detail(token, model_id)
         if "model_id" not in json_data:
-            return json.dumps({"error": "Model not found. Please check the model ID."})
+            return tool_result({"error_message": "Model not found. Please check the model ID."})
         
         json_data = api_get_dataset_detail(token, dataset_id)
         if "dataset_id" not in json_data:
-            return json.dumps({"error": "Dataset not found. Please check the dataset ID."})
+            return tool_result({"error_message": "Dataset not found. Please check the dataset ID."})
         
         json_data = api_create_finetune_job(
             token=token,
@@ -133,7 +376,140 @@ def register_finetune_job_create(mcp_instance: FastMCP):
             learning_rate=learning_rate,
             agent=agent,
         )
-        return json.dumps(json_data)
+        return tool_result(json_data)
+
+def register_finetune_to_inference(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="finetune_and_deploy_inference",
+        title="Run a finetune job and deploy the finetuned model as inference service",
+        description="Chain a finetune job and an inference deployment on CSGHub with user access token. The finetune job is submitted like deploy_finetune_job, or an existing one is followed when job_id is given. It is polled with backoff until it finishes, and on success the finetuned model is deployed right away as inference service on inference_resource_id, then polled until running. inference_runtime_framework_id defaults to the first GPU framework available for the finetuned model, inference_cluster_id to the configured cluster. A progress notification is sent for every stage and status change. Returns the job, the deployment with api_access_endpoint when running, and the seconds per stage.",
+        structured_output=True,
+    )
+    async def finetune_and_deploy_inference(
+        token: str,
+        inference_resource_id: int,
+        model_id: str = "", dataset_id: str = "",
+        resource_id: int = 0, runtime_framework_id: int = 0,
+        epochs: int = 1, learning_rate: float = 0.0001,
+        agent: str = "",
+        job_id: int = 0,
+        inference_runtime_framework_id: int = 0,
+        inference_cluster_id: str = "",
+        finetune_timeout: int = 86400,
+        inference_timeout: int = 1800,
+        ctx: Context = None,
+    ) -> CallToolResult:
+        stages = []
+        stage_started = time.monotonic()
+        step = 0
+
+        async def report(message: str):
+            nonlocal step
+            step += 1
+            logger.info(message)
+            if ctx:
+                await ctx.report_progress(progress=step, message=message)
+
+        async def stage_done(stage: str, message: str):
+            nonlocal stage_started
+            now = time.monotonic()
+            stages.append({"stage": stage, "seconds": round(now - stage_started, 1)})
+            stage_started = now
+            await report(message)
+
+        def failed(message: str, **extra) -> CallToolResult:
+            return tool_result({"error_message": message, "stages": stages, **extra})
+
+        if not job_id:
+            if not (model_id and dataset_id and resource_id and runtime_framework_id):
+                return failed("model_id, dataset_id, resource_id and runtime_framework_id are required without job_id.")
+            model_data, dataset_data = await asyncio.gather(
+                asyncio.to_thread(api_get_model_detail, token, model_id),
+                asyncio.to_thread(api_get_dataset_detail, token, dataset_id),
+            )
+            if "model_id" not in model_data:
+                return failed("Model not found. Please check the model ID.")
+            if "dataset_id" not in dataset_data:
+                return failed("Dataset not found. Please check the dataset ID.")
+            created = await asyncio.to_thread(
+                api_create_finetune_job,
+                token=token,
+                model_id=model_id,
+                dataset_id=dataset_id,
+                rf_id=runtime_framework_id,
+                res_id=resource_id,
+                epochs=epochs,
+                learning_rate=learning_rate,
+                agent=agent,
+            )
+            if "job_id" not in created:
+                return failed("Failed to create the finetune job.", detail=created)
+            job_id = created["job_id"]
+            await stage_done("submit", f"submitted finetune job {job_id}")
+
+        async def on_job_change(status: str, data: dict, elapsed: float):
+            await report(f"finetune job {job_id} is {status} after {elapsed:.0f}s")
+
+        job_wait = await wait_for_status(
+            lambda: api_get_finetune_job(token, job_id),
+            FINETUNE_JOB_READY_STATUSES,
+            FINETUNE_JOB_FAILED_STATUSES,
+            timeout=finetune_timeout,
+            on_change=on_job_change,
+        )
+        job = dict(job_wait.pop("data") or {})
+        job.update(job_wait)
+        await stage_done("finetune", f"finetune job {job_id} finished waiting: {job_wait['outcome']}")
+        if job_wait["outcome"] != "ready":
+            return failed(f"finetune job {job_id} did not succeed: {job_wait['outcome']}", finetune_job=job)
+
+        finetuned_model = job.get("finetuned_model_name")
+        if not finetuned_model:
+            return failed(f"finetune job {job_id} succeeded without a finetuned model, its result_url is empty.", finetune_job=job)
+        if not inference_runtime_framework_id:
+            frameworks = await asyncio.to_thread(api_get_available_runtime_frameworks, finetuned_model, "1")
+            if not isinstance(frameworks, list) or not frameworks:
+                return failed(f"No runtime framework is available for {finetuned_model}.", finetune_job=job, runtime_frameworks=frameworks)
+            inference_runtime_framework_id = frameworks[0]["id"]
+        if not inference_cluster_id:
+            inference_cluster_id = get_csghub_config().cluster_ids.split(",")[0].strip()
+
+        deployed = await asyncio.to_thread(
+            api_inference_create,
+            token=token,
+            model_id=finetuned_model,
+            cluster_id=inference_cluster_id,
+            runtime_framework_id=inference_runtime_framework_id,
+            resource_id=inference_resource_id,
+            agent=agent,
+        )
+        if "deploy_id" not in deployed:
+            return failed(f"Failed to deploy {finetuned_model} as inference service.", finetune_job=job, detail=deployed)
+        deploy_id = deployed["deploy_id"]
+        await stage_done("deploy", f"deployed {finetuned_model} as inference {deploy_id}")
+
+        async def on_inference_change(status: str, data: dict, elapsed: float):
+            await report(f"inference {deploy_id} is {status} after {elapsed:.0f}s")
+
+        inference_wait = await wait_for_status(
+            lambda: api_get_inference_status(token, finetuned_model, deploy_id),
+            INFERENCE_READY_STATUSES,
+            INFERENCE_FAILED_STATUSES,
+            timeout=inference_timeout,
+            on_change=on_inference_change,
+        )
+        inference = dict(inference_wait.pop("data") or {})
+        inference.update(inference_wait)
+        await stage_done("inference", f"inference {deploy_id} finished waiting: {inference_wait['outcome']}")
+
+        result = {
+            "finetune_job": job,
+            "inference": {"model_id": finetuned_model, **inference},
+            "stages": stages,
+        }
+        if inference_wait["outcome"] != "ready":
+            result["error_message"] = f"inference {deploy_id} is not running: {inference_wait['outcome']}"
+        return tool_result(result)
 
 def register_check_model_dataset(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -142,9 +518,9 @@ def register_check_model_dataset(mcp_instance: FastMCP):
         description="Retrieve and find model detail and check if model exists in CSGHub by a specific ID from CSGHub.",
         structured_output=True,
     )
-    def check_model_by_model_id(token: str, model_id: str) -> str:
+    def check_model_by_model_id(token: str, model_id: str) -> CallToolResult:
         json_data = api_get_model_detail(token, model_id)
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
     @mcp_instance.tool(
         name="check_dataset_by_dataset_id",
@@ -152,7 +528,7 @@ def register_check_model_dataset(mcp_instance: FastMCP):
         description="Retrieve and find dataset detail and check if dataset exists in CSGHub by a specific ID from CSGHub.",
         structured_output=True,
     )
-    def check_dataset_by_dataset_id(token: str, dataset_id: str) -> str:
+    def check_dataset_by_dataset_id(token: str, dataset_id: str) -> CallToolResult:
         json_data = api_get_dataset_detail(token, dataset_id)
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
@@ -0,0 +1,121 @@
+import json
+
+import pytest
+
+from csghub_mcp_server_finetune.api_client.logs import (
+    MAX_LINE_CHARS,
+    build_line_filter,
+    iter_json_string_lines,
+    iter_sse_lines,
+    read_log_window,
+)
+
+LOG_LINES = [
+    "2024-01-01 INFO start",
+    "2024-01-01 DEBUG loading shards",
+    "2024-01-01 WARNING slow step 分",
+    "2024-01-01 ERROR out of memory",
+    "2024-01-01 INFO done",
+]
+
+
+def _body(data, **envelope) -> bytes:
+    return json.dumps({**envelope, "data": data}, ensure_ascii=False).encode()
+
+
+def _chunks(body: bytes, size: int):
+    return [body[start:start + size] for start in range(0, len(body), size)]
+
+
+def _lines(text: str):
+    body = _body(text)
+    return list(iter_json_string_lines(_chunks(body, 5)))
+
+
+@pytest.mark.parametrize("size", [1, 2, 3, 7, 64, 100000])
+def test_lines_survive_any_chunk_split(size):
+    text = "\n".join(LOG_LINES)
+    lines = list(iter_json_string_lines(_chunks(_body(text, msg="OK"), size)))
+    assert [line for line, _ in lines] == LOG_LINES
+    assert sum(nbytes for _, nbytes in lines) == len(text.encode("utf-8"))
+
+
+def test_escapes_are_decoded():
+    text = 'quote " backslash \\ tab\t\nemoji 😀 and é\nlast'
+    for ensure_ascii in (True, False):
+        body = json.dumps({"data": text}, ensure_ascii=ensure_ascii).encode()
+        lines = list(iter_json_string_lines(_chunks(body, 1)))
+        assert [line for line, _ in lines] == text.split("\n")
+
+
+def test_only_the_top_level_field_is_read():
+    body = json.dumps({
+        "msg": 'a "data": "not this"',
+        "meta": {"data": "nested"},
+        "data": "wanted",
+    }).encode()
+    assert [line for line, _ in iter_json_string_lines(_chunks(body, 3))] == ["wanted"]
+
+
+def test_missing_or_null_logs_yield_nothing():
+    assert list(iter_json_string_lines([b'{"msg": "OK", "data": null}'])) == []
+    assert list(iter_json_string_lines([b'{"msg": "OK"}'])) == []
+
+
+def test_long_lines_are_cut_but_keep_their_size():
+    text = "x" * (MAX_LINE_CHARS + 10) + "\nnext"
+    lines = _lines(text)
+    assert len(lines[0][0]) == MAX_LINE_CHARS
+    assert lines[0][1] == MAX_LINE_CHARS + 11
+    assert lines[1] == ("next", 4)
+
+
+def test_window_reads_the_first_lines_and_resumes_at_the_cursor():
+    accept = build_line_filter()
+    read = []
+    cursor = 0
+    while True:
+        window = read_log_window(_lines("\n".join(LOG_LINES)), accept, cursor=cursor, max_lines=2)
+        read.extend(window["logs"].split("\n") if window["logs"] else [])
+        assert window["lines"] <= 2
+        if not window["has_more"]:
+            break
+        assert window["next_cursor"] > cursor
+        cursor = window["next_cursor"]
+    assert read == LOG_LINES
+
+
+def test_window_start_cursor_points_at_its_first_line():
+    text = "\n".join(LOG_LINES)
+    window = read_log_window(_lines(text), build_line_filter(), cursor=0, max_lines=1)
+    second = read_log_window(_lines(text), build_line_filter(), cursor=window["next_cursor"], max_lines=1)
+    assert second["start_cursor"] == window["next_cursor"] == len(LOG_LINES[0]) + 1
+    assert second["logs"] == LOG_LINES[1]
+
+
+def test_window_respects_max_bytes():
+    window = read_log_window(_lines("\n".join(LOG_LINES)), build_line_filter(), max_bytes=60)
+    assert window["logs"] == "\n".join(LOG_LINES[:2])
+    assert window["has_more"]
+
+
+def test_tail_returns_the_newest_lines():
+    window = read_log_window(_lines("\n".join(LOG_LINES)), build_line_filter(), tail_lines=2)
+    assert window["logs"] == "\n".join(LOG_LINES[-2:])
+    assert window["next_cursor"] == len("\n".join(LOG_LINES).encode("utf-8"))
+    assert not window["has_more"]
+
+
+def test_filters_by_pattern_and_level():
+    lines = _lines("\n".join(LOG_LINES))
+    window = read_log_window(lines, build_line_filter(level="warning"))
+    assert window["logs"] == "\n".join(LOG_LINES[2:4])
+    window = read_log_window(_lines("\n".join(LOG_LINES)), build_line_filter(grep="START|done"))
+    assert window["logs"] == "\n".join([LOG_LINES[0], LOG_LINES[4]])
+    with pytest.raises(ValueError):
+        build_line_filter(level="verbose")
+
+
+def test_sse_frames_keep_only_data():
+    raw = ["event: log", "id: 1", ": keepalive", "data: first", "data:second", "", "plain"]
+    assert list(iter_sse_lines(raw)) == ["first", "second", "plain"]
@@ -1,5 +1,6 @@
 from .user import api_get_username_from_token
 from .inference import api_list_inferences
+from .inference import api_list_all_inferences
 from .inference import api_get_inference_status
 from .inference import api_inference_create
 from .inference import api_inference_stop
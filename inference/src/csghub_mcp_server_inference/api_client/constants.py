@@ -1,6 +1,11 @@
 import os
+import random
 from dataclasses import dataclass
 
+# upstream bodies are cut to this many bytes in logs, and logged for this fraction of records
+LOG_BODY_BYTES = int(os.getenv("CSGHUB_MCP_LOG_BODY_BYTES", "2048"))
+LOG_BODY_SAMPLE_RATE = float(os.getenv("CSGHUB_MCP_LOG_BODY_SAMPLE_RATE", "1.0"))
+
 @dataclass
 class CSGHubConfig:    
     api_endpoint: str = None
@@ -20,3 +25,48 @@ def wrap_error_response(response) -> dict:
         "error_code": response.status_code,
         "error_message": response.text,
     }
+
+
+class ResponseBody:
+    """Upstream response body for a log message, rendered only when the record is.
+
+    The body is cut to LOG_BODY_BYTES and left out of all but
+    LOG_BODY_SAMPLE_RATE of the records, so a burst of upstream errors does not
+    turn into a burst of large log writes.
+    """
+
+    __slots__ = ("_response",)
+
+    def __init__(self, response):
+        self._response = response
+
+    def __str__(self):
+        content = getattr(self._response, "content", None) or b""
+        if LOG_BODY_SAMPLE_RATE < 1 and random.random() >= LOG_BODY_SAMPLE_RATE:
+            return f"<{len(content)} bytes body not sampled>"
+        if len(content) <= LOG_BODY_BYTES:
+            return content.decode("utf-8", errors="replace")
+        return f"{content[:LOG_BODY_BYTES].decode('utf-8', errors='ignore')}... <{len(content)} bytes>"
+
+
+def response_body(response) -> ResponseBody:
+    return ResponseBody(response)
+
+
+def pick_fields(data: dict, fields: list) -> dict:
+    """Extract only the requested attributes from an upstream item.
+
+    Nested attributes are addressed with dots, e.g. "repository.http_clone_url".
+    Missing attributes are returned as None.
+    """
+    res_data = {}
+    for field in fields:
+        value = data
+        for key in field.split("."):
+            if isinstance(value, dict) and key in value:
+                value = value[key]
+            else:
+                value = None
+                break
+        res_data[field] = value
+    return res_data
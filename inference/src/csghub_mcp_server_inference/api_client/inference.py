@@ -2,11 +2,11 @@ import requests
 import logging
 import random
 import json
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, pick_fields, response_body
 
 logger = logging.getLogger(__name__)
 
-def api_list_inferences(token: str, username: str, per: int = 10, page: int = 1) -> dict:
+def api_list_inferences(token: str, username: str, per: int = 10, page: int = 1, fields: list = None) -> dict:
     config = get_csghub_config()
     headers = {"Authorization": f"Bearer {token}"}
     params = {
@@ -17,7 +17,7 @@ def api_list_inferences(token: str, username: str, per: int = 10, page: int = 1)
     url = f"{config.api_endpoint}/api/v1/user/{username}/run/model"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to list user inferences on {url}: {response.text}")
+        logger.error("failed to list user inferences on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     json_data = response.json()
@@ -28,6 +28,9 @@ def api_list_inferences(token: str, username: str, per: int = 10, page: int = 1)
         return res_data
 
     for res in res_list:
+        if fields:
+            res_data.append(pick_fields(res, fields))
+            continue
         res_data.append({
             "deploy_id": res["deploy_id"],
             "deploy_name": res["deploy_name"],
@@ -38,13 +41,40 @@ def api_list_inferences(token: str, username: str, per: int = 10, page: int = 1)
 
     return res_data
 
-def api_get_inference_status(token: str, model_id: str, deploy_id: int) -> dict:
+def api_list_all_inferences(token: str, username: str, per: int = 100, max_pages: int = 50) -> list:
+    """List every inference deployment of a user by walking all pages.
+
+    Args:
+        token: User access token
+        username: Username
+        per: Items per page requested from the API
+        max_pages: Upper bound of pages to walk
+
+    Paging stops at the first empty page, as the API may return fewer items
+    than per on every page when it caps the page size.
+
+    Returns:
+        Inference deployments data, or an error dict from the first failed page
+    """
+    res_data = []
+    for page in range(1, max_pages + 1):
+        page_data = api_list_inferences(token, username, per, page)
+        if not isinstance(page_data, list):
+            return page_data
+        if not page_data:
+            break
+        res_data.extend(page_data)
+
+    return res_data
+
+def api_get_inference_status(token: str, model_id: str, deploy_id: int, fields: list = None) -> dict:
     """Get inference deployment status.
     
     Args:
         token: User access token
         model_id: Model repository path
         deploy_id: Deployment ID
+        fields: Upstream attributes to extract instead of the default summary
         
     Returns:
         Inference status data
@@ -54,7 +84,7 @@ def api_get_inference_status(token: str, model_id: str, deploy_id: int) -> dict:
     url = f"{config.api_endpoint}/api/v1/models/{model_id}/run/{deploy_id}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get inferences status on {url}: {response.text}")
+        logger.error("failed to get inferences status on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -64,6 +94,8 @@ def api_get_inference_status(token: str, model_id: str, deploy_id: int) -> dict:
     
     if json_data and "data" in json_data:
         job_data = json_data["data"]
+        if fields:
+            return pick_fields(job_data, fields)
         status = job_data["status"]
 
         res_data = {
@@ -121,7 +153,7 @@ def api_inference_create(
     }
     response = requests.post(url, headers=headers, json=json_data)
     if response.status_code != 200:
-        logger.error(f"failed to create model inference on {url}: {response.text}")
+        logger.error("failed to create model inference on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -140,7 +172,7 @@ def api_inference_stop(token: str, model_id: str, deploy_id: int):
     url = f"{config.api_endpoint}/api/v1/models/{model_id}/run/{deploy_id}/stop"
     response = requests.put(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to stop model inference on {url}: {response.text}")
+        logger.error("failed to stop model inference on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -152,7 +184,7 @@ def api_inference_start(token: str, model_id: str, deploy_id: int):
     url = f"{config.api_endpoint}/api/v1/models/{model_id}/run/{deploy_id}/start"
     response = requests.put(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to start model inference on {url}: {response.text}")
+        logger.error("failed to start model inference on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -164,7 +196,7 @@ def api_inference_delete(token: str, model_id: str, deploy_id: int):
     url = f"{config.api_endpoint}/api/v1/models/{model_id}/run/{deploy_id}"
     response = requests.delete(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to delete model inference on {url}: {response.text}")
+        logger.error("failed to delete model inference on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -1,6 +1,6 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, response_body
 
 logger = logging.getLogger(__name__)
 
@@ -10,7 +10,7 @@ def api_get_model_detail(model_id: str) -> dict:
     url = f"{config.api_endpoint}/api/v1/models/{model_id}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get model detail on {url}: {response.text}")
+        logger.error("failed to get model detail on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     response.raise_for_status()
@@ -29,7 +29,7 @@ def api_get_model_quantizations_list(model_id: str) -> dict:
     url = f"{config.api_endpoint}/api/v1/models/{model_id}/quantizations"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get model quantizations on {url}: {response.text}")
+        logger.error("failed to get model quantizations on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     response.raise_for_status()
@@ -1,9 +1,12 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, response_body
 
 logger = logging.getLogger(__name__)
 
+# minutes in each price unit type, prices of other units have no hourly_price
+PRICE_UNIT_MINUTES = {"minute": 1, "hour": 60, "day": 1440, "week": 10080, "month": 43200}
+
 def api_get_available_resources(token: str, deploy_type: str) -> dict:
     clusters = get_clusters(token)
     config = get_csghub_config()
@@ -24,7 +27,7 @@ def get_clusters(token: str) -> dict:
     }
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to list clusters on {url}: {response.text}")
+        logger.error("failed to list clusters on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -50,7 +53,7 @@ def api_get_available_resources_by_cluster(cluster_id: str, deploy_type: str, cl
     url = f"{config.api_endpoint}/api/v1/space_resources?cluster_id={cluster_id}&deploy_type={deploy_type}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get avai resources on {url}: {response.text}")
+        logger.error("failed to get avai resources on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     response.raise_for_status()
@@ -70,14 +73,18 @@ def api_get_available_resources_by_cluster(cluster_id: str, deploy_type: str, cl
             continue
 
         price = "free"
+        hourly_price = 0.0
         priceVal = res["price"] if "price" in res else 0.0
         priceUnitVal = res["price_unit"] if "price_unit" in res else 0.0
         priceUnitTypeVal = res["price_unit_type"] if "price_unit_type" in res else "minute"
         if priceVal > 0 and priceUnitVal > 0:
             if priceUnitTypeVal.lower() == "minute":
                 price = f"￥ {priceVal / 100} / {priceUnitVal/60} hour"
+                hourly_price = (priceVal / 100) / (priceUnitVal / 60)
             else:
                 price = f"￥ {priceVal / 100} / {priceUnitVal} {priceUnitTypeVal}"
+                unit_minutes = PRICE_UNIT_MINUTES.get(priceUnitTypeVal.lower().rstrip("s"))
+                hourly_price = (priceVal / 100) / (priceUnitVal * unit_minutes / 60) if unit_minutes else None
 
         cluster_name = clusters[cluster_id] if clusters[cluster_id] else "unknown"
         res_data.append({
@@ -86,7 +93,8 @@ def api_get_available_resources_by_cluster(cluster_id: str, deploy_type: str, cl
             "id": res["id"],
             "type": res["type"],
             "name": res["name"],
-            "price": f"{price}"
+            "price": f"{price}",
+            "hourly_price": hourly_price,
         })
 
     return res_data
\ No newline at end of file
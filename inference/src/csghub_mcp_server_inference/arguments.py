@@ -1,5 +1,7 @@
 import argparse
 from importlib.metadata import version, PackageNotFoundError
+from .logs import LOG_FORMATS
+from .tracing import TRACE_EXPORTERS
 
 def get_version_from_package():
     try:
@@ -43,6 +45,22 @@ def setup_argparse() -> argparse.ArgumentParser:
         help='Logging level (default: INFO)'
     )
     
+    parser.add_argument(
+        '--log-format',
+        type=str,
+        choices=LOG_FORMATS,
+        default=None,
+        help='Log line format, json writes one object per line (default: CSGHUB_MCP_LOG_FORMAT or json)'
+    )
+
+    parser.add_argument(
+        '--trace-exporter',
+        type=str,
+        choices=TRACE_EXPORTERS,
+        default=None,
+        help='OpenTelemetry span exporter, otlp reads the OTEL_EXPORTER_OTLP_* variables (default: CSGHUB_MCP_TRACE_EXPORTER or none)'
+    )
+
     parser.add_argument(
         '--version',
         action='version',
@@ -0,0 +1,184 @@
+import asyncio
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+import requests
+from mcp.server.fastmcp import FastMCP
+from .api_client.constants import get_csghub_config
+
+logger = logging.getLogger(__name__)
+
+PROBE_PATH = os.getenv("CSGHUB_MCP_PROBE_PATH", "/api/v1/models?per=1&page=1")
+PROBE_INTERVAL = float(os.getenv("CSGHUB_MCP_PROBE_INTERVAL", "15"))
+PROBE_TIMEOUT = float(os.getenv("CSGHUB_MCP_PROBE_TIMEOUT", "5"))
+PROBE_WINDOW = int(os.getenv("CSGHUB_MCP_PROBE_WINDOW", "20"))
+# readiness fails above this share of failed probes in the window
+READY_MAX_ERROR_RATE = float(os.getenv("CSGHUB_MCP_READY_MAX_ERROR_RATE", "0.5"))
+
+_started = time.time()
+_in_flight = 0
+_in_flight_lock = threading.Lock()
+_caches = {}
+
+
+@contextmanager
+def track_in_flight():
+    global _in_flight
+    with _in_flight_lock:
+        _in_flight += 1
+    try:
+        yield
+    finally:
+        with _in_flight_lock:
+            _in_flight -= 1
+
+
+def watch_cache(name: str, cache):
+    """Report a cache in readiness, cache.stats() returns a dict with entries."""
+    _caches[name] = cache
+
+
+def _percentile(values: list, fraction: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class UpstreamProbe:
+    """Probe CSGHub from a daemon thread and keep the last window results.
+
+    Any answer below 500 counts as reachable. The upstream is ready once a
+    probe has finished, the last success is recent and the share of failed
+    probes in the window stays within READY_MAX_ERROR_RATE.
+    """
+
+    def __init__(self, interval: float = PROBE_INTERVAL, timeout: float = PROBE_TIMEOUT, window: int = PROBE_WINDOW):
+        self.interval = interval
+        self.timeout = timeout
+        self.results = deque(maxlen=window)
+        self.last_success = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def probe(self) -> dict:
+        url = f"{get_csghub_config().api_endpoint}{PROBE_PATH}"
+        started = time.perf_counter()
+        try:
+            response = requests.get(url, timeout=self.timeout)
+            ok = response.status_code < 500
+            detail = response.status_code
+        except requests.RequestException as e:
+            ok = False
+            detail = type(e).__name__
+        result = {"time": time.time(), "ok": ok, "latency": time.perf_counter() - started, "detail": detail}
+        with self._lock:
+            self.results.append(result)
+            if ok:
+                self.last_success = result["time"]
+        if not ok:
+            logger.warning("upstream probe of %s failed: %s", url, detail)
+        return result
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                self.probe()
+            except Exception as e:
+                logger.error("upstream probe crashed: %s", e)
+            self._stop.wait(self.interval)
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="upstream-probe", daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def report(self) -> dict:
+        with self._lock:
+            results = list(self.results)
+            last_success = self.last_success
+        if not results:
+            return {"ready": False, "reason": "no upstream probe finished yet", "probes": 0}
+        latencies = [result["latency"] for result in results if result["ok"]]
+        error_rate = 1 - len(latencies) / len(results)
+        stale_after = 3 * self.interval + self.timeout
+        res_data = {
+            "probes": len(results),
+            "error_rate": round(error_rate, 3),
+            "latency_p50": round(_percentile(latencies, 0.5), 4) if latencies else None,
+            "latency_p95": round(_percentile(latencies, 0.95), 4) if latencies else None,
+            "last_probe": results[-1],
+            "last_success_age": round(time.time() - last_success, 1) if last_success else None,
+        }
+        if error_rate > READY_MAX_ERROR_RATE:
+            res_data.update(ready=False, reason=f"upstream error rate {error_rate:.0%} above {READY_MAX_ERROR_RATE:.0%}")
+        elif last_success is None or time.time() - last_success > stale_after:
+            res_data.update(ready=False, reason=f"no successful upstream probe in {stale_after:.0f}s")
+        else:
+            res_data["ready"] = True
+        return res_data
+
+
+upstream_probe = UpstreamProbe()
+
+
+def pool_report() -> dict:
+    """In flight tool calls and the event loop's default executor, the pool behind asyncio.to_thread."""
+    res_data = {"in_flight_tool_calls": _in_flight}
+    try:
+        executor = getattr(asyncio.get_running_loop(), "_default_executor", None)
+    except RuntimeError:
+        executor = None
+    if executor is not None and hasattr(executor, "_max_workers"):
+        queued = executor._work_queue.qsize()
+        res_data["executor"] = {
+            "max_workers": executor._max_workers,
+            "threads": len(executor._threads),
+            "queued": queued,
+            "saturated": queued > 0,
+        }
+    return res_data
+
+
+def cache_report() -> dict:
+    res_data = {}
+    for name, cache in _caches.items():
+        stats = cache.stats()
+        res_data[name] = {**stats, "warm": stats.get("entries", 0) > 0}
+    return res_data
+
+
+def readiness() -> dict:
+    upstream = upstream_probe.report()
+    return {
+        "status": "ready" if upstream["ready"] else "not ready",
+        "upstream": upstream,
+        "pools": pool_report(),
+        "caches": cache_report(),
+    }
+
+
+def register_health_routes(mcp_instance: FastMCP):
+    """Serve /healthz and /readyz on the sse and streamable-http apps.
+
+    /healthz answers while the process serves requests. /readyz answers 503
+    while the upstream probe reports CSGHub unreachable, so a load balancer
+    drains the instance.
+    """
+    from starlette.requests import Request
+    from starlette.responses import JSONResponse
+
+    @mcp_instance.custom_route("/healthz", methods=["GET"], include_in_schema=False)
+    async def healthz(request: Request) -> JSONResponse:
+        return JSONResponse({"status": "ok", "uptime_seconds": round(time.time() - _started, 1)})
+
+    @mcp_instance.custom_route("/readyz", methods=["GET"], include_in_schema=False)
+    async def readyz(request: Request) -> JSONResponse:
+        report = readiness()
+        return JSONResponse(report, status_code=200 if report["upstream"]["ready"] else 503)
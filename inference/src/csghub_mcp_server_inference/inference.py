@@ -1,11 +1,18 @@
-import json
+import asyncio
+import fnmatch
 import logging
 import os
-from mcp.server.fastmcp import FastMCP
+import time
+from mcp.server.fastmcp import FastMCP, Context
+from mcp.types import CallToolResult
+from .results import tool_result
+from .watcher import StatusWatcher, WatchKind
+from .polling import wait_for_status, INFERENCE_READY_STATUSES, INFERENCE_FAILED_STATUSES
 from .api_client import (
     api_get_username_from_token,
     api_get_inference_status,
     api_list_inferences,
+    api_list_all_inferences,
     api_inference_create,
     api_get_model_detail,
     api_get_available_resources,
@@ -21,48 +28,88 @@ logger = logging.getLogger(__name__)
 def register_inference_tools(mcp_instance: FastMCP):
     register_inference_list(mcp_instance=mcp_instance)
     register_inference_query(mcp_instance=mcp_instance)
+    register_inference_wait(mcp_instance=mcp_instance)
     register_check_model(mcp_instance=mcp_instance)
     register_deploy_model_inference(mcp_instance=mcp_instance)
     register_query_inference_conditions(mcp_instance=mcp_instance)
     register_inference_control_tools(mcp_instance=mcp_instance)
-    
+    register_inference_fleet_tools(mcp_instance=mcp_instance)
+    register_inference_watch_tools(mcp_instance=mcp_instance)
+    register_inference_pipeline_tools(mcp_instance=mcp_instance)
+
 def register_inference_list(mcp_instance: FastMCP):
 
     @mcp_instance.tool(
         name="list_inference_services",
         title="List inference services for a user from CSGHub",
-        description="Retrieve a list of inference services for a specific user from CSGHub. You can control the pagination by specifying the number of items per page and the page number.",
+        description="Retrieve a list of inference services for a specific user from CSGHub. You can control the pagination by specifying the number of items per page and the page number. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes.",
         structured_output=True,
     )
-    def list_inference(token: str, per: int = 50, page: int = 1) -> str:
+    def list_inference(token: str, per: int = 50, page: int = 1, fields: list[str] = None) -> CallToolResult:
         if not token:
-            return "error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
         
         try:
             username = api_get_username_from_token(token)
         except Exception as e:
             logger.error(f"error calling user token API: {e}")
-            return f"error: Failed to get username. {e}"
+            return tool_result({"error_message": f"Failed to get username. {e}"})
 
         logger.info(f"Listing inference services for user: {username}")
         
         try:
-            inferences = api_list_inferences(token, username, per, page)
-            return json.dumps(inferences)
+            inferences = api_list_inferences(token, username, per, page, fields=fields)
+            return tool_result(inferences)
         except Exception as e:
             logger.error(f"error calling inference API: {e}")
-            return f"error: Failed to list inference services. {e}"
+            return tool_result({"error_message": f"Failed to list inference services. {e}"})
 
 def register_inference_query(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="get_inference_status_by_deploy_id",
         title="Get Inference deployment details and status by model ID and deploy ID",
-        description="Retrieve the inference deployment details and status by using model ID and a specific deploy ID from CSGHub with user access token. This is useful for checking the status of a deployed model's inference service.",
+        description="Retrieve the inference deployment details and status by using model ID and a specific deploy ID from CSGHub with user access token. This is useful for checking the status of a deployed model's inference service. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes.",
+        structured_output=True,
+    )
+    def get_inference_status_by_deploy_id(token: str, model_id: str, deploy_id: int, fields: list[str] = None) -> CallToolResult:
+        json_data = api_get_inference_status(token, model_id, deploy_id, fields=fields)
+        return tool_result(json_data)
+
+def register_inference_wait(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="wait_for_inference_ready",
+        title="Wait until an inference deployment is running by model ID and deploy ID",
+        description="Wait server side until the inference deployment of model ID and deploy ID on CSGHub is running, has failed, or timeout seconds have passed, instead of polling get_inference_status_by_deploy_id repeatedly. The status is polled with exponential backoff and jitter, and every status change is sent as a progress notification. Returns the final status with api_access_endpoint and test_command when running, the outcome (ready, failed, timeout or error) and the seconds spent in each status.",
         structured_output=True,
     )
-    def get_inference_status_by_deploy_id(token: str, model_id: str, deploy_id: int) -> str:
-        json_data = api_get_inference_status(token, model_id, deploy_id)
-        return json.dumps(json_data)
+    async def wait_for_inference_ready(
+        token: str, model_id: str, deploy_id: int,
+        timeout: int = 900, ctx: Context = None,
+    ) -> CallToolResult:
+        result = await wait_inference_ready(token, model_id, deploy_id, timeout=timeout, ctx=ctx)
+        return tool_result(result)
+
+async def wait_inference_ready(token: str, model_id: str, deploy_id: int,
+                               timeout: int = 900, ctx: Context = None, report=None) -> dict:
+    """Wait for a deployment, status changes go to report(message) when given, else to ctx progress."""
+    async def on_change(status: str, data: dict, elapsed: float):
+        logger.info(f"inference {model_id}/{deploy_id} is {status} after {elapsed:.0f}s")
+        message = f"deployment {deploy_id} is {status}"
+        if report:
+            await report(message)
+        elif ctx:
+            await ctx.report_progress(progress=elapsed, total=timeout, message=message)
+
+    waited = await wait_for_status(
+        lambda: api_get_inference_status(token, model_id, deploy_id),
+        INFERENCE_READY_STATUSES,
+        INFERENCE_FAILED_STATUSES,
+        timeout=timeout,
+        on_change=on_change,
+    )
+    result = dict(waited.pop("data") or {})
+    result.update(waited)
+    return result
 
 def register_check_model(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -71,9 +118,9 @@ def register_check_model(mcp_instance: FastMCP):
         description="Retrieve and find model detail and check if model exists in CSGHub by a specific deploy ID from CSGHub.",
         structured_output=True,
     )
-    def check_model_by_model_id(model_id: str) -> str:
+    def check_model_by_model_id(model_id: str) -> CallToolResult:
         json_data = api_get_model_detail(model_id)
-        return json.dumps(json_data)
+        return tool_result(json_data)
     
 def register_deploy_model_inference(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -90,7 +137,7 @@ def register_deploy_model_inference(mcp_instance: FastMCP):
         runtime_framework_id: int,
         gguf_quantization_name: str = "",
         agent: str = "",
-    ) -> str:
+    ) -> CallToolResult:
         json_data = api_inference_create(
             token=token,
             model_id=model_id,
@@ -100,7 +147,7 @@ def register_deploy_model_inference(mcp_instance: FastMCP):
             entrypoint=gguf_quantization_name,
             agent=agent,
         )
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
 def register_query_inference_conditions(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -109,12 +156,12 @@ def register_query_inference_conditions(mcp_instance: FastMCP):
         description="Retrieve a list of available resources and runtime frameworks that can be used for deploying model as inference on CSGHub. Retrieve gguf quantization list for model id of GGUF model.",
         structured_output=True,
     )
-    def query_available_resources_and_runtime_frameworks_for_inference(token: str, model_id: str) -> str:
+    def query_available_resources_and_runtime_frameworks_for_inference(token: str, model_id: str) -> CallToolResult:
         deploy_type = "1"
         res_json_data = api_get_available_resources(token, deploy_type)
         run_json_data = api_get_available_runtime_frameworks(model_id, deploy_type)
         gguf_json_data = api_get_model_quantizations_list(model_id)
-        return json.dumps({
+        return tool_result({
             "resources_data": res_json_data,
             "runtime_frameworks_data": run_json_data,
             "gguf_quantizations_data": gguf_json_data,
@@ -127,9 +174,9 @@ def register_inference_control_tools(mcp_instance: FastMCP):
         description="Stop an running inference service by model id and deploy id on CSGHub with user access token. model id and deploy id are required to stop the inference service.",
         structured_output=True,
     )
-    def stop_inference_by_modelid_and_deployid(token: str, model_id: str, deploy_id: int) -> str:
+    def stop_inference_by_modelid_and_deployid(token: str, model_id: str, deploy_id: int) -> CallToolResult:
         res_json_data = api_inference_stop(token, model_id, deploy_id)
-        return json.dumps(res_json_data)
+        return tool_result(res_json_data)
 
     @mcp_instance.tool(
         name="start_inference_by_modelid_and_deployid",
@@ -137,9 +184,9 @@ def register_inference_control_tools(mcp_instance: FastMCP):
         description="Start an stopped inference service by model id and deploy id on CSGHub with user access token. model id and deploy id are required to start the inference service.",
         structured_output=True,
     )
-    def start_inference_by_modelid_and_deployid(token: str, model_id: str, deploy_id: int) -> str:
+    def start_inference_by_modelid_and_deployid(token: str, model_id: str, deploy_id: int) -> CallToolResult:
         res_json_data = api_inference_start(token, model_id, deploy_id)
-        return json.dumps(res_json_data)
+        return tool_result(res_json_data)
     
     @mcp_instance.tool(
         name="delete_inference_by_modelid_and_deployid",
@@ -147,7 +194,342 @@ def register_inference_control_tools(mcp_instance: FastMCP):
         description="Delete an inference service by model id and deploy id on CSGHub with user access token. model id and deploy id are required to delete the inference service. It's good idea to stop the inference service before deleting it.",
         structured_output=True,
     )
-    def delete_inference_by_modelid_and_deployid(token: str, model_id: str, deploy_id: int) -> str:
+    def delete_inference_by_modelid_and_deployid(token: str, model_id: str, deploy_id: int) -> CallToolResult:
         res_json_data = api_inference_delete(token, model_id, deploy_id)
-        return json.dumps(res_json_data)
+        return tool_result(res_json_data)
+
+MAX_FLEET_CONCURRENCY = 16
+
+FLEET_ACTIONS = {
+    "start": api_inference_start,
+    "stop": api_inference_stop,
+    "delete": api_inference_delete,
+}
+
+def select_fleet_deployments(
+    inferences: list,
+    status: str = "",
+    model_pattern: str = "",
+    runtime_framework: str = "",
+) -> list:
+    statuses = {s.strip().lower() for s in status.split(",") if s.strip()}
+    selected = []
+    for inference in inferences:
+        if statuses and str(inference["status"]).lower() not in statuses:
+            continue
+        if model_pattern and not fnmatch.fnmatch(inference["model_id"].lower(), model_pattern.lower()):
+            continue
+        if runtime_framework and runtime_framework.lower() not in str(inference["runtime_framework"]).lower():
+            continue
+        selected.append(inference)
+    return selected
+
+async def run_fleet_action(
+    token: str,
+    action: str,
+    deployments: list,
+    max_concurrency: int,
+    ctx: Context,
+) -> list:
+    action_func = FLEET_ACTIONS[action]
+    semaphore = asyncio.Semaphore(min(max(1, max_concurrency), MAX_FLEET_CONCURRENCY))
+    total = len(deployments)
+    done = 0
+
+    async def handle(deployment: dict) -> dict:
+        nonlocal done
+        model_id = deployment["model_id"]
+        deploy_id = deployment["deploy_id"]
+        result = {
+            "deploy_id": deploy_id,
+            "deploy_name": deployment["deploy_name"],
+            "model_id": model_id,
+            "previous_status": deployment["status"],
+        }
+        async with semaphore:
+            try:
+                action_resp = await asyncio.to_thread(action_func, token, model_id, deploy_id)
+            except Exception as e:
+                logger.error(f"error calling inference {action} API for {model_id}/{deploy_id}: {e}")
+                action_resp = {"error_message": str(e)}
+
+            if isinstance(action_resp, dict) and ("error_code" in action_resp or "error_message" in action_resp):
+                result["result"] = "failed"
+                result["error"] = action_resp.get("error_message", "")
+                result["final_status"] = deployment["status"]
+            elif action == "delete":
+                result["result"] = "ok"
+                result["final_status"] = "deleted"
+            else:
+                result["result"] = "ok"
+                try:
+                    status_resp = await asyncio.to_thread(api_get_inference_status, token, model_id, deploy_id)
+                    result["final_status"] = status_resp.get("status", "unknown")
+                except Exception as e:
+                    logger.error(f"error calling inference status API for {model_id}/{deploy_id}: {e}")
+                    result["final_status"] = "unknown"
+
+        done += 1
+        if ctx:
+            await ctx.report_progress(
+                progress=done,
+                total=total,
+                message=f"{action} {model_id}/{deploy_id}: {result['result']} ({done}/{total})",
+            )
+        return result
+
+    return await asyncio.gather(*(handle(d) for d in deployments))
+
+def register_inference_fleet_tools(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="control_inference_fleet",
+        title="Start, stop or delete many inference services at once with user access token",
+        description="Select inference services of the user on CSGHub by status, model pattern and runtime framework, then start, stop or delete all of them concurrently. Parameter action must be one of start, stop, delete. Parameter status is a comma separated list such as 'Running,Deploying'. Parameter model_pattern is a glob on model id such as 'Qwen/*'. Parameter runtime_framework matches part of the runtime framework name such as 'vllm'. Empty filters match everything, so delete without any filter is refused unless confirm_all is true. Set dry_run to true to only list the selected services. max_concurrency services are handled at the same time, at most 16. Progress is reported per service and the final status of each service is returned.",
+        structured_output=True,
+    )
+    async def control_inference_fleet(
+        token: str,
+        action: str,
+        status: str = "",
+        model_pattern: str = "",
+        runtime_framework: str = "",
+        dry_run: bool = False,
+        max_concurrency: int = 8,
+        confirm_all: bool = False,
+        ctx: Context = None,
+    ) -> CallToolResult:
+        if not token:
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
+
+        action = action.strip().lower()
+        if action not in FLEET_ACTIONS:
+            return tool_result({"error_message": f"action must be one of {', '.join(FLEET_ACTIONS)}."})
+        if action == "delete" and not dry_run and not confirm_all \
+                and not any(f.strip() for f in status.split(",") + [model_pattern, runtime_framework]):
+            return tool_result({"error_message": "delete without status, model_pattern or runtime_framework would delete every inference service, set confirm_all to true to do so."})
+
+        try:
+            username = await asyncio.to_thread(api_get_username_from_token, token)
+            inferences = await asyncio.to_thread(api_list_all_inferences, token, username)
+        except Exception as e:
+            logger.error(f"error calling inference API: {e}")
+            return tool_result({"error_message": f"Failed to list inference services. {e}"})
+
+        if not isinstance(inferences, list):
+            return tool_result(inferences)
+
+        deployments = select_fleet_deployments(
+            inferences,
+            status=status,
+            model_pattern=model_pattern,
+            runtime_framework=runtime_framework,
+        )
+        logger.info(f"fleet {action} for user {username} selected {len(deployments)} of {len(inferences)} inference services")
+
+        if dry_run or len(deployments) < 1:
+            return tool_result({
+                "action": action,
+                "dry_run": dry_run,
+                "matched": len(deployments),
+                "deployments": deployments,
+            })
+
+        results = await run_fleet_action(token, action, deployments, max_concurrency, ctx)
+        succeeded = sum(1 for r in results if r["result"] == "ok")
+        return tool_result({
+            "action": action,
+            "dry_run": dry_run,
+            "matched": len(deployments),
+            "succeeded": succeeded,
+            "failed": len(results) - succeeded,
+            "deployments": results,
+        })
+
+def register_inference_watch_tools(mcp_instance: FastMCP):
+    watcher = StatusWatcher(mcp_instance)
+    watcher.register_kind(WatchKind(
+        name="inference",
+        fetch_one=lambda token, params: api_get_inference_status(token, params["model_id"], params["deploy_id"]),
+        list_all=lambda token: api_list_all_inferences(token, api_get_username_from_token(token)),
+        item_key=lambda item: item["deploy_id"],
+    ))
+
+    @mcp_instance.resource(
+        "csghub://inference/{deploy_id}",
+        name="inference_status",
+        description="Cached status of a watched inference deployment, updated by watch_inference_status.",
+        mime_type="application/json",
+    )
+    def inference_status(deploy_id: str) -> dict:
+        return watcher.read(watcher.uri_for("inference", deploy_id))
+
+    @mcp_instance.tool(
+        name="watch_inference_status",
+        title="Watch inference deployment status by model ID and deploy ID",
+        description="Watch an inference deployment of model ID and deploy ID on CSGHub with user access token. The server polls it once per interval for all sessions together and sends a resources/updated notification for the returned uri whenever it changes, read the uri to get the current status. The calling session is subscribed automatically. Only sessions that watched the uri with their own token can read or subscribe to it. Watching ends after ttl seconds or when unwatch_status is called.",
+        structured_output=True,
+    )
+    async def watch_inference_status(
+        token: str, model_id: str, deploy_id: int,
+        ttl: int = 3600, ctx: Context = None,
+    ) -> CallToolResult:
+        result = await watcher.watch(
+            "inference", deploy_id,
+            {"model_id": model_id, "deploy_id": deploy_id},
+            token, session=ctx.session if ctx else None, ttl=ttl,
+        )
+        return tool_result(result)
+
+    @mcp_instance.tool(
+        name="unwatch_status",
+        title="Stop watching a status uri",
+        description="Stop watching the uri returned by watch_inference_status for the calling session. Polling stops when no session watches it anymore.",
+        structured_output=True,
+    )
+    def unwatch_status(uri: str, ctx: Context = None) -> CallToolResult:
+        found = watcher.unwatch(uri, ctx.session if ctx else None)
+        if not found:
+            return tool_result({"error_message": f"{uri} is not watched."})
+        return tool_result({"uri": uri, "watching": uri in watcher.entities})
+
+RESOURCE_POLICIES = ["cheapest_gpu", "cheapest"]
+PREFERRED_GGUF_QUANTIZATIONS = ["Q4_K_M", "Q5_K_M", "Q4_0", "Q8_0"]
+
+def select_resource(resources: list, policy: str = "cheapest_gpu", resource_id: int = 0) -> dict | None:
+    """Pick a resource from the per-cluster lists of api_get_available_resources.
+
+    An explicit resource_id wins, otherwise the resource with the lowest hourly
+    price is taken, restricted to GPU resources for the cheapest_gpu policy.
+    Resources priced in other units sort last.
+    """
+    candidates = [res for cluster in resources if isinstance(cluster, list) for res in cluster]
+    if resource_id:
+        return next((res for res in candidates if res["id"] == resource_id), None)
+    if policy == "cheapest_gpu":
+        candidates = [res for res in candidates if "gpu" in str(res["type"]).lower()]
+    if not candidates:
+        return None
+    return min(candidates, key=lambda res: float("inf") if res["hourly_price"] is None else res["hourly_price"])
+
+def select_runtime_framework(frameworks: list, name: str = "", compute_type: str = "") -> dict | None:
+    """Pick a runtime framework by name (case insensitive substring), else the first one for compute_type."""
+    if name:
+        return next((rf for rf in frameworks if name.lower() in rf["frame_name"].lower()), None)
+    matched = [rf for rf in frameworks if compute_type and rf["compute_type"].lower() in compute_type.lower()]
+    return (matched or frameworks or [None])[0]
+
+def select_gguf_quantization(quantizations: list, name: str = "") -> str | None:
+    """Pick a GGUF quantization, "" for models without any."""
+    if not quantizations:
+        return "" if not name else None
+    if name:
+        return name if name in quantizations else None
+    for preferred in PREFERRED_GGUF_QUANTIZATIONS:
+        for quantization in quantizations:
+            if preferred.lower() in quantization.lower():
+                return quantization
+    return quantizations[0]
+
+def register_inference_pipeline_tools(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="deploy_inference_and_wait",
+        title="Deploy model as inference service and wait until it is running",
+        description="Deploy a model as inference service on CSGHub with user access token in one call: validate the model, pick resource and runtime framework, create the deployment and wait until it is running. resource_policy is cheapest_gpu (default) or cheapest, resource_id overrides it. runtime_framework picks a framework by name such as vllm or llama.cpp, otherwise the first one matching the resource compute type is used. gguf_quantization_name picks the quantization of GGUF models, otherwise a Q4_K_M like one is chosen. A progress notification is sent per stage. Returns the deployment with api_access_endpoint and test_command when running, the chosen resource and framework, and the seconds per stage.",
+        structured_output=True,
+    )
+    async def deploy_inference_and_wait(
+        token: str,
+        model_id: str,
+        resource_policy: str = "cheapest_gpu",
+        resource_id: int = 0,
+        runtime_framework: str = "",
+        gguf_quantization_name: str = "",
+        agent: str = "",
+        timeout: int = 1800,
+        ctx: Context = None,
+    ) -> CallToolResult:
+        if not token:
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
+        if resource_policy not in RESOURCE_POLICIES:
+            return tool_result({"error_message": f"resource_policy must be one of {', '.join(RESOURCE_POLICIES)}."})
+
+        stages = []
+        stage_started = time.monotonic()
+        step = 0
+
+        async def report(message: str):
+            nonlocal step
+            step += 1
+            logger.info(f"deploy {model_id}: {message}")
+            if ctx:
+                await ctx.report_progress(progress=step, message=message)
+
+        async def stage_done(stage: str, message: str):
+            nonlocal stage_started
+            now = time.monotonic()
+            stages.append({"stage": stage, "seconds": round(now - stage_started, 1)})
+            stage_started = now
+            await report(message)
+
+        def failed(message: str, **extra) -> CallToolResult:
+            return tool_result({"error_message": message, "model_id": model_id, "stages": stages, **extra})
+
+        # the model check and the deploy option lookups are independent
+        lookups = await asyncio.gather(
+            asyncio.to_thread(api_get_model_detail, model_id),
+            asyncio.to_thread(api_get_available_resources, token, "1"),
+            asyncio.to_thread(api_get_available_runtime_frameworks, model_id, "1"),
+            asyncio.to_thread(api_get_model_quantizations_list, model_id),
+            return_exceptions=True,
+        )
+        for lookup, res in zip(("model detail", "resources", "runtime frameworks", "quantizations"), lookups):
+            if isinstance(res, Exception):
+                logger.error(f"error looking up {lookup} to deploy {model_id}: {res}")
+                return failed(f"Failed to look up {lookup}: {res}")
+        model_data, resources, frameworks, quantizations = lookups
+        if "model_id" not in model_data:
+            return failed("Model not found. Please check the model ID.", detail=model_data)
+        await stage_done("validate", f"model {model_id} found")
+
+        resource = select_resource(resources, resource_policy, resource_id)
+        if resource is None:
+            return failed("No matching resource is available.", resources=resources)
+        framework = select_runtime_framework(
+            frameworks if isinstance(frameworks, list) else [], runtime_framework, resource["type"])
+        if framework is None:
+            return failed("No matching runtime framework is available.", runtime_frameworks=frameworks)
+        quantization = select_gguf_quantization(
+            quantizations if isinstance(quantizations, list) else [], gguf_quantization_name)
+        if quantization is None:
+            return failed("GGUF quantization not found.", gguf_quantizations=quantizations)
+        await stage_done("select", f"picked {resource['name']} with {framework['frame_name']}")
+
+        created = await asyncio.to_thread(
+            api_inference_create,
+            token=token,
+            model_id=model_id,
+            cluster_id=resource["cluster_id"],
+            runtime_framework_id=framework["id"],
+            resource_id=resource["id"],
+            entrypoint=quantization,
+            agent=agent,
+        )
+        if "deploy_id" not in created:
+            return failed("Failed to create the inference deployment.", detail=created)
+        deploy_id = created["deploy_id"]
+        await stage_done("create", f"created deployment {deploy_id}")
+
+        waited = await wait_inference_ready(token, model_id, deploy_id, timeout=timeout, report=report)
+        await stage_done("wait", f"finished waiting for deployment {deploy_id}: {waited['outcome']}")
 
+        result = {
+            "model_id": model_id,
+            "resource": resource,
+            "runtime_framework": framework,
+            "gguf_quantization_name": quantization,
+            **waited,
+            "stages": stages,
+        }
+        if waited["outcome"] != "ready":
+            result["error_message"] = f"deployment {deploy_id} is not running: {waited['outcome']}"
+        return tool_result(result)
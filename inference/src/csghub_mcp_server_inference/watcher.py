@@ -0,0 +1,254 @@
+import asyncio
+import logging
+import time
+import weakref
+from dataclasses import dataclass, field
+from typing import Callable
+
+from mcp.server.fastmcp import FastMCP
+from pydantic import AnyUrl
+
+logger = logging.getLogger(__name__)
+
+URI_SCHEME = "csghub"
+
+
+@dataclass
+class WatchKind:
+    """How to poll one kind of entity.
+
+    fetch_one(token, params) returns the status payload of a single entity.
+    list_all(token) optionally returns every entity of the token owner with a
+    "status" key, item_key(item) gives the watch key of a listed item. When a
+    token watches several entities of a kind one listing replaces their detail
+    calls, and details are only fetched for entities whose status moved.
+    Entities in one of done_statuses are no longer polled.
+    """
+    name: str
+    fetch_one: Callable[[str, dict], dict]
+    done_statuses: set = field(default_factory=set)
+    list_all: Callable[[str], list] = None
+    item_key: Callable[[dict], str] = None
+
+
+@dataclass
+class WatchedEntity:
+    """One polled entity shared by the sessions that watch it.
+
+    watchers maps each session that watched the entity to the token it was
+    authorized with, only those sessions may read or subscribe to it. Polls
+    use the token of one of them.
+    """
+    uri: str
+    kind: str
+    key: str
+    params: dict
+    expires_at: float
+    status: str = None
+    snapshot: dict = field(default_factory=dict)
+    updated_at: float = 0
+    polls: int = 0
+    watchers: weakref.WeakKeyDictionary = field(default_factory=weakref.WeakKeyDictionary)
+    sessions: weakref.WeakSet = field(default_factory=weakref.WeakSet)
+
+    @property
+    def token(self) -> str:
+        return next(iter(self.watchers.values()), None)
+
+    def describe(self) -> dict:
+        return {
+            "uri": self.uri,
+            "status": self.status,
+            "snapshot": self.snapshot,
+            "updated_at": self.updated_at,
+            "polls": self.polls,
+            "watchers": len(self.watchers),
+            "subscribers": len(self.sessions),
+        }
+
+
+def list_all_pages(fetch_page: Callable[[int, int], list], per: int = 100, max_pages: int = 20) -> list:
+    """Walk a paged listing, returning the error dict of a failed page as is."""
+    items = []
+    for page in range(1, max_pages + 1):
+        page_items = fetch_page(per, page)
+        if not isinstance(page_items, list):
+            return page_items
+        if not page_items:
+            break
+        items.extend(page_items)
+    return items
+
+
+class StatusWatcher:
+    """Shared status poller for every session of this server.
+
+    Entities are keyed by resource URI, so any number of sessions watching the
+    same job cost one upstream poll per interval. A session must watch an entity
+    with its own token before it can read or subscribe to its URI, the watch
+    checks the token against CSGHub. Changes are pushed to the subscribed
+    sessions with resources/updated notifications, and the URI can be read as a
+    resource to get the cached snapshot. The poll loop only runs while something
+    is watched.
+    """
+
+    def __init__(self, mcp_instance: FastMCP, interval: float = 10, max_concurrency: int = 8):
+        self.interval = interval
+        self.kinds = {}
+        self.entities = {}
+        self._task = None
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._server = mcp_instance._mcp_server
+        self._server.subscribe_resource()(self._on_subscribe)
+        self._server.unsubscribe_resource()(self._on_unsubscribe)
+        enable_resource_subscriptions(self._server)
+
+    def register_kind(self, kind: WatchKind):
+        self.kinds[kind.name] = kind
+
+    def uri_for(self, kind: str, key) -> str:
+        return f"{URI_SCHEME}://{kind}/{key}"
+
+    async def watch(self, kind: str, key, params: dict, token: str,
+                    session=None, ttl: float = 3600) -> dict:
+        """Start or join watching an entity, returning its description or an error dict.
+
+        The entity is fetched once with the caller's token so nobody can attach to
+        an entity they are not allowed to read. Without a session there is nobody
+        to notify, the fetched status is returned and nothing is kept.
+        """
+        watch_kind = self.kinds[kind]
+        snapshot = await asyncio.to_thread(watch_kind.fetch_one, token, params)
+        if not isinstance(snapshot, dict) or not snapshot or "error_message" in snapshot:
+            return snapshot or {"error_message": f"{kind} {key} not found."}
+
+        uri = self.uri_for(kind, key)
+        if session is None:
+            return {"uri": uri, "status": snapshot.get("status"), "snapshot": snapshot}
+        entity = self.entities.get(uri)
+        if entity is None:
+            entity = WatchedEntity(uri=uri, kind=kind, key=str(key), params=params,
+                                   expires_at=time.monotonic() + ttl)
+            self.entities[uri] = entity
+        else:
+            entity.expires_at = max(entity.expires_at, time.monotonic() + ttl)
+        entity.watchers[session] = token
+        entity.sessions.add(session)
+        await self._apply(entity, snapshot)
+        self._ensure_running()
+        return entity.describe()
+
+    def unwatch(self, uri: str, session) -> bool:
+        """Stop watching uri for session, the entity goes once no session watches it."""
+        entity = self.entities.get(uri)
+        if entity is None or session is None or session not in entity.watchers:
+            return False
+        del entity.watchers[session]
+        entity.sessions.discard(session)
+        if not entity.watchers:
+            del self.entities[uri]
+        return True
+
+    def _authorized(self, uri: str) -> WatchedEntity:
+        entity = self.entities.get(uri)
+        try:
+            session = self._server.request_context.session
+        except LookupError:
+            session = None
+        if entity is None or session is None or session not in entity.watchers:
+            raise ValueError(f"{uri} is not watched by this session, call the watch tool first")
+        return entity
+
+    def read(self, uri: str) -> dict:
+        return self._authorized(uri).describe()
+
+    async def _on_subscribe(self, uri: AnyUrl):
+        self._authorized(str(uri)).sessions.add(self._server.request_context.session)
+
+    async def _on_unsubscribe(self, uri: AnyUrl):
+        entity = self.entities.get(str(uri))
+        if entity is not None:
+            entity.sessions.discard(self._server.request_context.session)
+
+    def _ensure_running(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while self.entities:
+            await asyncio.sleep(self.interval)
+            try:
+                await self.poll_once()
+            except Exception as e:
+                logger.error(f"status watcher poll failed: {e}")
+
+    async def poll_once(self):
+        now = time.monotonic()
+        for uri in [uri for uri, entity in self.entities.items() if entity.expires_at <= now or not entity.watchers]:
+            del self.entities[uri]
+
+        groups = {}
+        for entity in self.entities.values():
+            if str(entity.status).lower() in self.kinds[entity.kind].done_statuses:
+                continue
+            groups.setdefault((entity.kind, entity.token), []).append(entity)
+
+        await asyncio.gather(*[
+            self._poll_group(self.kinds[kind], token, entities)
+            for (kind, token), entities in groups.items()
+        ])
+
+    async def _poll_group(self, kind: WatchKind, token: str, entities: list):
+        listed = {}
+        if kind.list_all and len(entities) > 1:
+            try:
+                async with self._semaphore:
+                    items = await asyncio.to_thread(kind.list_all, token)
+            except Exception as e:
+                logger.warning(f"failed to list {kind.name} entities: {e}")
+                items = None
+            if isinstance(items, list):
+                listed = {str(kind.item_key(item)): item for item in items}
+
+        for entity in entities:
+            item = listed.get(entity.key)
+            if item is not None and item.get("status") == entity.status:
+                entity.polls += 1
+                continue
+            async with self._semaphore:
+                try:
+                    snapshot = await asyncio.to_thread(kind.fetch_one, entity.token, entity.params)
+                except Exception as e:
+                    logger.warning(f"failed to poll {entity.uri}: {e}")
+                    continue
+            await self._apply(entity, snapshot)
+
+    async def _apply(self, entity: WatchedEntity, snapshot: dict):
+        if not isinstance(snapshot, dict) or not snapshot or "error_message" in snapshot:
+            logger.warning(f"failed to poll {entity.uri}: {snapshot}")
+            return
+        entity.polls += 1
+        if snapshot == entity.snapshot:
+            return
+        entity.snapshot = snapshot
+        entity.status = snapshot.get("status")
+        entity.updated_at = time.time()
+        for session in list(entity.sessions):
+            try:
+                await session.send_resource_updated(AnyUrl(entity.uri))
+            except Exception as e:
+                logger.info(f"dropping subscriber of {entity.uri}: {e}")
+                entity.sessions.discard(session)
+
+
+def enable_resource_subscriptions(server):
+    """Advertise resources.subscribe, the low level server always reports False."""
+    get_capabilities = server.get_capabilities
+
+    def get_capabilities_with_subscribe(*args, **kwargs):
+        capabilities = get_capabilities(*args, **kwargs)
+        if capabilities.resources is not None:
+            capabilities.resources.subscribe = True
+        return capabilities
+
+    server.get_capabilities = get_capabilities_with_subscribe
@@ -6,3 +6,4 @@ from .model import api_create_model
 from .model import api_delete_model
 from .model import api_find_models_by_name
 from .namespace import api_get_namespaces_by_token
+from .files import api_read_repo_file
@@ -1,14 +1,15 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, pick_fields, response_body
 
 logger = logging.getLogger(__name__)
 
-def api_top_download_models(num: int) -> dict:
+def api_top_download_models(num: int, fields: list = None) -> dict:
     """Get top downloaded models.
     
     Args:
         num: Number of models to retrieve
+        fields: Upstream attributes to extract instead of the default summary
         
     Returns:
         Top models data
@@ -25,7 +26,7 @@ def api_top_download_models(num: int) -> dict:
     url = f"{config.api_endpoint}/api/v1/models"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to get top {num} downloaded models on {url}: {response.text}")
+        logger.error("failed to get top %s downloaded models on %s: %s", num, url, response_body(response))
         return wrap_error_response(response)
     
     response.raise_for_status()
@@ -37,6 +38,9 @@ def api_top_download_models(num: int) -> dict:
         return res_data
 
     for res in res_list:
+        if fields:
+            res_data.append(pick_fields(res, fields))
+            continue
         access_url = f"{config.web_endpoint}/models/{res['path']}"
         git_clone_cmd = f"git clone {res['repository']['http_clone_url']}"
         res_data.append({
@@ -48,7 +52,7 @@ def api_top_download_models(num: int) -> dict:
 
     return res_data
 
-def api_list_user_models(token: str, username: str, per: int = 10, page: int = 1) -> dict:
+def api_list_user_models(token: str, username: str, per: int = 10, page: int = 1, fields: list = None) -> dict:
     config = get_csghub_config()
 
     headers = {"Authorization": f"Bearer {token}"}
@@ -59,7 +63,7 @@ def api_list_user_models(token: str, username: str, per: int = 10, page: int = 1
     url = f"{config.api_endpoint}/api/v1/user/{username}/models"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to list user models on {url}: {response.text}")
+        logger.error("failed to list user models on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -71,20 +75,23 @@ def api_list_user_models(token: str, username: str, per: int = 10, page: int = 1
         return res_data
 
     for res in res_list:
+        if fields:
+            res_data.append(pick_fields(res, fields))
+            continue
         res_data.append({
             "model_id": res["path"]
         })
 
     return res_data
 
-def api_get_model_details(token: str, model_id: str) -> dict:
+def api_get_model_details(token: str, model_id: str, fields: list = None) -> dict:
     config = get_csghub_config()
 
     headers = {"Authorization": f"Bearer {token}"}
     url = f"{config.api_endpoint}/api/v1/models/{model_id}"
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get model details on {url}: {response.text}")
+        logger.error("failed to get model details on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -93,6 +100,8 @@ def api_get_model_details(token: str, model_id: str) -> dict:
 
     if json_data and "data" in json_data:
         res = json_data["data"]
+        if fields:
+            return pick_fields(res, fields)
         access_url = f"{config.web_endpoint}/models/{res['path']}"
         res_data = {
             "model_id": res["path"],
@@ -128,7 +137,7 @@ def api_create_model(
     url = f"{config.api_endpoint}/api/v1/models"
     response = requests.post(url, headers=headers, json=data)
     if response.status_code != 200:
-        logger.error(f"failed to create model repo: {data} on {url} :{response.text}")
+        logger.error("failed to create model repo: %s on %s :%s", data, url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -151,13 +160,13 @@ def api_delete_model(token: str, model_id: str) -> dict:
     url = f"{config.api_endpoint}/api/v1/models/{model_id}"
     response = requests.delete(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to delete model on {url}: {response.text}")
+        logger.error("failed to delete model on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
     return response.json()
 
-def api_find_models_by_name(token: str, name: str, page: int = 1, page_size: int = 20) -> dict:
+def api_find_models_by_name(token: str, name: str, page: int = 1, page_size: int = 20, fields: list = None) -> dict:
     config = get_csghub_config()
 
     headers = {
@@ -170,16 +179,14 @@ def api_find_models_by_name(token: str, name: str, page: int = 1, page_size: int
         "search": name,
         "sort": "trending",
     }
-    print(params)
     url = f"{config.api_endpoint}/api/v1/models"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to get searched models on {url}: {response.text}")
+        logger.error("failed to get searched models on %s: %s", url, response_body(response))
         return wrap_error_response(response)
     
     response.raise_for_status()
     json_data = response.json()
-    print(json_data)
     res_data = []
     res_list = json_data["data"] if json_data and "data" in json_data else []
     if not isinstance(res_list, list):
@@ -187,6 +194,9 @@ def api_find_models_by_name(token: str, name: str, page: int = 1, page_size: int
 
     total = json_data["total"]
     for res in res_list:
+        if fields:
+            res_data.append(pick_fields(res, fields))
+            continue
         res_data.append({
             "model_id": res["path"],
         })
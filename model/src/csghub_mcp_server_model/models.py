@@ -1,6 +1,8 @@
-import json
+import asyncio
 import logging
 from mcp.server.fastmcp import FastMCP
+from mcp.types import CallToolResult
+from .results import tool_result
 from .api_client import (
     api_get_username_from_token,
     api_get_namespaces_by_token,
@@ -10,6 +12,7 @@ from .api_client import (
     api_create_model,
     api_delete_model,
     api_find_models_by_name,
+    api_read_repo_file,
 )
 
 logger = logging.getLogger(__name__)
@@ -21,62 +24,63 @@ def register_model_tools(mcp_instance: FastMCP):
     register_model_creation(mcp_instance=mcp_instance)
     register_model_delete(mcp_instance=mcp_instance)
     register_namespace_tools(mcp_instance=mcp_instance)
+    register_repo_file_read(mcp_instance=mcp_instance)
 
 def register_model_query_tools(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="get_top_download_models",
         title="Get top downloaded models from CSGHub",
-        description="Retrieve the top downloaded models from CSGHub by specifying the number of models to retrieve.",
+        description="Retrieve the top downloaded models from CSGHub by specifying the number of models to retrieve. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes such as repository.http_clone_url.",
         structured_output=True,
     )
-    def get_top_download_models(num: int) -> str:
-       json_data = api_top_download_models(num)
-       return json.dumps(json_data)
+    def get_top_download_models(num: int, fields: list[str] = None) -> CallToolResult:
+       json_data = api_top_download_models(num, fields=fields)
+       return tool_result(json_data)
 
     @mcp_instance.tool(
         name="query_models_by_name",
         title="Query models by name from CSGHub",
-        description="Query the models from CSGHub by specifying model name. The default 20 models will be returned if no page size is specified. You can control the pagination by specifying the number of items per page and the page number. ",
+        description="Query the models from CSGHub by specifying model name. The default 20 models will be returned if no page size is specified. You can control the pagination by specifying the number of items per page and the page number. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes such as repository.http_clone_url.",
         structured_output=True,
     )
-    def query_models_by_name(token: str, name: str, page: int = 1, page_size: int = 20) -> str:
-       json_data = api_find_models_by_name(token=token, name=name, page=page, page_size=page_size)
-       return json.dumps(json_data)
+    def query_models_by_name(token: str, name: str, page: int = 1, page_size: int = 20, fields: list[str] = None) -> CallToolResult:
+       json_data = api_find_models_by_name(token=token, name=name, page=page, page_size=page_size, fields=fields)
+       return tool_result(json_data)
 
 def register_user_model_list(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="list_user_models",
         title="List models for a user from CSGHub",
-        description="Retrieve a list of models for a specific user from CSGHub with user access token. You can control the pagination by specifying the number of items per page and the page number.",
+        description="Retrieve a list of models for a specific user from CSGHub with user access token. You can control the pagination by specifying the number of items per page and the page number. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes such as repository.http_clone_url.",
         structured_output=True,
     )
-    def list_user_models(token: str, per: int = 10, page: int = 1) -> str:
+    def list_user_models(token: str, per: int = 10, page: int = 1, fields: list[str] = None) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
         
         try:
             username = api_get_username_from_token(token)
         except Exception as e:
             logger.error(f"Error calling user token API: {e}")
-            return f"Error: Failed to get username. {e}"
+            return tool_result({"error_message": f"Failed to get username. {e}"})
         
         try:
-            models = api_list_user_models(token, username, per, page)
-            return json.dumps(models)
+            models = api_list_user_models(token, username, per, page, fields=fields)
+            return tool_result(models)
         except Exception as e:
             logger.error(f"Error calling models API: {e}")
-            return f"Error: Failed to list models. {e}"
+            return tool_result({"error_message": f"Failed to list models. {e}"})
 
 def register_model_query(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="get_model_detail_by_id",
         title="Get model details by model id",
-        description="Retrieve the model details by a specific ID or path from CSGHub with user access token. This is useful for checking the details of a model repo that has been submitted to the CSGHub service.",
+        description="Retrieve the model details by a specific ID or path from CSGHub with user access token. This is useful for checking the details of a model repo that has been submitted to the CSGHub service. Optional fields picks the upstream attributes to return instead of the default summary, use dots for nested attributes such as repository.http_clone_url.",
         structured_output=True,
     )
-    def get_model_detail_by_id(token: str, model_id: str) -> str:
-        json_data = api_get_model_details(token=token, model_id=model_id)
-        return json.dumps(json_data)
+    def get_model_detail_by_id(token: str, model_id: str, fields: list[str] = None) -> CallToolResult:
+        json_data = api_get_model_details(token=token, model_id=model_id, fields=fields)
+        return tool_result(json_data)
 
 def register_model_creation(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -92,13 +96,13 @@ def register_model_creation(mcp_instance: FastMCP):
         readme: str = "",
         description: str = "",
         namespace: str = None,
-    ) -> str:
+    ) -> CallToolResult:
         if namespace is None or len(namespace.strip()) < 1:
             try:
                 namespace = api_get_username_from_token(token)
             except Exception as e:
                 logger.error(f"Error calling user token API: {e}")
-                return f"Error: Failed to get username. {e}"
+                return tool_result({"error_message": f"Failed to get username. {e}"})
 
         json_data = api_create_model(
             token=token,
@@ -109,7 +113,7 @@ def register_model_creation(mcp_instance: FastMCP):
             description=description,
         )
         
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
 def register_model_delete(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -118,9 +122,9 @@ def register_model_delete(mcp_instance: FastMCP):
         description="Delete the model repo by a specific id from CSGHub with user access token.",
         structured_output=True,
     )
-    def delete_model_by_id(token: str, model_id: str) -> str:
+    def delete_model_by_id(token: str, model_id: str) -> CallToolResult:
         json_data = api_delete_model(token=token, model_id=model_id)
-        return json.dumps(json_data)
+        return tool_result(json_data)
 
 def register_namespace_tools(mcp_instance: FastMCP):
     @mcp_instance.tool(
@@ -129,6 +133,37 @@ def register_namespace_tools(mcp_instance: FastMCP):
         description="Retrieve a list of namespaces or organizations that a user has access to create model repos from CSGHub with user access token.",
         structured_output=True,
     )
-    def list_namespaces(token: str) -> str:
+    def list_namespaces(token: str) -> CallToolResult:
         namespaces = api_get_namespaces_by_token(token)
-        return json.dumps(namespaces)
+        return tool_result(namespaces)
+
+def register_repo_file_read(mcp_instance: FastMCP):
+    @mcp_instance.tool(
+        name="read_repo_file",
+        title="Read part of a file in a model repo on CSGHub",
+        description="Read a file of a model repo on CSGHub without cloning it, fetching only the requested bytes with an HTTP range request. repo_id is namespace/name, branch is a branch name or a commit SHA, default main. By default up to max_bytes (default 65536, at most 8 MiB) are read from offset, length limits the read further. With start_line and/or max_lines whole lines are returned instead, counted from 1 at offset. Text is returned as UTF-8 content, binary data base64 encoded. Pass next_offset back as offset to continue while has_more is true. Whole files up to 256 KB are cached by commit SHA.",
+        structured_output=True,
+    )
+    async def read_repo_file(
+        token: str,
+        repo_id: str,
+        file_path: str,
+        branch: str = "main",
+        offset: int = 0,
+        length: int = 0,
+        max_bytes: int = 65536,
+        start_line: int = 0,
+        max_lines: int = 0,
+    ) -> CallToolResult:
+        if offset < 0 or length < 0 or max_bytes < 1 or start_line < 0 or max_lines < 0:
+            return tool_result({"error_message": "offset, length, start_line and max_lines must not be negative, max_bytes must be at least 1."})
+        try:
+            json_data = await asyncio.to_thread(
+                api_read_repo_file, token, "model", repo_id, file_path,
+                branch=branch, offset=offset, length=length, max_bytes=max_bytes,
+                start_line=start_line, max_lines=max_lines,
+            )
+        except Exception as e:
+            logger.error(f"Error reading {file_path} of model {repo_id}: {e}")
+            return tool_result({"error_message": f"Failed to read repo file. {e}"})
+        return tool_result(json_data)
@@ -5,3 +5,4 @@ from .repo import upload_file
 from .resources import api_get_available_resources
 from .cluster import get_clusters
 from .namespace import api_get_namespaces_by_token
+from .repo import upload_files, collect_local_files
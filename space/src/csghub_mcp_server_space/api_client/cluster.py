@@ -1,6 +1,6 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, response_body
 
 logger = logging.getLogger(__name__)
 
@@ -20,7 +20,7 @@ def get_clusters(token: str) -> dict:
     }
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to list clusters on {url}: {response.text}")
+        logger.error("failed to list clusters on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -1,9 +1,35 @@
 import requests
+import base64
+import contextvars
 import logging
-from .constants import get_csghub_config, wrap_error_response
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from .constants import get_csghub_config, wrap_error_response, pick_fields, response_body, resolve_upload_path
+from .tree import git_blob_sha1, remote_files
 
 logger = logging.getLogger(__name__)
 
+UPLOAD_RETRIES = 3
+MAX_FILE_BYTES = 10 * 1024 * 1024
+MAX_LOCAL_FILES = 500
+MAX_UPLOAD_CONCURRENCY = 16
+SKIPPED_DIRS = {".git", "__pycache__", ".venv", "venv", "node_modules", ".ipynb_checkpoints"}
+# the space rebuilds on every commit, entry files go last so the final build sees all files
+ENTRY_FILES = {"app.py", "Dockerfile"}
+
+def in_caller_context(fn):
+    """Wrap fn to run in a copy of the calling thread's context.
+
+    Pool threads start with an empty context, so without it the request spans
+    of a traced tool call made there would lose their parent span.
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(fn, *args, **kwargs)
+    return run
+
 def upload_file(
     token: str,
     namespace: str,
@@ -41,15 +67,118 @@ def upload_file(
     }
     response = requests.post(url, headers=headers, json=payload)
     if response.status_code != 201 and response.status_code != 200:
-        logger.error(f"failed to upload file to {url}: {response.text}")
+        logger.error("failed to upload file to %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
     return response.json()
 
+def collect_local_files(local_dir: str, max_files: int = MAX_LOCAL_FILES) -> list:
+    """List (repo path, local path) for the files below local_dir.
+
+    local_dir must lie under the upload root, see resolve_upload_path, and so
+    must every file in it after resolving symlinks. VCS, cache and virtualenv
+    directories are skipped. Raises ValueError when the directory is missing,
+    leaves the root or holds more than max_files files.
+    """
+    local_dir = resolve_upload_path(local_dir)
+    if not os.path.isdir(local_dir):
+        raise ValueError(f"{local_dir} is not a directory")
+    files = []
+    for root, dirs, names in os.walk(local_dir):
+        dirs[:] = sorted(d for d in dirs if d not in SKIPPED_DIRS)
+        for name in sorted(names):
+            local_path = os.path.join(root, name)
+            repo_path = os.path.relpath(local_path, local_dir).replace(os.sep, "/")
+            files.append((repo_path, resolve_upload_path(local_path)))
+            if len(files) > max_files:
+                raise ValueError(f"{local_dir} holds more than {max_files} files")
+    return files
+
+def upload_files(
+    token: str,
+    namespace: str,
+    repo_name: str,
+    files: list,
+    repo_type: str,
+    branch: str = "main",
+    max_concurrency: int = 8,
+    skip_unchanged: bool = True,
+) -> dict:
+    """Upload several files to a repository concurrently.
+
+    Args:
+        token: User's token
+        namespace: Namespace of the repository
+        repo_name: Name of the repository
+        files: List of (path in repository, loader), loader returns the file bytes
+        repo_type: Type of the repository (e.g., 'space', 'model')
+        branch: Branch to commit to
+        max_concurrency: Files uploaded at the same time, at most MAX_UPLOAD_CONCURRENCY
+        skip_unchanged: Skip files whose content the branch already holds
+
+    Returns:
+        Per file status, the number of uploaded and unchanged files and an
+        error_message when any file failed
+    """
+    def upload(item) -> dict:
+        file_path, load = item
+        entry = {"path": file_path}
+        try:
+            content = load()
+        except OSError as e:
+            entry.update(status="failed", error_message=f"failed to read file: {e}")
+            return entry
+        entry["size"] = len(content)
+        if len(content) > MAX_FILE_BYTES:
+            entry.update(status="failed", error_message=f"larger than {MAX_FILE_BYTES} bytes")
+            return entry
+        sha = git_blob_sha1(content)
+        repo_id = f"{namespace}/{repo_name}"
+        if skip_unchanged and remote_files.is_unchanged(token, repo_type, repo_id, branch, file_path, sha):
+            entry["status"] = "unchanged"
+            return entry
+        encoded_content = base64.b64encode(content).decode("utf-8")
+        for attempt in range(1, UPLOAD_RETRIES + 1):
+            try:
+                resp = upload_file(token, namespace, repo_name, file_path, encoded_content, repo_type, branch)
+                code = resp.get("error_code", 0) if isinstance(resp, dict) else 0
+            except requests.RequestException as e:
+                resp = {"error_message": str(e)}
+                code = 503
+            # concurrent commits to one branch can race, those and server errors are retried
+            if attempt < UPLOAD_RETRIES and (code == 409 or code >= 500):
+                time.sleep(attempt)
+                continue
+            break
+        if isinstance(resp, dict) and "error_message" in resp:
+            entry.update(status="failed", error_message=resp["error_message"])
+        else:
+            entry["status"] = "uploaded"
+            remote_files.record(token, repo_type, repo_id, branch, file_path, sha)
+        return entry
+
+    entry_files = [item for item in files if item[0] in ENTRY_FILES]
+    other_files = [item for item in files if item[0] not in ENTRY_FILES]
+    upload = in_caller_context(upload)
+    with ThreadPoolExecutor(max_workers=min(max(1, max_concurrency), MAX_UPLOAD_CONCURRENCY)) as executor:
+        results = list(executor.map(upload, other_files))
+        results.extend(executor.map(upload, entry_files))
+
+    failed = [entry for entry in results if entry["status"] == "failed"]
+    res_data = {
+        "files": results,
+        "uploaded": sum(entry["status"] == "uploaded" for entry in results),
+        "unchanged": sum(entry["status"] == "unchanged" for entry in results),
+    }
+    if failed:
+        res_data["error_message"] = f"{len(failed)} of {len(results)} files failed to upload."
+    return res_data
+
 def detail(
     token: str,
-    space_id: str
+    space_id: str,
+    fields: list = None,
 ) -> dict:
     """
     Get repo details.
@@ -57,6 +186,7 @@ def detail(
     Args:
         token: User's token.
         space_id: Name of the repo.
+        fields: Upstream attributes to extract instead of the default summary.
 
     Returns:
         Response data.
@@ -68,7 +198,7 @@ def detail(
     }
     response = requests.get(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to get space id {space_id} detail: on {url}: {response.text}")
+        logger.error("failed to get space id %s detail: on %s: %s", space_id, url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -77,6 +207,8 @@ def detail(
     res_data = {}
     if json_data and "data" in json_data:
         res = json_data["data"]
+        if fields:
+            return pick_fields(res, fields)
         access_url = f"{config.web_endpoint}/spaces/{res['path']}"
         res_data = {
             "space_id": res["path"],
@@ -1,6 +1,6 @@
 import requests
 import logging
-from .constants import get_csghub_config, wrap_error_response
+from .constants import get_csghub_config, wrap_error_response, pick_fields, response_body
 
 logger = logging.getLogger(__name__)
   
@@ -25,7 +25,7 @@ def start(
     }
     response = requests.post(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to run space on {url}: {response.text}")
+        logger.error("failed to run space on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -84,7 +84,7 @@ def create(
     }
     response = requests.post(url, headers=headers, json=payload)
     if response.status_code != 200:
-        logger.error(f"failed to create space on {url}: {response.text}")
+        logger.error("failed to create space on %s: %s", url, response_body(response))
         return wrap_error_response(response)
         
     response.raise_for_status()
@@ -122,7 +122,7 @@ def stop(
     }
     response = requests.post(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to stop space on {url}: {response.text}")
+        logger.error("failed to stop space on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -148,13 +148,13 @@ def delete(
     }
     response = requests.delete(url, headers=headers)
     if response.status_code != 200:
-        logger.error(f"failed to delete space on {url}: {response.text}")
+        logger.error("failed to delete space on %s: %s", url, response_body(response))
         return wrap_error_response(response)
         
     response.raise_for_status()
     return response.json()
 
-def query_my_spaces(token: str, username: str, per: int = 10, page: int = 1) -> dict:
+def query_my_spaces(token: str, username: str, per: int = 10, page: int = 1, fields: list = None) -> dict:
     """List spaces of a user.
     
     Args:
@@ -162,6 +162,7 @@ def query_my_spaces(token: str, username: str, per: int = 10, page: int = 1) ->
         username: Username
         per: Items per page
         page: Page number
+        fields: Upstream attributes to extract instead of the default summary
         
     Returns:
         Space services data
@@ -175,7 +176,7 @@ def query_my_spaces(token: str, username: str, per: int = 10, page: int = 1) ->
     url = f"{config.api_endpoint}/api/v1/user/{username}/spaces"
     response = requests.get(url, headers=headers, params=params)
     if response.status_code != 200:
-        logger.error(f"failed to list user spaces on {url}: {response.text}")
+        logger.error("failed to list user spaces on %s: %s", url, response_body(response))
         return wrap_error_response(response)
 
     response.raise_for_status()
@@ -187,6 +188,9 @@ def query_my_spaces(token: str, username: str, per: int = 10, page: int = 1) ->
         return res_data
     
     for res in res_list:
+        if fields:
+            res_data.append(pick_fields(res, fields))
+            continue
         res_data.append({
             "space_id": res["path"],
             "status": res["status"],
@@ -0,0 +1,114 @@
+import atexit
+import contextvars
+import json
+import logging
+import os
+import queue
+import sys
+import time
+import uuid
+from contextlib import contextmanager
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMATS = ["json", "text"]
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(pathname)s:%(lineno)d - %(message)s"
+TEXT_DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+# LogRecord attributes, anything else on a record came from extra= and is logged as a field
+RECORD_ATTRIBUTES = set(vars(logging.makeLogRecord({}))) | {"message", "asctime", "request_id", "tool"}
+
+_log_context = contextvars.ContextVar("csghub_mcp_log_context", default=(None, None))
+_listener = None
+
+
+@contextmanager
+def log_context(tool: str, request_id: str = None):
+    """Tag every record logged within, in this thread or threads given a copy of its context."""
+    token = _log_context.set((request_id or uuid.uuid4().hex[:16], tool))
+    try:
+        yield
+    finally:
+        _log_context.reset(token)
+
+
+class ContextQueueHandler(QueueHandler):
+    """Hand records to the listener thread after stamping them with the log context.
+
+    The caller only renders the message, the JSON encoding and the write happen
+    in the listener thread. Records stay in process, so they are not copied.
+    """
+
+    def prepare(self, record):
+        record.request_id, record.tool = _log_context.get()
+        trace_module = sys.modules.get("opentelemetry.trace")
+        if trace_module is not None:
+            span_context = trace_module.get_current_span().get_span_context()
+            if span_context.is_valid:
+                record.trace_id = format(span_context.trace_id, "032x")
+                record.span_id = format(span_context.span_id, "016x")
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line with the log context and any extra= fields."""
+
+    def format(self, record):
+        entry = {
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(record.created)) + f".{int(record.msecs):03d}Z",
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "location": f"{record.pathname}:{record.lineno}",
+        }
+        for key in ("request_id", "tool", "trace_id", "span_id"):
+            value = getattr(record, key, None)
+            if value:
+                entry[key] = value
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES and key not in entry:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+def setup_logging(log_level: str = "INFO", log_format: str = None):
+    """Send all root logger records through a queue to one stderr handler.
+
+    log_format is one of LOG_FORMATS, by default CSGHUB_MCP_LOG_FORMAT or json.
+    Writes happen in a listener thread that is flushed at exit.
+    """
+    global _listener
+    log_format = log_format or os.getenv("CSGHUB_MCP_LOG_FORMAT", "json")
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"log format must be one of {', '.join(LOG_FORMATS)}")
+    stop_logging()
+
+    handler = logging.StreamHandler(sys.stderr)
+    if log_format == "json":
+        handler.setFormatter(JsonFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(fmt=TEXT_FORMAT, datefmt=TEXT_DATE_FORMAT))
+    log_queue = queue.SimpleQueue()
+    root_logger = logging.getLogger()
+    root_logger.setLevel(log_level)
+    for old_handler in root_logger.handlers[:]:
+        root_logger.removeHandler(old_handler)
+    root_logger.addHandler(ContextQueueHandler(log_queue))
+    _listener = QueueListener(log_queue, handler)
+    _listener.start()
+    atexit.unregister(stop_logging)
+    atexit.register(stop_logging)
+
+
+def stop_logging():
+    """Write out the queued records and stop the listener thread."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
@@ -1,7 +1,12 @@
+import asyncio
 import logging
-import json
 import base64
-from mcp.server.fastmcp import FastMCP
+import functools
+from mcp.server.fastmcp import Context, FastMCP
+from mcp.types import CallToolResult
+from .results import tool_result
+from .polling import wait_for_status, SPACE_READY_STATUSES, SPACE_FAILED_STATUSES
+from .watcher import StatusWatcher, WatchKind, list_all_pages
 from .api_client import (
     api_get_username_from_token,
     resources,
@@ -11,6 +16,8 @@ from .api_client import (
     space, repo, cluster,
     query_my_spaces,
     api_get_namespaces_by_token,
+    upload_files,
+    collect_local_files,
 )
 
 logger = logging.getLogger(__name__)
@@ -23,6 +30,8 @@ def register_space_tools(mcp_instance: FastMCP):
     # register_file_upload(mcp_instance)
     register_space_detail(mcp_instance)
     register_list_my_space_tool(mcp_instance)
+    register_space_watch_tools(mcp_instance)
+    register_space_file_sync(mcp_instance)
 
 def register_space_create(mcp_instance: FastMCP):
 
@@ -43,11 +52,17 @@ Parameters:
 - `env` (str, optional): Environment variables for the space.
 - `secrets` (str, optional): Secrets for the space.
 - `min_replica` (int, optional, default: 0): Minimum number of replicas for the space.
-The final response includes results for creation, uploads, and the run attempt. 
+- `files` (dict, optional): Files to upload, mapping the path in the space repository to its text content, e.g. {"app.py": "...", "requirements.txt": "..."}.
+- `local_dir` (str, optional): Directory under CSGHUB_MCP_UPLOAD_ROOT on the MCP server host whose files are uploaded, keeping their relative paths. Relative paths are taken from the root, local uploads are disabled while it is not set.
+- `max_concurrency` (int, optional, default: 8): Files uploaded at the same time, at most 16.
+Without `files` and `local_dir` a sample Gradio app.py is uploaded.
+- `wait` (bool, optional, default: False): Wait server side until the space is running or has failed, reporting build and deploy phases as progress.
+- `timeout` (int, optional, default: 900): Seconds to wait when `wait` is set.
+The final response includes results for creation, uploads with the status of every file, and the run attempt. With `wait` it also includes `wait_result` with the final status, `web_access_url` and the seconds spent in each phase. 
 In response, ["namespace"]["path"] can be used as namespace for other tool""",
         structured_output=True,
     )
-    def create_space(
+    async def create_space(
         token: str,
         name: str,
         resource_id: int,
@@ -60,7 +75,13 @@ In response, ["namespace"]["path"] can be used as namespace for other tool""",
         env: str = "",
         secrets: str = "",
         min_replica: int = 0,
-    ) -> str:
+        files: dict[str, str] = None,
+        local_dir: str = "",
+        max_concurrency: int = 8,
+        wait: bool = False,
+        timeout: int = 900,
+        ctx: Context = None,
+    ) -> CallToolResult:
         """
         Create a new CSGHub space, upload files, and run it.
         
@@ -74,17 +95,28 @@ In response, ["namespace"]["path"] can be used as namespace for other tool""",
             order_detail_id: Order detail ID.
             env: Environment variables.
             secrets: Secrets for the space.
+            files: Text files to upload by path in the space repository.
+            local_dir: Local directory to upload.
+            max_concurrency: Files uploaded at the same time.
+            wait: Wait until the space is running or has failed.
+            timeout: Seconds to wait.
         """
+        try:
+            items = space_upload_items(files, local_dir) or [("app.py", lambda: DEFAULT_APP.encode("utf-8"))]
+        except ValueError as e:
+            return tool_result({"error_message": str(e)})
+
         if namespace is None or len(namespace.strip()) < 1:
             try:
-                namespace = api_get_username_from_token(token)
+                namespace = await asyncio.to_thread(api_get_username_from_token, token)
             except Exception as e:
                 logger.error(f"Error calling user token API: {e}")
-                return f"Error: Failed to get username. {e}"
+                return tool_result({"error_message": f"Failed to get username. {e}"})
         
         resp = {}
 
-        create_resp = space.create(
+        create_resp = await asyncio.to_thread(
+            space.create,
             token=token,
             name=name,
             namespace=namespace,
@@ -100,36 +132,29 @@ In response, ["namespace"]["path"] can be used as namespace for other tool""",
         )
         resp['create_result'] = create_resp
         if "space_id" not in create_resp:
-            return json.dumps(resp)
+            return tool_result(resp)
         
         namespace = create_resp["space_id"].split('/')[0]
-        file = {
-            'name': 'app.py',
-            'content': '''import gradio as gr
-
-def greet(name):
-    return "Hello " + name + "!!"
-
-iface = gr.Interface(fn=greet, inputs="text", outputs="text")
-iface.launch()'''
-                }
-   
-        file_name = file.get('name')
-        file_content = file.get('content')
-
-        encoded_content = base64.b64encode(file_content.encode('utf-8')).decode('utf-8')
-        upload_resp = repo.upload_file(
+        upload_resp = await asyncio.to_thread(
+            upload_files,
             token=token,
             namespace=namespace,
             repo_name=name,
-            file_path=file_name,
-            content=encoded_content,
+            files=items,
             repo_type="space",
-            branch="main"
-        ) 
+            branch="main",
+            max_concurrency=max(1, max_concurrency),
+            # a new space holds nothing to compare with
+            skip_unchanged=False,
+        )
         resp['upload_result'] = upload_resp
 
-        return json.dumps(resp)
+        if wait:
+            resp['wait_result'] = await wait_space_running(token, create_resp["space_id"], timeout, ctx)
+            if resp['wait_result']["outcome"] != "ready":
+                resp["error_message"] = f"space {create_resp['space_id']} is not running: {resp['wait_result']['outcome']}"
+
+        return tool_result(resp)
 
 
     @mcp_instance.tool(
@@ -140,19 +165,19 @@ iface.launch()'''
     )
     def get_space_available_resource(
         token: str,
-    ) -> str:
+    ) -> CallToolResult:
         if not token:
-            return "Error: The 'token' parameter is required."
+            return tool_result({"error_message": "The 'token' parameter is required."})
 
         try:
             resp = resources.api_get_available_resources(
                 token=token,
                 deploy_type=0
             )
-            return json.dumps(resp)
+            return tool_result(resp)
         except Exception as e:
             logger.error(f"Error calling get space resource API: {e}")
-            return f"Error: Failed to get space resource. {e}"
+            return tool_result({"error_message": f"Failed to get space resource. {e}"})
 
     @mcp_instance.tool(
         name="get_user_namespaces",
@@ -160,7 +185,7 @@ iface.launch()'''
         description="Get user's available namespaces for creating repositories. Parameters: `token` (str, required): User's token.",
         structured_output=True,
     )
-    def get_user_namespaces_tool(token: str) -> str:
+    def get_user_namespaces_tool(token: str) -> CallToolResult:
         """
         Get user's available namespaces.
 
@@ -169,10 +194,10 @@ iface.launch()'''
         """
         try:
             namespaces = api_get_namespaces_by_token(token)
-            return json.dumps(namespaces)
+            return tool_result(namespaces)
         except Exception as e:
             logger.error(f"Error calling get user namespaces API: {e}")
-            return f"Error: Failed to get user namespaces. {e}"
+            return tool_result({"error_message": f"Failed to get user namespaces. {e}"})
 
 def register_file_upload(mcp_instance: FastMCP):
 
@@ -195,7 +220,7 @@ def greet(name):
 iface = gr.Interface(fn=greet, inputs=\"text\", outputs=\"text\")
 iface.launch()""",
         branch: str = "main"
-    ) -> str:
+    ) -> CallToolResult:
         """
         Upload a file to a CSGHub space.
 
@@ -209,11 +234,11 @@ iface.launch()""",
         """
 
         if not token:
-            return "Error: The 'token' parameter is required."
+            return tool_result({"error_message": "The 'token' parameter is required."})
         if not username:
-            return "Error: The 'username' parameter is required."
+            return tool_result({"error_message": "The 'username' parameter is required."})
         if not space_name:
-            return "Error: The 'space_name' parameter is required."
+            return tool_result({"error_message": "The 'space_name' parameter is required."})
 
         try:
             encoded_content = base64.b64encode(file_content.encode('utf-8')).decode('utf-8')
@@ -226,43 +251,105 @@ iface.launch()""",
                 repo_type="space",
                 branch=branch
             )
-            return json.dumps(resp)
+            return tool_result(resp)
         except Exception as e:
             logger.error(f"Error calling upload file API: {e}")
-            return f"Error: Failed to upload file. {e}"
+            return tool_result({"error_message": f"Failed to upload file. {e}"})
 
 def register_space_start(mcp_instance: FastMCP):
 
     @mcp_instance.tool(
         name="start_space_by_id",
         title="Start a CSGHub space with access token.",
-        description="Starts a CSGHub space. Parameters: `token` (str, required): User's API token. `space_id` (str, required): ID of the space to run. `space_id` is usually in the format of namespace/name. Example: 'user1/my-space'.",
+        description="Starts a CSGHub space. Parameters: `token` (str, required): User's API token. `space_id` (str, required): ID of the space to run. `space_id` is usually in the format of namespace/name. Example: 'user1/my-space'. `wait` (bool, optional, default: False): Wait server side until the space is running or has failed, reporting build and deploy phases as progress, and return `wait_result` with the final status, `web_access_url` and the seconds spent in each phase. `timeout` (int, optional, default: 900): Seconds to wait.",
         structured_output=True,
     )
-    def start_space_by_id(
+    async def start_space_by_id(
         token: str,
         space_id: str,
-    ) -> str:
+        wait: bool = False,
+        timeout: int = 900,
+        ctx: Context = None,
+    ) -> CallToolResult:
         """
         Run a CSGHub space.
 
         Args:
             token: User's API token.
             space_id: Name of the space.
+            wait: Wait until the space is running or has failed.
+            timeout: Seconds to wait.
         """
 
         if not token:
-            return "Error: The 'token' parameter is required."
+            return tool_result({"error_message": "The 'token' parameter is required."})
 
         try:
-            resp = space.start(
+            resp = await asyncio.to_thread(
+                space.start,
                 token=token,
                 space_id=space_id,
             )
-            return json.dumps(resp)
+            if wait and not (isinstance(resp, dict) and "error_message" in resp):
+                wait_result = await wait_space_running(token, space_id, timeout, ctx)
+                resp = {"start_result": resp, "wait_result": wait_result}
+                if wait_result["outcome"] != "ready":
+                    resp["error_message"] = f"space {space_id} is not running: {wait_result['outcome']}"
+            return tool_result(resp)
         except Exception as e:
             logger.error(f"Error calling run space API: {e}")
-            return f"Error: Failed to run space. {e}"
+            return tool_result({"error_message": f"Failed to run space. {e}"})
+
+DEFAULT_APP = '''import gradio as gr
+
+def greet(name):
+    return "Hello " + name + "!!"
+
+iface = gr.Interface(fn=greet, inputs="text", outputs="text")
+iface.launch()'''
+
+def _read_file(local_path: str) -> bytes:
+    with open(local_path, "rb") as f:
+        return f.read()
+
+def space_upload_items(files: dict = None, local_dir: str = "") -> list:
+    """Build (path in repository, loader) pairs from inline files and a local directory.
+
+    Inline files win over local files with the same path. Raises ValueError for a
+    bad local_dir or a file path with empty, . or .. segments.
+    """
+    items = {}
+    if local_dir:
+        for repo_path, local_path in collect_local_files(local_dir):
+            items[repo_path] = functools.partial(_read_file, local_path)
+    for file_path, content in (files or {}).items():
+        repo_path = file_path.lstrip("/")
+        if not repo_path or any(part in ("", ".", "..") for part in repo_path.split("/")):
+            raise ValueError(f"invalid file path '{file_path}' in files.")
+        items[repo_path] = functools.partial(str.encode, content, "utf-8")
+    return list(items.items())
+
+async def wait_space_running(token: str, space_id: str, timeout: int = 900, ctx: Context = None) -> dict:
+    """Poll the space detail with backoff until it is running, has failed or timeout passes."""
+    changes = 0
+
+    async def on_change(status: str, data: dict, elapsed: float):
+        nonlocal changes
+        changes += 1
+        logger.info(f"space {space_id} is {status} after {elapsed:.0f}s")
+        if ctx:
+            await ctx.report_progress(progress=changes, message=f"space {space_id} is {status} after {elapsed:.0f}s")
+
+    waited = await wait_for_status(
+        lambda: repo.detail(token, space_id),
+        SPACE_READY_STATUSES,
+        SPACE_FAILED_STATUSES,
+        timeout=timeout,
+        on_change=on_change,
+    )
+    result = dict(waited.pop("data") or {})
+    result.update(waited)
+    return result
 
 def register_space_stop(mcp_instance: FastMCP):
 
@@ -275,7 +362,7 @@ def register_space_stop(mcp_instance: FastMCP):
     def stop_space_by_id(
         token: str,
         space_id: str,
-    ) -> str:
+    ) -> CallToolResult:
         """
         Stop a CSGHub space.
 
@@ -285,52 +372,55 @@ def register_space_stop(mcp_instance: FastMCP):
         """
 
         if not token:
-            return "Error: The 'token' parameter is required."
+            return tool_result({"error_message": "The 'token' parameter is required."})
 
         try:
             resp = space.stop(
                 token=token,
                 space_id=space_id,
             )
-            return json.dumps(resp)
+            return tool_result(resp)
         except Exception as e:
             logger.error(f"Error calling stop space API: {e}")
-            return f"Error: Failed to stop space. {e}"
+            return tool_result({"error_message": f"Failed to stop space. {e}"})
 
 def register_space_detail(mcp_instance: FastMCP):
 
     @mcp_instance.tool(
         name="get_space_detail_by_id",
         title="Get details or status of a CSGHub space",
-        description="Retrieves details for a specific CSGHub space. Parameters: `token` (str, required): User's API token. `space_id` (str, required): ID of the space. `space_id` is usually in the format of namespace/name. Example: 'user1/my-space'.",
+        description="Retrieves details for a specific CSGHub space. Parameters: `token` (str, required): User's API token. `space_id` (str, required): ID of the space. `space_id` is usually in the format of namespace/name. Example: 'user1/my-space'. Optional `fields` (list of str) picks the upstream attributes to return instead of the default summary, use dots for nested attributes.",
         structured_output=True,
     )
     def get_space_detail_by_id(
         token: str,
         space_id: str,
-    ) -> str:
+        fields: list[str] = None,
+    ) -> CallToolResult:
         """
         Get details of a CSGHub space.
 
         Args:
             token: User's API token.
             space_id: namespace/name of the space.
+            fields: Upstream attributes to return.
         """
 
         if not token:
-            return "Error: The 'token' parameter is required."
+            return tool_result({"error_message": "The 'token' parameter is required."})
         if not space_id:
-            return "Error: The 'space_name' parameter is required."
+            return tool_result({"error_message": "The 'space_name' parameter is required."})
 
         try:
             resp = repo.detail(
                 token=token,
                 space_id=space_id,
+                fields=fields,
             )
-            return json.dumps(resp)
+            return tool_result(resp)
         except Exception as e:
             logger.error(f"Error calling get space detail API: {e}")
-            return f"Error: Failed to get space detail. {e}"
+            return tool_result({"error_message": f"Failed to get space detail. {e}"})
 
 def register_space_delete(mcp_instance: FastMCP):
 
@@ -343,7 +433,7 @@ def register_space_delete(mcp_instance: FastMCP):
     def delete_space_by_id(
         token: str,
         space_id: str,
-    ) -> str:
+    ) -> CallToolResult:
         """
         Delete a CSGHub space.
 
@@ -353,40 +443,149 @@ def register_space_delete(mcp_instance: FastMCP):
         """
 
         if not token:
-            return "Error: The 'token' parameter is required."
+            return tool_result({"error_message": "The 'token' parameter is required."})
 
         try:
             resp = space.delete(
                 token=token,
                 space_id=space_id,
             )
-            return json.dumps(resp)
+            return tool_result(resp)
         except Exception as e:
             logger.error(f"Error calling delete space API: {e}")
-            return f"Error: Failed to delete space. {e}"
+            return tool_result({"error_message": f"Failed to delete space. {e}"})
 
 def register_list_my_space_tool(mcp_instance: FastMCP):
     @mcp_instance.tool(
         name="list_my_spaces",
         title="List spaces for a user from CSGHub",
-        description="Retrieve a list of spaces for a specific user from CSGHub. Parameters: `token` (str, required): User's API token. `username` (str, required): The user's namespace. You can control the pagination by specifying the number of items per page and the page number.",
+        description="Retrieve a list of spaces for a specific user from CSGHub. Parameters: `token` (str, required): User's API token. `username` (str, required): The user's namespace. You can control the pagination by specifying the number of items per page and the page number. Optional `fields` (list of str) picks the upstream attributes to return instead of the default summary, use dots for nested attributes.",
         structured_output=True,
     )
-    def list_my_spaces(token: str, per: int = 10, page: int = 1) -> str:
+    def list_my_spaces(token: str, per: int = 10, page: int = 1, fields: list[str] = None) -> CallToolResult:
         if not token:
-            return "Error: must input CSGHUB_ACCESS_TOKEN."
+            return tool_result({"error_message": "must input CSGHUB_ACCESS_TOKEN."})
 
         try:
             username = api_get_username_from_token(token)
         except Exception as e:
             logger.error(f"Error calling user token API: {e}")
-            return f"Error: Failed to get username. {e}"
+            return tool_result({"error_message": f"Failed to get username. {e}"})
         
         
         try:
-            spaces = query_my_spaces(token, username, per, page)
-            return json.dumps(spaces)
+            spaces = query_my_spaces(token, username, per, page, fields=fields)
+            return tool_result(spaces)
         except Exception as e:
             logger.error(f"Error calling list spaces API: {e}")
-            return f"Error: Failed to list spaces. {e}"
+            return tool_result({"error_message": f"Failed to list spaces. {e}"})
+
+def register_space_watch_tools(mcp_instance: FastMCP):
+    watcher = StatusWatcher(mcp_instance)
+    watcher.register_kind(WatchKind(
+        name="space",
+        fetch_one=lambda token, params: repo.detail(token, params["space_id"]),
+        list_all=lambda token: list_all_pages(
+            lambda per, page: query_my_spaces(token, api_get_username_from_token(token), per, page)
+        ),
+        item_key=lambda item: item["space_id"],
+    ))
+
+    @mcp_instance.resource(
+        "csghub://space/{namespace}/{name}",
+        name="space_status",
+        description="Cached status of a watched space, updated by watch_space_status.",
+        mime_type="application/json",
+    )
+    def space_status(namespace: str, name: str) -> dict:
+        return watcher.read(watcher.uri_for("space", f"{namespace}/{name}"))
+
+    @mcp_instance.tool(
+        name="watch_space_status",
+        title="Watch space status by space ID",
+        description="Watch a space by space ID (namespace/name) on CSGHub with user access token. The server polls it once per interval for all sessions together and sends a resources/updated notification for the returned uri whenever it changes, read the uri to get the current status. The calling session is subscribed automatically. Only sessions that watched the uri with their own token can read or subscribe to it. Watching ends after ttl seconds or when unwatch_status is called.",
+        structured_output=True,
+    )
+    async def watch_space_status(
+        token: str, space_id: str,
+        ttl: int = 3600, ctx: Context = None,
+    ) -> CallToolResult:
+        result = await watcher.watch(
+            "space", space_id,
+            {"space_id": space_id},
+            token, session=ctx.session if ctx else None, ttl=ttl,
+        )
+        return tool_result(result)
+
+    @mcp_instance.tool(
+        name="unwatch_status",
+        title="Stop watching a status uri",
+        description="Stop watching the uri returned by watch_space_status for the calling session. Polling stops when no session watches it anymore.",
+        structured_output=True,
+    )
+    def unwatch_status(uri: str, ctx: Context = None) -> CallToolResult:
+        found = watcher.unwatch(uri, ctx.session if ctx else None)
+        if not found:
+            return tool_result({"error_message": f"{uri} is not watched."})
+        return tool_result({"uri": uri, "watching": uri in watcher.entities})
+
+def register_space_file_sync(mcp_instance: FastMCP):
+
+    @mcp_instance.tool(
+        name="sync_space_files",
+        title="Upload a set of files or a local directory to a CSGHub space",
+        description="Uploads several files to an existing CSGHub space in one call. Parameters: `token` (str, required): User's API token. `space_id` (str, required): ID of the space, usually namespace/name. `files` (dict, optional): Mapping of the path in the space repository to its text content. `local_dir` (str, optional): Directory under CSGHUB_MCP_UPLOAD_ROOT on the MCP server host whose files are uploaded, keeping their relative paths. Relative paths are taken from the root, local uploads are disabled while it is not set. .git, __pycache__, virtualenv and node_modules directories are skipped. `branch` (str, optional, default: 'main'): The target branch. `max_concurrency` (int, optional, default: 8): Files uploaded at the same time, at most 16. `skip_unchanged` (bool, optional, default: True): Skip files whose content already matches the file on the branch, compared by git blob SHA, and report them as unchanged. Every uploaded file is its own commit, app.py and Dockerfile are committed last. Returns the status of every file.",
+        structured_output=True,
+    )
+    async def sync_space_files(
+        token: str,
+        space_id: str,
+        files: dict[str, str] = None,
+        local_dir: str = "",
+        branch: str = "main",
+        max_concurrency: int = 8,
+        skip_unchanged: bool = True,
+    ) -> CallToolResult:
+        """
+        Upload files to a CSGHub space.
 
+        Args:
+            token: User's API token.
+            space_id: namespace/name of the space.
+            files: Text files to upload by path in the space repository.
+            local_dir: Local directory to upload.
+            branch: The target branch (default: main).
+            max_concurrency: Files uploaded at the same time.
+            skip_unchanged: Skip files the branch already holds.
+        """
+
+        if not token:
+            return tool_result({"error_message": "The 'token' parameter is required."})
+        if not space_id or "/" not in space_id:
+            return tool_result({"error_message": "The 'space_id' parameter must be namespace/name."})
+
+        try:
+            items = space_upload_items(files, local_dir)
+        except ValueError as e:
+            return tool_result({"error_message": str(e)})
+        if not items:
+            return tool_result({"error_message": "Either 'files' or 'local_dir' is required."})
+
+        namespace, name = space_id.split("/", 1)
+        try:
+            resp = await asyncio.to_thread(
+                upload_files,
+                token=token,
+                namespace=namespace,
+                repo_name=name,
+                files=items,
+                repo_type="space",
+                branch=branch,
+                max_concurrency=max(1, max_concurrency),
+                skip_unchanged=skip_unchanged,
+            )
+            resp["space_id"] = space_id
+            return tool_result(resp)
+        except Exception as e:
+            logger.error(f"Error calling upload file API: {e}")
+            return tool_result({"error_message": f"Failed to upload files. {e}"})
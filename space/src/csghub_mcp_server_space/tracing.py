@@ -0,0 +1,136 @@
+import logging
+import os
+import re
+from contextlib import nullcontext
+from typing import Any
+from mcp.server.fastmcp import FastMCP
+from .health import track_in_flight
+from .logs import log_context
+from .usage import track_usage
+
+logger = logging.getLogger(__name__)
+
+TRACE_EXPORTERS = ["none", "otlp", "console", "memory"]
+TRACER_NAME = "csghub_mcp"
+# tool arguments are recorded on the span up to this length, secrets never
+MAX_ATTRIBUTE_CHARS = 256
+SECRET_ARGUMENTS = {"token", "admin_token", "access_token", "password", "api_key", "secret"}
+TOKEN_PATH_PATTERN = re.compile(r"(/token/)[^/?#]+")
+
+_provider = None
+
+
+def setup_tracing(service_name: str, exporter: str = None):
+    """Install a tracer provider and trace every outgoing HTTP request.
+
+    exporter is one of TRACE_EXPORTERS, by default CSGHUB_MCP_TRACE_EXPORTER or
+    "none", which leaves tracing off. The OTLP exporter takes its endpoint from
+    the standard OTEL_EXPORTER_OTLP_* variables. "memory" keeps finished spans
+    in memory and returns the exporter, so tests can check their structure
+    without a collector. Requests carry a W3C traceparent header to CSGHub.
+    """
+    global _provider
+    exporter = exporter or os.getenv("CSGHUB_MCP_TRACE_EXPORTER", "none")
+    if exporter == "none":
+        return None
+    try:
+        from opentelemetry import trace
+        from opentelemetry.instrumentation.requests import RequestsInstrumentor
+        from opentelemetry.sdk.resources import Resource
+        from opentelemetry.sdk.trace import TracerProvider
+        from opentelemetry.sdk.trace.export import BatchSpanProcessor, SimpleSpanProcessor
+    except ImportError as e:
+        logger.error(f"tracing needs the tracing extra, install it to export spans: {e}")
+        return None
+
+    if exporter == "otlp":
+        from opentelemetry.exporter.otlp.proto.http.trace_exporter import OTLPSpanExporter
+        span_exporter = OTLPSpanExporter()
+        processor = BatchSpanProcessor(span_exporter)
+    elif exporter == "console":
+        from opentelemetry.sdk.trace.export import ConsoleSpanExporter
+        span_exporter = ConsoleSpanExporter()
+        processor = BatchSpanProcessor(span_exporter)
+    elif exporter == "memory":
+        from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+        span_exporter = InMemorySpanExporter()
+        processor = SimpleSpanProcessor(span_exporter)
+    else:
+        raise ValueError(f"trace exporter must be one of {', '.join(TRACE_EXPORTERS)}")
+
+    if _provider is None:
+        _provider = TracerProvider(resource=Resource.create({"service.name": service_name}))
+        trace.set_tracer_provider(_provider)
+        RequestsInstrumentor().instrument(tracer_provider=_provider, request_hook=_redact_token_url)
+    _provider.add_span_processor(processor)
+    logger.info(f"tracing {service_name} with the {exporter} exporter")
+    return span_exporter
+
+
+def _redact_token_url(span, request):
+    # the user lookup takes the token in the path, /api/v1/token/{token}
+    url = TOKEN_PATH_PATTERN.sub(r"\1REDACTED", request.url)
+    if url != request.url and span.is_recording():
+        for key in ("url.full", "http.url"):
+            if key in span.attributes:
+                span.set_attribute(key, url)
+
+
+def _argument_value(value):
+    if isinstance(value, (bool, int, float)):
+        return value
+    if isinstance(value, str):
+        return value[:MAX_ATTRIBUTE_CHARS]
+    if isinstance(value, (list, tuple, dict)):
+        return len(value)
+    return None
+
+
+def tool_span(name: str, arguments: dict, carrier: dict = None):
+    """Start the span of one tool call, a no-op context without opentelemetry.
+
+    Scalar arguments are recorded as attributes, lists and dicts by their length.
+    carrier is a mapping holding a caller traceparent to continue its trace.
+    """
+    try:
+        from opentelemetry import propagate, trace
+    except ImportError:
+        return nullcontext()
+
+    attributes = {"mcp.method.name": "tools/call", "gen_ai.tool.name": name}
+    for key, value in (arguments or {}).items():
+        value = _argument_value(value)
+        if value is not None and key not in SECRET_ARGUMENTS:
+            attributes[f"mcp.tool.argument.{key}"] = value
+    context = propagate.extract(carrier) if carrier else None
+    return trace.get_tracer(TRACER_NAME).start_as_current_span(
+        f"tools/call {name}", context=context, kind=trace.SpanKind.SERVER, attributes=attributes,
+    )
+
+
+class TracedFastMCP(FastMCP):
+    """FastMCP running every tool call inside a span and a log context.
+
+    The span is a parent to the HTTP request spans the tool makes, including
+    those from asyncio.to_thread. A tool result flagged isError marks the span
+    as failed. Records logged during the call carry its correlation id, and
+    the call is accounted to the hashed token of its caller.
+    """
+
+    async def call_tool(self, name: str, arguments: dict[str, Any]):
+        carrier = None
+        try:
+            meta = self.get_context().request_context.meta
+            carrier = meta.model_extra if meta is not None else None
+        except (LookupError, ValueError):
+            pass
+        with track_in_flight(), log_context(name), track_usage(name, arguments) as usage, \
+                tool_span(name, arguments, carrier) as span:
+            result = await super().call_tool(name, arguments)
+            usage["bytes_out"] = sum(len(getattr(block, "text", "") or "") for block in getattr(result, "content", None) or [])
+            usage["error"] = bool(getattr(result, "isError", False))
+            if span is not None and getattr(result, "isError", False):
+                from opentelemetry.trace import Status, StatusCode
+                message = (result.structuredContent or {}).get("error_message")
+                span.set_status(Status(StatusCode.ERROR, str(message)[:MAX_ATTRIBUTE_CHARS] if message else None))
+            return result